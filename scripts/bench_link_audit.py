@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""Benchmarks for scripts/link_audit.py.
+
+    python scripts/bench_link_audit.py engine    # rows/sec against a local stub HTTP server
+    python scripts/bench_link_audit.py matcher   # fuzzy_match vs TitleMatcher over 10k title pairs
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import link_audit  # noqa: E402
+from title_matcher import TitleMatcher  # noqa: E402
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves /s/<n> as a shortlink redirect and /dp/<n> as a product page."""
+
+    latency = 0.02
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server API
+        time.sleep(self.latency)
+        if self.path.startswith("/s/"):
+            self.send_response(302)
+            self.send_header("Location", "/dp/" + self.path[3:])
+            self.end_headers()
+            return
+        body = (
+            "<html><head><title>Amazon.com : Stub Product {0}</title></head>"
+            "<body>{1}</body></html>"
+        ).format(self.path.rsplit("/", 1)[-1], "x" * 4096).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        return
+
+
+def start_stub_server(latency: float) -> ThreadingHTTPServer:
+    StubHandler.latency = latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def build_rows(base_url: str, count: int) -> List[Dict[str, str]]:
+    rows = []
+    for index in range(count):
+        row = link_audit.ensure_default_keys({})
+        row["Category"] = "bench"
+        row["Product_Name"] = f"Stub Product {index}"
+        row["Amazon_Link"] = f"{base_url}/s/{index}"
+        rows.append(row)
+    return rows
+
+
+def bench_engine(rows_count: int, workers: List[int], latency: float) -> None:
+    server = start_stub_server(latency)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    rows = build_rows(base_url, rows_count)
+    print(f"engine: {rows_count} rows, {latency * 1000:.0f} ms stub latency per request")
+    try:
+        for count in workers:
+            started = time.perf_counter()
+            if count > 1:
+                audited = asyncio.run(link_audit.audit_rows_async(rows, count))
+            else:
+                session = link_audit._get_session()
+                audited = link_audit.audit_rows(rows, session)
+            elapsed = time.perf_counter() - started
+            matched = sum(1 for a in audited if a["Match_Status"] == "MATCH")
+            ordered = [a["Product_Name"] for a in audited] == [r["Product_Name"] for r in rows]
+            print(
+                f"  workers={count:<3} {rows_count / elapsed:8.1f} rows/sec"
+                f"  ({elapsed:.2f}s, matched={matched}, ordered={ordered})"
+            )
+    finally:
+        server.shutdown()
+
+
+def catalog_names() -> List[str]:
+    names: List[str] = []
+    for path in sorted(REPO_ROOT.glob("data/gear_*.csv")) + [REPO_ROOT / "gear_master.csv"]:
+        with path.open(newline="", encoding="utf-8") as handle:
+            for row in csv.DictReader(handle):
+                name = (row.get("Product_Name") or row.get("title") or "").strip()
+                if name:
+                    names.append(name)
+    return sorted(set(names))
+
+
+def build_pairs(names: List[str], count: int, seed: int = 7) -> List[Tuple[str, str, str]]:
+    """(product, page title, expected) triples: listings, unrelated pages and brand swaps."""
+    rng = random.Random(seed)
+    pairs = []
+    for index in range(count):
+        product = rng.choice(names)
+        kind = index % 3
+        if kind == 0:
+            pairs.append((product, f"Amazon.com : {product} : Pet Supplies", "MATCH"))
+        elif kind == 1:
+            other = rng.choice(names)
+            while other == product and len(names) > 1:
+                other = rng.choice(names)
+            pairs.append((product, other, "MISMATCH"))
+        else:
+            words = product.split()
+            donor = rng.choice(names).split()[0]
+            if donor.casefold() == words[0].casefold():
+                donor = "Generic"
+            pairs.append((product, " ".join([donor] + words[1:]), "MISMATCH"))
+    return pairs
+
+
+def bench_matcher(count: int) -> None:
+    names = catalog_names()
+    pairs = build_pairs(names, count)
+    print(f"matcher: {len(pairs)} pairs from {len(names)} catalog names (1/3 listing, 1/3 unrelated, 1/3 brand swap)")
+
+    started = time.perf_counter()
+    legacy = ["MATCH" if link_audit.fuzzy_match(p, t) else "MISMATCH" for p, t, _ in pairs]
+    legacy_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    matcher = TitleMatcher(names)
+    build_elapsed = time.perf_counter() - started
+    started = time.perf_counter()
+    scores = matcher.score_many((p, t) for p, t, _ in pairs)
+    indexed_elapsed = time.perf_counter() - started
+    indexed = ["MATCH" if score >= matcher.threshold else "MISMATCH" for score in scores]
+
+    def accuracy(labels: List[str], kind: int) -> str:
+        subset = [(label, pairs[i][2]) for i, label in enumerate(labels) if i % 3 == kind]
+        return f"{sum(1 for got, want in subset if got == want)}/{len(subset)}"
+
+    for label, labels, elapsed in (("fuzzy_match", legacy, legacy_elapsed), ("TitleMatcher", indexed, indexed_elapsed)):
+        print(
+            f"  {label:<13} {len(pairs) / elapsed:10.0f} pairs/sec ({elapsed * 1000:.1f} ms)"
+            f"  listing={accuracy(labels, 0)} unrelated={accuracy(labels, 1)} brand-swap={accuracy(labels, 2)}"
+        )
+    print(f"  (index build over the catalog: {build_elapsed * 1000:.1f} ms, once per run)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark link_audit engines.")
+    sub = parser.add_subparsers(dest="command")
+    engine = sub.add_parser("engine", help="Rows/sec at several worker counts against a stub server.")
+    engine.add_argument("--rows", type=int, default=200, help="Rows per run.")
+    engine.add_argument("--latency", type=float, default=0.02, help="Stub server latency per request (seconds).")
+    engine.add_argument("--workers", default="1,8,32", help="Comma-separated worker counts.")
+    matcher = sub.add_parser("matcher", help="fuzzy_match vs TitleMatcher throughput and accuracy.")
+    matcher.add_argument("--pairs", type=int, default=10000, help="Title pairs to score.")
+    args = parser.parse_args()
+
+    if args.command == "matcher":
+        bench_matcher(args.pairs)
+        return 0
+    workers = [int(value) for value in getattr(args, "workers", "1,8,32").split(",") if value.strip()]
+    bench_engine(getattr(args, "rows", 200), workers, getattr(args, "latency", 0.02))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""Benchmarks for the static site audit scripts.
+
+    python scripts/bench_site_audits.py terms    # per-term substring scans vs TermAutomaton, 5k terms x site
+    python scripts/bench_site_audits.py context  # extract_context vs extract_context_at, checked for equality
+    python scripts/bench_site_audits.py extract  # TextExtractor nodes/sec on the longest blog pages
+    python scripts/bench_site_audits.py homepage # per-inventory walks vs collect_page, with and without the tag index
+    python scripts/bench_site_audits.py text     # recursive vs streaming text_blocks on the longest journal pages
+    python scripts/bench_site_audits.py references  # one rglob scan per asset vs ReferenceIndex, cold and persisted
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import generate_homepage_audit as homepage_audit  # noqa: E402
+import run_infoicon_audit  # noqa: E402
+import trim_recheck_static  # noqa: E402
+from reference_index import DEFAULT_EXCLUDED, DEFAULT_SUFFIXES, ReferenceIndex  # noqa: E402
+from term_matcher import TermAutomaton  # noqa: E402
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def site_pages() -> List[Path]:
+    inventory = run_infoicon_audit.load_inventory(REPO_ROOT)
+    paths = [REPO_ROOT / entry["file"] for entry in inventory if entry["file"].endswith(".html")]
+    return [path for path in paths if path.is_file()]
+
+
+def synthetic_terms(texts: List[str], count: int, seed: int = 11) -> List[str]:
+    """Real priority terms, then site n-grams (mostly hits) and random strings (misses)."""
+    rng = random.Random(seed)
+    terms = list(run_infoicon_audit.load_terms(REPO_ROOT / "aquarium_search_terms_infoicon_priority.csv"))
+    seen = set(terms)
+    words = [text.lower().split() for text in texts]
+    words = [chunk for chunk in words if chunk]
+    while len(terms) < count:
+        if rng.random() < 0.5:
+            chunk = rng.choice(words)
+            start = rng.randrange(len(chunk))
+            term = " ".join(chunk[start:start + rng.randint(1, 3)])
+        else:
+            term = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 12)))
+        if term and term not in seen:
+            seen.add(term)
+            terms.append(term)
+    return terms
+
+
+def bench_terms(count: int, word_boundaries: bool) -> None:
+    pages = site_pages()
+    started = time.perf_counter()
+    texts = [node.text.lower() for page in pages for node in run_infoicon_audit.parse_html_text(page)]
+    parse_elapsed = time.perf_counter() - started
+    terms = synthetic_terms(texts, count)
+    chars = sum(len(text) for text in texts)
+    print(f"terms: {len(terms)} terms x {len(pages)} pages ({len(texts)} text nodes, {chars} chars; parse {parse_elapsed:.2f}s)")
+
+    naive: List[Set[int]] = []
+    if not word_boundaries:
+        started = time.perf_counter()
+        for text in texts:
+            naive.append({term_id for term_id, term in enumerate(terms) if term in text})
+        naive_elapsed = time.perf_counter() - started
+        print(f"  per-term scan   {naive_elapsed:8.3f}s  ({len(terms) * len(texts)} substring tests)")
+
+    started = time.perf_counter()
+    automaton = TermAutomaton(terms, word_boundaries=word_boundaries)
+    build_elapsed = time.perf_counter() - started
+    started = time.perf_counter()
+    found = [automaton.find_ids(text) for text in texts]
+    scan_elapsed = time.perf_counter() - started
+    hits = sum(len(ids) for ids in found)
+    print(f"  TermAutomaton   {scan_elapsed:8.3f}s  (+{build_elapsed:.3f}s build, {hits} node/term hits)")
+    if naive:
+        print(f"  speedup {naive_elapsed / scan_elapsed:.1f}x, identical hits: {naive == found}")
+
+
+def bench_context(count: int) -> None:
+    pages = site_pages()
+    texts = [node.text for page in pages for node in run_infoicon_audit.parse_html_text(page)]
+    terms = synthetic_terms([text.lower() for text in texts], count)
+    automaton = TermAutomaton(terms)
+    jobs = []
+    for text in texts:
+        lowered = text.lower()
+        for term_id, starts in automaton.occurrences(lowered).items():
+            jobs.append((text, lowered, terms[term_id], starts))
+    # Long paragraphs are where the old per-position slicing hurts.
+    long_text = " ".join(texts) * 3
+    long_lower = long_text.lower()
+    for term_id, starts in list(automaton.occurrences(long_lower).items())[:200]:
+        jobs.append((long_text, long_lower, terms[term_id], starts))
+    print(f"context: {len(jobs)} (node, term) hits from {len(terms)} terms, incl. 200 in a {len(long_text)}-char paragraph")
+
+    started = time.perf_counter()
+    legacy = [run_infoicon_audit.extract_context(text, term) for text, _, term, _ in jobs]
+    legacy_elapsed = time.perf_counter() - started
+    started = time.perf_counter()
+    fast = [run_infoicon_audit.extract_context_at(text, lowered, term, starts) for text, lowered, term, starts in jobs]
+    fast_elapsed = time.perf_counter() - started
+    mismatches = sum(1 for old, new in zip(legacy, fast) if old != new)
+    print(f"  extract_context     {legacy_elapsed:8.3f}s")
+    print(f"  extract_context_at  {fast_elapsed:8.3f}s  ({legacy_elapsed / fast_elapsed:.1f}x)")
+    print(f"  identical excerpts: {len(jobs) - mismatches}/{len(jobs)}")
+
+
+def longest_blog_pages(count: int) -> List[Path]:
+    pages = [path for path in (REPO_ROOT / "blogs").rglob("*.html") if path.is_file()]
+    return sorted(pages, key=lambda path: path.stat().st_size, reverse=True)[:count]
+
+
+def nested_page(depth: int) -> str:
+    """A page whose text sits under ``depth`` nested containers, each with its own paragraph."""
+    opening = "".join(f'<div class="level l{level}"><p>Level {level} text about nitrate.</p>' for level in range(depth))
+    return f"<html><body>{opening}{'</div>' * depth}</body></html>"
+
+
+def bench_extract(count: int, repeat: int, depth: int) -> None:
+    pages = longest_blog_pages(count)
+    corpora = [
+        (f"{len(pages)} longest blog pages", [page.read_text(encoding="utf-8") for page in pages]),
+        (f"synthetic page nested {depth} deep", [nested_page(depth)]),
+    ]
+    for title, sources in corpora:
+        print(f"extract: {title} ({sum(len(source) for source in sources)} chars), {repeat} passes")
+        for label, touch_paths in (("parse only", False), ("parse + every path", True)):
+            nodes = 0
+            started = time.perf_counter()
+            for _ in range(repeat):
+                for source in sources:
+                    parser = run_infoicon_audit.TextExtractor()
+                    parser.feed(source)
+                    parser.close()
+                    nodes += len(parser.nodes)
+                    if touch_paths:
+                        for node in parser.nodes:
+                            node.path
+            elapsed = time.perf_counter() - started
+            print(f"  {label:<20} {nodes / elapsed:10.0f} nodes/sec  ({elapsed:.3f}s, {nodes // repeat} nodes per pass)")
+
+
+def multipass_inventory(html: str, path: Path, head: Any, body: Any, default_base: str) -> Tuple[Dict[str, Any], List[Tuple[str, str]]]:
+    """The inventory as audit_page built it before collect_page: one tree walk per collector."""
+    hp = homepage_audit
+    meta = hp.empty_meta()
+    title_el = head.find_first("title")
+    if title_el:
+        hp.record_title(meta, title_el)
+    for el in head.find_all("meta"):
+        hp.record_meta_tag(meta, el)
+    for el in head.find_all("link"):
+        hp.record_canonical(meta, el)
+    scripts = head.find_all("script") + body.find_all("script")
+    structured_data = [
+        hp.structured_data_item(script) for script in scripts if script.attrs.get("type", "").lower() == "application/ld+json"
+    ]
+    base = hp.resolve_base(meta, path, default_base)
+
+    internal: List[Dict[str, Any]] = []
+    external: List[Dict[str, Any]] = []
+    policy_presence = hp.empty_policy_presence()
+
+    def traverse(node: Any) -> None:
+        if node.tag == "a":
+            hp.record_link(node, base, internal, external, policy_presence)
+        for child in node.children:
+            if isinstance(child, hp.Element):
+                traverse(child)
+
+    traverse(body)
+    headings = [
+        {"level": level.upper(), "text": text}
+        for level in hp.HEADING_TAGS
+        for text in (hp.normalize_space(node.text_content()) for node in body.find_all(level))
+        if text
+    ]
+    images = [hp.image_entry(img, base) for img in body.find_all("img")]
+    script_entries = [hp.script_entry(script, base) for script in scripts]
+    stylesheets = [hp.stylesheet_entry(link, base) for link in head.find_all("link") if link.attrs.get("rel", "").lower() == "stylesheet"]
+    stylesheets += [hp.inline_style_entry(style) for style in head.find_all("style")]
+    fonts: List[Dict[str, Any]] = []
+    seen: Set[Tuple[str, Any]] = set()
+    for link in head.find_all("link"):
+        hp.record_fonts(link, fonts, seen)
+    cls_placeholders = all("width" in img.attrs and "height" in img.attrs for img in body.find_all("img"))
+    inventory = hp.build_inventory(
+        meta,
+        structured_data,
+        internal,
+        external,
+        policy_presence,
+        headings,
+        images,
+        script_entries,
+        stylesheets,
+        fonts,
+        hp.performance_hints(html, cls_placeholders),
+    )
+    return inventory, recursive_text_blocks(body)
+
+
+def parse_audit_page(path: Path, indexed: bool = True) -> Tuple[Path, str, Any, Any]:
+    html = path.read_text(encoding="utf-8")
+    builder = homepage_audit.TreeBuilder()
+    builder.feed(html)
+    builder.finish()
+    if not indexed:
+        # Detach the TagIndex so lookups fall back to walking the tree.
+        for element in builder.root.iter():
+            element.index = None
+    return path, html, builder.root.find_first("head"), builder.root.find_first("body")
+
+
+def bench_homepage(count: int, repeat: int) -> None:
+    default_base = "https://thetankguide.com/"
+    journal = sorted((REPO_ROOT / "journal").glob("*.html"), key=lambda path: path.stat().st_size, reverse=True)[:count]
+    paths = list(dict.fromkeys(site_pages() + journal))
+    identical = total = 0
+    for path in paths:
+        results = []
+        for indexed in (False, True):
+            _, html, head, body = parse_audit_page(path, indexed)
+            if head is None or body is None:
+                break
+            results.append(multipass_inventory(html, path, head, body, default_base))
+            results.append(homepage_audit.collect_page(html, path, head, body, default_base))
+        if results:
+            total += 1
+            identical += all(result == results[0] for result in results)
+    print(f"homepage: identical inventories and text blocks on {identical}/{total} site and journal pages")
+
+    targets = [REPO_ROOT / "index.html"] + journal
+    chars = sum(len(path.read_text(encoding="utf-8")) for path in targets)
+    print(f"  index.html + {len(journal)} longest journal pages ({chars} chars), {repeat} passes")
+    baseline = 0.0
+    for indexed in (False, True):
+        selected = [parse_audit_page(path, indexed) for path in targets]
+        for label, collect in (("one walk per collector", multipass_inventory), ("collect_page", homepage_audit.collect_page)):
+            started = time.perf_counter()
+            for _ in range(repeat):
+                for path, html, head, body in selected:
+                    collect(html, path, head, body, default_base)
+            elapsed = time.perf_counter() - started
+            baseline = baseline or elapsed
+            mode = "tag index" if indexed else "tree walks"
+            print(f"  {label:<24} {mode:<10} {len(selected) * repeat / elapsed:8.1f} pages/sec  ({elapsed:.3f}s, {baseline / elapsed:.1f}x)")
+
+
+def recursive_text_content(node: Any) -> str:
+    """Element.text_content before it was made iterative."""
+    parts: List[str] = []
+    for child in node.children:
+        if isinstance(child, str):
+            parts.append(child)
+        elif child.tag == "br":
+            parts.append("\n")
+        else:
+            parts.append(recursive_text_content(child))
+    return "".join(parts)
+
+
+def recursive_text_blocks(body: Any) -> List[Tuple[str, str]]:
+    """text_blocks before the streaming TextBlockCollector: recursion plus text_content per block."""
+    normalize = homepage_audit.normalize_space
+    blocks: List[Tuple[str, str]] = []
+
+    def traverse(node: Any) -> None:
+        if node.tag in {"nav", "script", "style"}:
+            return
+        if node.tag in {"h1", "h2", "h3", "h4", "h5", "h6"}:
+            text = normalize(recursive_text_content(node))
+            if text:
+                blocks.append((node.tag.upper(), text))
+            return
+        if node.tag in {"p", "li", "blockquote", "figcaption"}:
+            text = normalize(recursive_text_content(node))
+            if text:
+                blocks.append(("TEXT", text))
+            return
+        for child in node.children:
+            if isinstance(child, str):
+                text = normalize(child)
+                if text:
+                    blocks.append(("TEXT", text))
+            else:
+                traverse(child)
+
+    traverse(body)
+    return blocks
+
+
+def bench_text(count: int, repeat: int, depth: int) -> None:
+    journal = sorted((REPO_ROOT / "journal").glob("*.html"), key=lambda path: path.stat().st_size, reverse=True)[:count]
+    pages = [parse_audit_page(path) for path in dict.fromkeys(site_pages() + journal)]
+    bodies = [body for _, _, _, body in pages if body is not None]
+    identical = sum(1 for body in bodies if recursive_text_blocks(body) == homepage_audit.text_blocks(body))
+    print(f"text: identical blocks on {identical}/{len(bodies)} site and journal pages")
+
+    selected = [body for path, _, _, body in pages if path in journal]
+    chars = sum(len(text) for body in selected for _, text in homepage_audit.text_blocks(body))
+    print(f"  {len(selected)} longest journal pages ({chars} chars of block text), {repeat} passes")
+    for label, extract in (("recursive text_blocks", recursive_text_blocks), ("streaming text_blocks", homepage_audit.text_blocks)):
+        started = time.perf_counter()
+        blocks = 0
+        for _ in range(repeat):
+            for body in selected:
+                blocks += len(extract(body))
+        elapsed = time.perf_counter() - started
+        print(f"  {label:<22} {blocks / elapsed:10.0f} blocks/sec  {chars * repeat / elapsed / 1e6:6.2f} MB/sec  ({elapsed:.3f}s)")
+
+    builder = homepage_audit.TreeBuilder()
+    builder.feed(nested_page(depth))
+    builder.finish()
+    body = builder.root.find_first("body")
+    print(f"  synthetic page nested {depth} deep:")
+    for label, extract in (("recursive text_blocks", recursive_text_blocks), ("streaming text_blocks", homepage_audit.text_blocks)):
+        started = time.perf_counter()
+        try:
+            result = f"{len(extract(body))} blocks"
+        except RecursionError:
+            result = "RecursionError"
+        print(f"  {label:<22} {result} ({time.perf_counter() - started:.3f}s)")
+
+
+def rglob_references(term: str) -> List[str]:
+    """The original find_references: a full rglob and a read of every source file per term."""
+    matches: List[str] = []
+    for file_path in REPO_ROOT.rglob("*"):
+        if not file_path.is_file():
+            continue
+        if any(part in DEFAULT_EXCLUDED for part in file_path.parts):
+            continue
+        if file_path.suffix.lower() not in DEFAULT_SUFFIXES:
+            continue
+        try:
+            text = file_path.read_text(encoding="utf-8")
+        except (UnicodeDecodeError, OSError):
+            continue
+        if term in text:
+            matches.append(str(file_path.relative_to(REPO_ROOT)))
+    return matches
+
+
+def bench_references(count: int) -> None:
+    """REMOVED_ASSETS plus real asset paths, so most terms have references."""
+    assets = sorted(str(path.relative_to(REPO_ROOT)) for path in (REPO_ROOT / "assets").rglob("*") if path.is_file())
+    terms = list(dict.fromkeys(trim_recheck_static.REMOVED_ASSETS + assets))[:count]
+    started = time.perf_counter()
+    baseline = {term: rglob_references(term) for term in terms}
+    scan_time = time.perf_counter() - started
+    print(f"references: {len(terms)} terms")
+    print(f"  {'rglob per term':<26} ({scan_time:.3f}s)")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = Path(tmp) / "reference_index.json"
+        for label in ("ReferenceIndex, cold", "ReferenceIndex, persisted"):
+            index = ReferenceIndex(REPO_ROOT, terms, cache_path)
+            started = time.perf_counter()
+            found = index.references()
+            elapsed = time.perf_counter() - started
+            print(
+                f"  {label:<26} ({elapsed:.3f}s, {scan_time / elapsed:.0f}x) read {index.files_read} files, "
+                f"reused {index.files_reused}, identical={found == baseline}"
+            )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the site audit scripts.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    terms = sub.add_parser("terms", help="Term matching over every text node of the site.")
+    terms.add_argument("--terms", type=int, default=5000, help="Number of terms to match.")
+    terms.add_argument("--word-boundaries", action="store_true", help="Benchmark whole-word matching only.")
+    context = sub.add_parser("context", help="Context extraction for every term hit on the site.")
+    context.add_argument("--terms", type=int, default=5000, help="Number of terms to match.")
+    extract = sub.add_parser("extract", help="TextExtractor throughput on the longest blog pages.")
+    extract.add_argument("--pages", type=int, default=5, help="How many of the longest blog pages to parse.")
+    extract.add_argument("--repeat", type=int, default=20, help="Passes over the pages.")
+    extract.add_argument("--depth", type=int, default=300, help="Nesting depth of the synthetic page.")
+    homepage = sub.add_parser("homepage", help="generate_homepage_audit inventory collection, old vs single pass.")
+    homepage.add_argument("--pages", type=int, default=5, help="How many of the longest journal pages to include.")
+    homepage.add_argument("--repeat", type=int, default=50, help="Passes over the pages.")
+    text = sub.add_parser("text", help="text_blocks throughput on the longest journal pages and on deep nesting.")
+    text.add_argument("--pages", type=int, default=5, help="How many of the longest journal pages to include.")
+    text.add_argument("--repeat", type=int, default=50, help="Passes over the pages.")
+    text.add_argument("--depth", type=int, default=5000, help="Nesting depth of the synthetic page.")
+    references = sub.add_parser("references", help="trim_recheck_static reference lookups, per-term scans vs one index.")
+    references.add_argument("--terms", type=int, default=40, help="Number of asset paths to look up.")
+    args = parser.parse_args()
+
+    if args.command == "terms":
+        bench_terms(args.terms, args.word_boundaries)
+    elif args.command == "context":
+        bench_context(args.terms)
+    elif args.command == "extract":
+        bench_extract(args.pages, args.repeat, args.depth)
+    elif args.command == "homepage":
+        bench_homepage(args.pages, args.repeat)
+    elif args.command == "text":
+        bench_text(args.pages, args.repeat, args.depth)
+    elif args.command == "references":
+        bench_references(args.terms)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
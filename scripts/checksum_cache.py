@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Persistent sha256 cache shared by the checksum steps of the audit scripts.
+
+Digests are stored in _codex_sync/cache/checksums.json under each file's
+path, together with the (size, mtime_ns, inode) it had when it was hashed. A
+later run only re-hashes files whose stat changed, and hashes those on a
+thread pool (hashlib releases the GIL on large buffers):
+
+    cache = ChecksumCache().load()
+    digests = cache.hash_files(paths)
+    cache.save()
+
+Files modified within RACY_WINDOW_NS of the run are hashed but not stored, so
+an edit landing in the same mtime tick as the hash is never served stale.
+
+    python scripts/checksum_cache.py stats
+    python scripts/checksum_cache.py clear
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import stat
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_CACHE_PATH = REPO_ROOT / "_codex_sync" / "cache" / "checksums.json"
+CHECKSUM_CACHE_VERSION = 1
+RACY_WINDOW_NS = 2_000_000_000
+
+StatKey = Tuple[int, int, int]  # (size, mtime_ns, inode)
+
+
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def stat_key(info: os.stat_result) -> StatKey:
+    return (info.st_size, info.st_mtime_ns, info.st_ino)
+
+
+class ChecksumCache:
+    """sha256 digests keyed by path and validated against the file's stat.
+
+    With ``path=None`` nothing is read or written, but hashing is still
+    parallel. ``jobs`` is the thread pool size (``None`` lets
+    ThreadPoolExecutor choose).
+    """
+
+    def __init__(self, path: Optional[Path] = DEFAULT_CACHE_PATH, jobs: Optional[int] = None) -> None:
+        self.path = path
+        self.jobs = jobs
+        self.entries: Dict[str, List] = {}  # path -> [size, mtime_ns, inode, digest]
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+
+    def load(self) -> "ChecksumCache":
+        self.entries = {}
+        if self.path is None or not self.path.is_file():
+            return self
+        try:
+            with self.path.open("r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except (OSError, ValueError):
+            return self
+        if isinstance(payload, dict) and payload.get("version") == CHECKSUM_CACHE_VERSION:
+            entries = payload.get("files")
+            if isinstance(entries, dict):
+                self.entries = entries
+        return self
+
+    def hash_files(self, paths: Iterable[Path]) -> Dict[Path, str]:
+        """Digest of every regular file in ``paths``, in input order; anything else is skipped."""
+        found: Dict[Path, Optional[str]] = {}
+        pending: List[Tuple[Path, StatKey]] = []
+        for path in paths:
+            if path in found:
+                continue
+            try:
+                info = os.stat(path)
+            except OSError:
+                self._forget(path)
+                continue
+            if not stat.S_ISREG(info.st_mode):
+                self._forget(path)
+                continue
+            key = stat_key(info)
+            entry = self.entries.get(os.fspath(path))
+            if entry is not None and tuple(entry[:3]) == key:
+                found[path] = entry[3]
+                self.hits += 1
+            else:
+                found[path] = None
+                pending.append((path, key))
+
+        if pending:
+            self.misses += len(pending)
+            if len(pending) == 1:
+                digests = [sha256_file(pending[0][0])]
+            else:
+                with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+                    digests = list(pool.map(sha256_file, [path for path, _ in pending]))
+            racy_after = time.time_ns() - RACY_WINDOW_NS
+            for (path, key), digest in zip(pending, digests):
+                found[path] = digest
+                if key[1] < racy_after:
+                    self.entries[os.fspath(path)] = [*key, digest]
+                    self._dirty = True
+        return {path: digest for path, digest in found.items() if digest is not None}
+
+    def _forget(self, path: Path) -> None:
+        if self.entries.pop(os.fspath(path), None) is not None:
+            self._dirty = True
+
+    def save(self) -> None:
+        if self.path is None or not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            json.dump({"version": CHECKSUM_CACHE_VERSION, "files": self.entries}, handle, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect or reset the shared checksum cache.")
+    parser.add_argument("--path", type=Path, default=DEFAULT_CACHE_PATH, help="Cache file.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Entry count and stale entries.")
+    sub.add_parser("clear", help="Remove the cache file.")
+    args = parser.parse_args(argv)
+
+    if args.command == "stats":
+        cache = ChecksumCache(args.path).load()
+        stale = 0
+        for name, entry in cache.entries.items():
+            try:
+                fresh = stat_key(os.stat(name)) == tuple(entry[:3])
+            except OSError:
+                fresh = False
+            stale += not fresh
+        print(f"{len(cache.entries)} files ({stale} stale) in {args.path}")
+    else:
+        try:
+            args.path.unlink()
+        except FileNotFoundError:
+            pass
+        print(f"Removed {args.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
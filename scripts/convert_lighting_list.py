@@ -5,12 +5,12 @@ from __future__ import annotations
 import csv
 import re
 import sys
-import urllib.error
-import urllib.request
 from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Tuple
 
+from shortlink_store import SHORTLINK_DOMAINS, default_store
+
 REPO_ROOT = Path(__file__).resolve().parents[1]
 INPUT_FILE = REPO_ROOT / "data/raw/LIGHTS.csv"
 OUTPUT_FILE = REPO_ROOT / "gear_master.csv"
@@ -45,8 +45,6 @@ TITLE_CANDIDATE_FIELDS = [
 COMMENT_FIELDS = ["comment", "comments", "notes", "note"]
 URL_FIELDS = ["url", "link", "product url", "amazon link", "asin url", "asin link"]
 
-SHORTLINK_DOMAINS = {"a.co", "amzn.to"}
-
 UNSAFE_PATTERNS = [
     re.compile(r"\$\s*\d+[\d,]*(?:\.\d+)?", re.I),
     re.compile(r"\bUSD\b", re.I),
@@ -117,12 +115,10 @@ def extract_asin_from_url(url: str) -> Optional[str]:
 
 
 def resolve_shortlink(url: str) -> Optional[str]:
-    try:
-        with urllib.request.urlopen(url, timeout=5) as response:  # type: ignore[arg-type]
-            final_url = response.geturl()
-    except (urllib.error.URLError, urllib.error.HTTPError, ValueError, TimeoutError):
+    record = default_store().resolve(url)
+    if record is None:
         return None
-    return extract_asin_from_url(final_url)
+    return extract_asin_from_url(record["final_url"])
 
 
 def sanitize_notes(raw_note: str, stats: ConversionStats) -> str:
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""Parse-once cache of HTML tokenisations shared by the site audit scripts.
+
+Each page is run through html.parser once per content hash and the resulting
+event stream (start/end tags, text, comments) is stored with marshal under
+_codex_sync/cache/documents/. Any HTMLParser subclass can then be fed from the
+cache instead of re-tokenising the source:
+
+    document = DocumentCache().load(Path("index.html"))
+    parser = document.replay(TextExtractor())
+
+replay() reproduces feed() followed by close(); replay(parser, flush=False)
+stops at the events feed() alone produced, for parsers that never call close().
+
+Entries are one file per hash, written atomically, so parallel workers can
+share the directory. A hit refreshes the entry's mtime, and once the cache
+holds more than max_entries files or max_bytes the least recently used
+entries are removed.
+
+    python scripts/doc_cache.py stats
+    python scripts/doc_cache.py prune --max-entries 256 --max-mb 32
+    python scripts/doc_cache.py clear
+"""
+from __future__ import annotations
+
+import argparse
+import marshal
+import os
+import sys
+from dataclasses import dataclass
+from hashlib import sha256
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import List, Optional, Tuple, TypeVar
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_CACHE_DIR = REPO_ROOT / "_codex_sync" / "cache" / "documents"
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Bump when the event format changes. html.parser output can differ between
+# Python releases, so entries are also tied to the interpreter's minor version.
+DOC_CACHE_VERSION = 2
+PARSER_TAG = f"py{sys.version_info[0]}.{sys.version_info[1]}"
+
+START, STARTEND, END, DATA, COMMENT = range(5)
+
+Event = Tuple  # (START|STARTEND, tag, attrs) | (END, tag) | (DATA|COMMENT, text)
+ParserT = TypeVar("ParserT", bound=HTMLParser)
+
+
+class EventRecorder(HTMLParser):
+    """Records the handler calls html.parser makes, with charrefs converted as the audit parsers do."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.events: List[Event] = []
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self.events.append((START, tag, tuple(attrs)))
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self.events.append((STARTEND, tag, tuple(attrs)))
+
+    def handle_endtag(self, tag: str) -> None:
+        self.events.append((END, tag))
+
+    def handle_data(self, data: str) -> None:
+        self.events.append((DATA, data))
+
+    def handle_comment(self, data: str) -> None:
+        self.events.append((COMMENT, data))
+
+
+def tokenize(source: str) -> Tuple[List[Event], int]:
+    """The events of ``feed(source)`` then ``close()``, and how many of them ``feed()`` produced."""
+    recorder = EventRecorder()
+    recorder.feed(source)
+    fed = len(recorder.events)
+    recorder.close()
+    return recorder.events, fed
+
+
+def replay(events: List[Event], parser: ParserT) -> ParserT:
+    """Feed recorded events to ``parser``'s handlers in order."""
+    handlers = {
+        START: parser.handle_starttag,
+        STARTEND: parser.handle_startendtag,
+        END: parser.handle_endtag,
+        DATA: parser.handle_data,
+        COMMENT: parser.handle_comment,
+    }
+    for event in events:
+        kind = event[0]
+        if kind == START or kind == STARTEND:
+            handlers[kind](event[1], list(event[2]))
+        else:
+            handlers[kind](event[1])
+    return parser
+
+
+def decode_source(raw: bytes) -> str:
+    """The text ``Path.read_text(encoding="utf-8")`` returns, universal newlines included."""
+    return raw.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+
+@dataclass
+class Document:
+    path: Path
+    source: str
+    digest: str
+    events: List[Event]
+    # Events produced by feed(); the rest are what close() flushed from html.parser's buffer.
+    fed: int
+
+    def replay(self, parser: ParserT, flush: bool = True) -> ParserT:
+        return replay(self.events if flush else self.events[:self.fed], parser)
+
+
+def parse_document(path: Path) -> Document:
+    """Tokenise ``path`` without touching the cache."""
+    raw = path.read_bytes()
+    source = decode_source(raw)
+    return Document(path, source, sha256(raw).hexdigest(), *tokenize(source))
+
+
+class DocumentCache:
+    """Tokenised pages keyed by the sha256 of their bytes."""
+
+    def __init__(
+        self,
+        root: Path = DEFAULT_CACHE_DIR,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.root = root
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def entry_path(self, digest: str) -> Path:
+        return self.root / f"{digest}.marshal"
+
+    def load(self, path: Path) -> Document:
+        raw = path.read_bytes()
+        digest = sha256(raw).hexdigest()
+        source = decode_source(raw)
+        entry = self.get(digest)
+        if entry is None:
+            self.misses += 1
+            entry = tokenize(source)
+            self.put(digest, *entry)
+        else:
+            self.hits += 1
+        return Document(path, source, digest, *entry)
+
+    def get(self, digest: str) -> Optional[Tuple[List[Event], int]]:
+        entry = self.entry_path(digest)
+        try:
+            # marshal.loads on the whole file; marshal.load on a handle is far slower.
+            version, parser_tag, events, fed = marshal.loads(entry.read_bytes())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if version != DOC_CACHE_VERSION or parser_tag != PARSER_TAG:
+            return None
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return events, fed
+
+    def put(self, digest: str, events: List[Event], fed: int) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        entry = self.entry_path(digest)
+        tmp_path = entry.with_name(f".{entry.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(marshal.dumps((DOC_CACHE_VERSION, PARSER_TAG, events, fed)))
+        os.replace(tmp_path, entry)
+        self.prune()
+
+    def entries(self) -> List[Tuple[float, int, Path]]:
+        """(mtime, size, path) of every entry, least recently used first."""
+        found: List[Tuple[float, int, Path]] = []
+        try:
+            scan = os.scandir(self.root)
+        except OSError:
+            return found
+        with scan:
+            for item in scan:
+                if not item.name.endswith(".marshal"):
+                    continue
+                try:
+                    stat = item.stat()
+                except OSError:
+                    continue
+                found.append((stat.st_mtime, stat.st_size, Path(item.path)))
+        found.sort()
+        return found
+
+    def prune(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None) -> int:
+        """Drop least recently used entries until both limits hold; returns how many were removed."""
+        max_entries = self.max_entries if max_entries is None else max_entries
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, entry in entries:
+            if len(entries) - removed <= max_entries and total <= max_bytes:
+                break
+            try:
+                entry.unlink()
+            except FileNotFoundError:
+                pass  # another worker evicted it first
+            total -= size
+            removed += 1
+        return removed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect or trim the shared HTML document cache.")
+    parser.add_argument("--root", type=Path, default=DEFAULT_CACHE_DIR, help="Cache directory.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Entry count and size.")
+    prune = sub.add_parser("prune", help="Evict least recently used entries down to the limits.")
+    prune.add_argument("--max-entries", type=int, default=DEFAULT_MAX_ENTRIES)
+    prune.add_argument("--max-mb", type=float, default=DEFAULT_MAX_BYTES / (1024 * 1024))
+    sub.add_parser("clear", help="Remove every entry.")
+    args = parser.parse_args(argv)
+
+    cache = DocumentCache(args.root)
+    if args.command == "stats":
+        entries = cache.entries()
+        size = sum(size for _, size, _ in entries)
+        print(f"{len(entries)} documents, {size / 1024:.1f} KiB in {cache.root}")
+    elif args.command == "prune":
+        removed = cache.prune(args.max_entries, int(args.max_mb * 1024 * 1024))
+        print(f"Removed {removed} documents")
+    else:
+        removed = cache.prune(0, 0)
+        print(f"Removed {removed} documents")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,14 +1,23 @@
 #!/usr/bin/env python3
 import argparse
+import csv
+import heapq
 import json
 import re
 import subprocess
+from bisect import bisect_right
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
+from operator import attrgetter
 from html.parser import HTMLParser
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 from urllib.parse import parse_qs, urljoin, urlparse
 
+from doc_cache import DocumentCache
+
 VOID_TAGS = {
     "area",
     "base",
@@ -33,62 +42,140 @@ class Element:
         self.attrs = attrs or {}
         self.children: List[Any] = []
         self.parent: Optional["Element"] = None
+        # Set by TreeBuilder: position in document order, position of the last
+        # descendant once the element is closed, and the document's tag index.
+        self.order = -1
+        self.end_order: Optional[int] = None
+        self.index: Optional["TagIndex"] = None
+
+    def indexed(self) -> bool:
+        return self.index is not None and self.end_order is not None
 
     def append_child(self, child: Any) -> None:
         if isinstance(child, Element):
             child.parent = self
         self.children.append(child)
 
-    def iter(self) -> "List[Element]":
+    def iter(self) -> Iterator["Element"]:
         yield self
-        for child in self.children:
-            if isinstance(child, Element):
-                yield from child.iter()
+        stack = [iter(self.children)]
+        while stack:
+            for child in stack[-1]:
+                if isinstance(child, Element):
+                    yield child
+                    stack.append(iter(child.children))
+                    break
+            else:
+                stack.pop()
 
     def find_all(self, tag: str) -> List["Element"]:
+        if self.indexed():
+            return self.index.within(self, tag)
         results = []
-        for child in self.children:
-            if isinstance(child, Element):
-                if child.tag == tag:
-                    results.append(child)
-                results.extend(child.find_all(tag))
+        stack = [iter(self.children)]
+        while stack:
+            for child in stack[-1]:
+                if isinstance(child, Element):
+                    if child.tag == tag:
+                        results.append(child)
+                    stack.append(iter(child.children))
+                    break
+            else:
+                stack.pop()
         return results
 
     def find_first(self, tag: str) -> Optional["Element"]:
-        for child in self.children:
-            if isinstance(child, Element):
-                if child.tag == tag:
-                    return child
-                match = child.find_first(tag)
-                if match is not None:
-                    return match
+        if self.indexed():
+            return self.index.first_within(self, tag)
+        stack = [iter(self.children)]
+        while stack:
+            for child in stack[-1]:
+                if isinstance(child, Element):
+                    if child.tag == tag:
+                        return child
+                    stack.append(iter(child.children))
+                    break
+            else:
+                stack.pop()
         return None
 
     def text_content(self) -> str:
+        # Iterative so deeply nested markup cannot hit the recursion limit.
         parts: List[str] = []
-        for child in self.children:
-            if isinstance(child, str):
-                parts.append(child)
-            elif isinstance(child, Element):
-                if child.tag == "br":
-                    parts.append("\n")
-                else:
-                    parts.append(child.text_content())
+        stack = [iter(self.children)]
+        while stack:
+            for child in stack[-1]:
+                if isinstance(child, str):
+                    parts.append(child)
+                elif isinstance(child, Element):
+                    if child.tag == "br":
+                        parts.append("\n")
+                    else:
+                        stack.append(iter(child.children))
+                        break
+            else:
+                stack.pop()
         return "".join(parts)
 
 
+class TagIndex:
+    """Elements of one parsed document by tag, in document order.
+
+    Each element spans the orders ``(order, end_order]`` with its descendants, so the
+    matches below any element are one contiguous slice of a tag's list, found by bisection
+    instead of walking the subtree.
+    """
+
+    def __init__(self) -> None:
+        self.elements: Dict[str, List[Element]] = {}
+        self.orders: Dict[str, List[int]] = {}
+        self.count = 0
+
+    def add(self, element: Element) -> None:
+        element.order = self.count
+        element.index = self
+        self.count += 1
+        self.elements.setdefault(element.tag, []).append(element)
+        self.orders.setdefault(element.tag, []).append(element.order)
+
+    def close(self, element: Element) -> None:
+        element.end_order = self.count - 1
+
+    def _bounds(self, element: Element, tag: str) -> Tuple[int, int]:
+        orders = self.orders.get(tag)
+        if not orders:
+            return 0, 0
+        start = bisect_right(orders, element.order)
+        return start, bisect_right(orders, element.end_order, start)
+
+    def within(self, element: Element, tag: str) -> List[Element]:
+        start, end = self._bounds(element, tag)
+        return self.elements[tag][start:end] if end > start else []
+
+    def first_within(self, element: Element, tag: str) -> Optional[Element]:
+        start, end = self._bounds(element, tag)
+        return self.elements[tag][start] if end > start else None
+
+
 class TreeBuilder(HTMLParser):
+    """Builds the Element tree and its TagIndex; lookups use the index after finish()."""
+
     def __init__(self) -> None:
         super().__init__(convert_charrefs=True)
+        self.index = TagIndex()
         self.root = Element("document")
+        self.root.index = self.index
         self.stack: List[Element] = [self.root]
 
     def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
         attrs_dict = {name: (value if value is not None else "") for name, value in attrs}
         element = Element(tag.lower(), attrs_dict)
         self.stack[-1].append_child(element)
+        self.index.add(element)
         if tag.lower() not in VOID_TAGS:
             self.stack.append(element)
+        else:
+            self.index.close(element)
 
     def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
         self.handle_starttag(tag, attrs)
@@ -98,7 +185,7 @@ class TreeBuilder(HTMLParser):
         for i in range(len(self.stack) - 1, 0, -1):
             if self.stack[i].tag == tag_lower:
                 while len(self.stack) - 1 >= i:
-                    self.stack.pop()
+                    self.index.close(self.stack.pop())
                 break
 
     def handle_data(self, data: str) -> None:
@@ -111,6 +198,15 @@ class TreeBuilder(HTMLParser):
         # Comments ignored for DOM traversal but preserved when needed from source text.
         pass
 
+    def finish(self) -> None:
+        """End the elements left open, including the document root.
+
+        This is not close(): the audit has never flushed html.parser's buffer, so
+        an unterminated entity or an unclosed script/style at EOF stays unparsed.
+        """
+        while self.stack:
+            self.index.close(self.stack.pop())
+
 
 WHITESPACE_RE = re.compile(r"\s+")
 
@@ -128,35 +224,13 @@ def extract_head_html(html: str) -> str:
 
 
 def text_blocks(body: Element) -> List[Tuple[str, str]]:
-    blocks: List[Tuple[str, str]] = []
-
-    def traverse(node: Element) -> None:
-        if node.tag in {"nav", "script", "style"}:
-            return
-        if node.tag in {"h1", "h2", "h3", "h4", "h5", "h6"}:
-            text = normalize_space(node.text_content())
-            if text:
-                blocks.append((node.tag.upper(), text))
-            return
-        if node.tag in {"p", "li", "blockquote", "figcaption"}:
-            text = normalize_space(node.text_content())
-            if text:
-                blocks.append(("TEXT", text))
-            return
-        for child in node.children:
-            if isinstance(child, Element):
-                traverse(child)
-            elif isinstance(child, str):
-                text = normalize_space(child)
-                if text:
-                    blocks.append(("TEXT", text))
-
-    traverse(body)
-    return blocks
+    collector = TextBlockCollector()
+    walk_tree(body, [collector])
+    return collector.blocks
 
 
-def collect_meta(head: Element) -> Dict[str, Any]:
-    meta = {
+def empty_meta() -> Dict[str, Any]:
+    return {
         "robots": None,
         "title": None,
         "description": None,
@@ -165,68 +239,66 @@ def collect_meta(head: Element) -> Dict[str, Any]:
         "og": {},
         "twitter": {},
     }
-    title_el = head.find_first("title")
-    if title_el:
-        title_text = normalize_space(title_el.text_content())
-        meta["title"] = f"{title_text} ({len(title_text)})"
-    for el in head.find_all("meta"):
-        name = el.attrs.get("name", "").lower()
-        prop = el.attrs.get("property", "").lower()
-        content = el.attrs.get("content")
-        if content is None:
-            continue
-        if name == "robots":
-            meta["robots"] = content
-        elif name == "description":
-            meta["description"] = f"{content} ({len(content)})"
-        elif name == "viewport":
-            meta["viewport"] = content
-        elif name.startswith("twitter:"):
-            meta["twitter"][name] = content
-        if prop:
-            if prop == "og:url":
-                meta["og"][prop] = content
-            elif prop.startswith("og:"):
-                meta["og"][prop] = content
-    for el in head.find_all("link"):
-        rel = el.attrs.get("rel", "").lower()
-        if rel == "canonical":
-            href = el.attrs.get("href")
-            if href:
-                meta["canonical"] = href
-    return meta
-
-
-def collect_structured_data(head: Element, body: Element) -> List[Dict[str, Any]]:
-    scripts = head.find_all("script") + body.find_all("script")
-    results = []
-    for script in scripts:
-        if script.attrs.get("type", "").lower() != "application/ld+json":
-            continue
-        raw = script.text_content().strip()
-        item: Dict[str, Any] = {"type": None, "valid_json": True, "errors": []}
-        try:
-            parsed = json.loads(raw)
-            def extract_type(obj: Any) -> Optional[str]:
-                if isinstance(obj, dict):
-                    if "@type" in obj:
-                        return obj["@type"]
-                    for value in obj.values():
-                        t = extract_type(value)
-                        if t:
-                            return t
-                elif isinstance(obj, list):
-                    for value in obj:
-                        t = extract_type(value)
-                        if t:
-                            return t
-                return None
-            item["type"] = extract_type(parsed)
-        except json.JSONDecodeError as exc:
-            item["valid_json"] = False
-            item["errors"].append(str(exc))
-        results.append(item)
-    return results
+
+
+def record_title(meta: Dict[str, Any], title_el: Element) -> None:
+    title_text = normalize_space(title_el.text_content())
+    meta["title"] = f"{title_text} ({len(title_text)})"
+
+
+def record_meta_tag(meta: Dict[str, Any], el: Element) -> None:
+    name = el.attrs.get("name", "").lower()
+    prop = el.attrs.get("property", "").lower()
+    content = el.attrs.get("content")
+    if content is None:
+        return
+    if name == "robots":
+        meta["robots"] = content
+    elif name == "description":
+        meta["description"] = f"{content} ({len(content)})"
+    elif name == "viewport":
+        meta["viewport"] = content
+    elif name.startswith("twitter:"):
+        meta["twitter"][name] = content
+    if prop:
+        if prop == "og:url":
+            meta["og"][prop] = content
+        elif prop.startswith("og:"):
+            meta["og"][prop] = content
+
+
+def record_canonical(meta: Dict[str, Any], el: Element) -> None:
+    rel = el.attrs.get("rel", "").lower()
+    if rel == "canonical":
+        href = el.attrs.get("href")
+        if href:
+            meta["canonical"] = href
+
+
+def structured_data_item(script: Element) -> Dict[str, Any]:
+    raw = script.text_content().strip()
+    item: Dict[str, Any] = {"type": None, "valid_json": True, "errors": []}
+    try:
+        parsed = json.loads(raw)
+        def extract_type(obj: Any) -> Optional[str]:
+            if isinstance(obj, dict):
+                if "@type" in obj:
+                    return obj["@type"]
+                for value in obj.values():
+                    t = extract_type(value)
+                    if t:
+                        return t
+            elif isinstance(obj, list):
+                for value in obj:
+                    t = extract_type(value)
+                    if t:
+                        return t
+            return None
+        item["type"] = extract_type(parsed)
+    except json.JSONDecodeError as exc:
+        item["valid_json"] = False
+        item["errors"].append(str(exc))
+    return item
 
 
 def resolve_base(meta: Dict[str, Any], html_path: Path, default_base: Optional[str]) -> str:
@@ -252,62 +324,39 @@ def is_internal(href: str, base: str) -> bool:
     return parsed.netloc == base_host
 
 
-def collect_links(body: Element, base: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, Any]]:
-    internal: List[Dict[str, Any]] = []
-    external: List[Dict[str, Any]] = []
-    policy_presence = {
+def empty_policy_presence() -> Dict[str, Any]:
+    return {
         "privacy": {"found": False, "href": None, "in_static_html": False},
         "terms": {"found": False, "href": None, "in_static_html": False},
         "contact": {"found": False, "href": None, "in_static_html": False},
     }
 
-    def traverse(node: Element) -> None:
-        if node.tag == "nav":
-            # Links present in nav ignored for body text extraction but counted for inventory.
-            pass
-        if node.tag == "a":
-            href = node.attrs.get("href", "")
-            if not href:
-                resolved = ""
-            else:
-                resolved = urljoin(base, href)
-            anchor = normalize_space(node.text_content())
-            rel = node.attrs.get("rel", "")
-            target = node.attrs.get("target", "")
-            data = {"href": resolved, "anchor": anchor, "rel": rel, "target": target}
-            if is_internal(resolved or href, base):
-                internal.append(data)
-            else:
-                external.append(data)
-            lowered = anchor.lower()
-            def mark_policy(key: str) -> None:
-                policy_presence[key]["found"] = True
-                policy_presence[key]["href"] = resolved
-                policy_presence[key]["in_static_html"] = True
-            if "privacy" in lowered:
-                mark_policy("privacy")
-            if "terms" in lowered and "determine" not in lowered:
-                mark_policy("terms")
-            if "contact" in lowered or "feedback" in lowered:
-                policy_presence["contact"]["found"] = True
-                policy_presence["contact"]["href"] = resolved
-                policy_presence["contact"]["in_static_html"] = True
-        for child in node.children:
-            if isinstance(child, Element):
-                traverse(child)
-
-    traverse(body)
-    return internal, external, policy_presence
-
-
-def collect_headings(body: Element) -> List[Dict[str, str]]:
-    headings: List[Dict[str, str]] = []
-    for level in ["h1", "h2", "h3", "h4", "h5", "h6"]:
-        for node in body.find_all(level):
-            text = normalize_space(node.text_content())
-            if text:
-                headings.append({"level": level.upper(), "text": text})
-    return headings
+
+def record_link(node: Element, base: str, internal: List[Dict[str, Any]], external: List[Dict[str, Any]], policy_presence: Dict[str, Any]) -> None:
+    href = node.attrs.get("href", "")
+    if not href:
+        resolved = ""
+    else:
+        resolved = urljoin(base, href)
+    anchor = normalize_space(node.text_content())
+    rel = node.attrs.get("rel", "")
+    target = node.attrs.get("target", "")
+    data = {"href": resolved, "anchor": anchor, "rel": rel, "target": target}
+    if is_internal(resolved or href, base):
+        internal.append(data)
+    else:
+        external.append(data)
+    lowered = anchor.lower()
+    def mark_policy(key: str) -> None:
+        policy_presence[key]["found"] = True
+        policy_presence[key]["href"] = resolved
+        policy_presence[key]["in_static_html"] = True
+    if "privacy" in lowered:
+        mark_policy("privacy")
+    if "terms" in lowered and "determine" not in lowered:
+        mark_policy("terms")
+    if "contact" in lowered or "feedback" in lowered:
+        mark_policy("contact")
 
 
 def infer_image_role(img: Element) -> str:
@@ -327,113 +376,86 @@ def infer_image_role(img: Element) -> str:
     return "inline"
 
 
-def collect_images(body: Element, base: str) -> List[Dict[str, Any]]:
-    images: List[Dict[str, Any]] = []
-    for img in body.find_all("img"):
-        src = img.attrs.get("src", "")
-        resolved = urljoin(base, src) if src else ""
-        alt = img.attrs.get("alt", "")
-        width = img.attrs.get("width")
-        height = img.attrs.get("height")
-        if width and height:
-            dimensions = f"{width}x{height}"
-        else:
-            dimensions = "unknown"
-        images.append(
-            {
-                "src": resolved,
-                "alt": alt,
-                "dimensions": dimensions,
-                "role": infer_image_role(img),
-            }
-        )
-    return images
+def image_entry(img: Element, base: str) -> Dict[str, Any]:
+    src = img.attrs.get("src", "")
+    resolved = urljoin(base, src) if src else ""
+    alt = img.attrs.get("alt", "")
+    width = img.attrs.get("width")
+    height = img.attrs.get("height")
+    if width and height:
+        dimensions = f"{width}x{height}"
+    else:
+        dimensions = "unknown"
+    return {
+        "src": resolved,
+        "alt": alt,
+        "dimensions": dimensions,
+        "role": infer_image_role(img),
+    }
 
 
-def collect_scripts(head: Element, body: Element, base: str) -> List[Dict[str, Any]]:
-    scripts: List[Dict[str, Any]] = []
-    for parent in (head, body):
-        for script in parent.find_all("script"):
-            src = script.attrs.get("src")
-            resolved = urljoin(base, src) if src else None
-            scripts.append(
-                {
-                    "src": resolved,
-                    "async": script.attrs.get("async") is not None,
-                    "defer": script.attrs.get("defer") is not None,
-                    "module": script.attrs.get("type", "").lower() == "module",
-                }
-            )
-    return scripts
+def script_entry(script: Element, base: str) -> Dict[str, Any]:
+    src = script.attrs.get("src")
+    resolved = urljoin(base, src) if src else None
+    return {
+        "src": resolved,
+        "async": script.attrs.get("async") is not None,
+        "defer": script.attrs.get("defer") is not None,
+        "module": script.attrs.get("type", "").lower() == "module",
+    }
 
 
-def collect_stylesheets(head: Element, base: str) -> List[Dict[str, Any]]:
-    stylesheets: List[Dict[str, Any]] = []
-    for link in head.find_all("link"):
-        rel = link.attrs.get("rel", "").lower()
-        if rel == "stylesheet":
-            href = link.attrs.get("href")
-            resolved = urljoin(base, href) if href else None
-            stylesheets.append(
-                {
-                    "href": resolved,
-                    "inline_bytes": 0,
-                    "media": link.attrs.get("media"),
-                }
-            )
-    for style in head.find_all("style"):
-        text = style.text_content()
-        stylesheets.append(
-            {
-                "href": None,
-                "inline_bytes": len(text.encode("utf-8")),
-                "media": style.attrs.get("media"),
-            }
-        )
-    return stylesheets
-
-
-def collect_fonts(head: Element) -> List[Dict[str, Any]]:
-    fonts: List[Dict[str, Any]] = []
-    seen: set[Tuple[str, Optional[str]]] = set()
-    for link in head.find_all("link"):
-        href = link.attrs.get("href", "")
-        rel = link.attrs.get("rel", "").lower()
-        if "fonts.googleapis.com" in href and rel == "stylesheet":
-            parsed = urlparse(href)
-            query = parse_qs(parsed.query)
-            display = query.get("display", [None])[0]
-            families = query.get("family", [])
-            if not families:
-                key = ("unknown", display)
-                if key not in seen:
-                    fonts.append({"family": "unknown", "source": "google", "font-display": display})
-                    seen.add(key)
-            else:
-                for entry in families:
-                    for family_spec in entry.split("|"):
-                        family_name = family_spec.split(":")[0].replace("+", " ")
-                        key = (family_name, display)
-                        if key not in seen:
-                            fonts.append(
-                                {
-                                    "family": family_name,
-                                    "source": "google",
-                                    "font-display": display,
-                                }
-                            )
-                            seen.add(key)
-    return fonts
-
-
-def detect_performance_hints(html: str, body: Element) -> Dict[str, Any]:
+def stylesheet_entry(link: Element, base: str) -> Dict[str, Any]:
+    href = link.attrs.get("href")
+    resolved = urljoin(base, href) if href else None
+    return {
+        "href": resolved,
+        "inline_bytes": 0,
+        "media": link.attrs.get("media"),
+    }
+
+
+def inline_style_entry(style: Element) -> Dict[str, Any]:
+    text = style.text_content()
+    return {
+        "href": None,
+        "inline_bytes": len(text.encode("utf-8")),
+        "media": style.attrs.get("media"),
+    }
+
+
+def record_fonts(link: Element, fonts: List[Dict[str, Any]], seen: set[Tuple[str, Optional[str]]]) -> None:
+    href = link.attrs.get("href", "")
+    rel = link.attrs.get("rel", "").lower()
+    if "fonts.googleapis.com" in href and rel == "stylesheet":
+        parsed = urlparse(href)
+        query = parse_qs(parsed.query)
+        display = query.get("display", [None])[0]
+        families = query.get("family", [])
+        if not families:
+            key = ("unknown", display)
+            if key not in seen:
+                fonts.append({"family": "unknown", "source": "google", "font-display": display})
+                seen.add(key)
+        else:
+            for entry in families:
+                for family_spec in entry.split("|"):
+                    family_name = family_spec.split(":")[0].replace("+", " ")
+                    key = (family_name, display)
+                    if key not in seen:
+                        fonts.append(
+                            {
+                                "family": family_name,
+                                "source": "google",
+                                "font-display": display,
+                            }
+                        )
+                        seen.add(key)
+
+
+def performance_hints(html: str, cls_placeholders: bool) -> Dict[str, Any]:
     hero_gradients = bool(re.search(r"hero[^{]+\{[^}]*gradient", html, re.IGNORECASE))
     blur_or_shadows = "blur(" in html.lower() or "box-shadow" in html.lower()
-    cls_placeholders = True
-    for img in body.find_all("img"):
-        if "width" not in img.attrs or "height" not in img.attrs:
-            cls_placeholders = False
-            break
     return {
         "hero_has_large_gradients": hero_gradients,
         "uses_blur_or_heavy_shadows": blur_or_shadows,
@@ -442,34 +464,333 @@ def detect_performance_hints(html: str, body: Element) -> Dict[str, Any]:
     }
 
 
+HEADING_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+TEXT_BLOCK_TAGS = ("p", "li", "blockquote", "figcaption")
+SKIPPED_TEXT_TAGS = ("nav", "script", "style")
+
+
+class Collector:
+    """One inventory built during a shared :func:`walk_tree` pass.
+
+    Subclasses register handlers in ``starts``/``ends`` (tag -> callable run when the
+    walk enters/leaves a matching element) and may set ``on_text`` to receive every
+    text child in document order. A start handler returning True does not need the
+    element's subtree; the walk skips it when no other walking collector does.
+    """
+
+    def __init__(self) -> None:
+        self.starts: Dict[str, Callable[[Element], Optional[bool]]] = {}
+        self.ends: Dict[str, Callable[[Element], None]] = {}
+        self.on_text: Optional[Callable[[str], None]] = None
+
+    def walks(self) -> bool:
+        """Whether this collector needs a real walk rather than start events alone."""
+        return bool(self.ends) or self.on_text is not None
+
+
+def walk_tree(root: Element, collectors: List[Collector]) -> None:
+    """Depth-first walk over the descendants of ``root``, dispatching to ``collectors`` by tag.
+
+    On an indexed tree, collectors that only register start handlers are fed their
+    elements from the TagIndex in document order, and only the rest share the walk.
+    """
+    if root.indexed():
+        dispatch_indexed(root, [collector for collector in collectors if not collector.walks()])
+        collectors = [collector for collector in collectors if collector.walks()]
+        if not collectors:
+            return
+    starts: Dict[str, List[Callable[[Element], Optional[bool]]]] = {}
+    ends: Dict[str, List[Callable[[Element], None]]] = {}
+    for collector in collectors:
+        for tag, handler in collector.starts.items():
+            starts.setdefault(tag, []).append(handler)
+        for tag, handler in collector.ends.items():
+            ends.setdefault(tag, []).append(handler)
+    text_handlers = [collector.on_text for collector in collectors if collector.on_text is not None]
+    starts_for = starts.get
+    ends_for = ends.get
+    walkers = len(collectors)
+    stack: List[Tuple[Element, Iterator[Any]]] = [(root, iter(root.children))]
+    while stack:
+        for child in stack[-1][1]:
+            if child.__class__ is str:
+                for text_handler in text_handlers:
+                    text_handler(child)
+                continue
+            handlers = starts_for(child.tag)
+            skips = 0
+            if handlers:
+                for handler in handlers:
+                    if handler(child):
+                        skips += 1
+            if child.children and skips < walkers:
+                stack.append((child, iter(child.children)))
+                break
+            for end_handler in ends_for(child.tag, ()):
+                end_handler(child)
+        else:
+            node = stack.pop()[0]
+            if stack:
+                for end_handler in ends_for(node.tag, ()):
+                    end_handler(node)
+
+
+def dispatch_indexed(root: Element, collectors: List[Collector]) -> None:
+    """Start events for ``collectors`` from the TagIndex, in the order walk_tree would give them."""
+    starts: Dict[str, List[Callable[[Element], Optional[bool]]]] = {}
+    for collector in collectors:
+        for tag, handler in collector.starts.items():
+            starts.setdefault(tag, []).append(handler)
+    matches = [root.index.within(root, tag) for tag in starts]
+    for element in heapq.merge(*matches, key=attrgetter("order")):
+        for handler in starts[element.tag]:
+            handler(element)
+
+
+class MetaCollector(Collector):
+    def __init__(self) -> None:
+        super().__init__()
+        self.meta = empty_meta()
+        self.seen_title = False
+        self.starts.update(title=self.title, meta=self.meta_tag, link=self.link)
+
+    def title(self, node: Element) -> None:
+        if not self.seen_title:
+            self.seen_title = True
+            record_title(self.meta, node)
+
+    def meta_tag(self, node: Element) -> None:
+        record_meta_tag(self.meta, node)
+
+    def link(self, node: Element) -> None:
+        record_canonical(self.meta, node)
+
+
+class StylesheetCollector(Collector):
+    """Stylesheet links and inline styles; URLs are resolved once the page base is known."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.links: List[Element] = []
+        self.styles: List[Element] = []
+        self.fonts: List[Dict[str, Any]] = []
+        self.font_keys: set[Tuple[str, Optional[str]]] = set()
+        self.starts.update(link=self.link, style=self.styles.append)
+
+    def link(self, node: Element) -> None:
+        if node.attrs.get("rel", "").lower() == "stylesheet":
+            self.links.append(node)
+        record_fonts(node, self.fonts, self.font_keys)
+
+    def stylesheets(self, base: str) -> List[Dict[str, Any]]:
+        return [stylesheet_entry(link, base) for link in self.links] + [inline_style_entry(style) for style in self.styles]
+
+
+class ScriptCollector(Collector):
+    """Script tags from head and body, feeding both the script inventory and structured data."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.nodes: List[Element] = []
+        self.starts["script"] = self.nodes.append
+
+    def scripts(self, base: str) -> List[Dict[str, Any]]:
+        return [script_entry(script, base) for script in self.nodes]
+
+    def structured_data(self) -> List[Dict[str, Any]]:
+        return [
+            structured_data_item(script)
+            for script in self.nodes
+            if script.attrs.get("type", "").lower() == "application/ld+json"
+        ]
+
+
+class LinkCollector(Collector):
+    def __init__(self, base: str) -> None:
+        super().__init__()
+        self.base = base
+        self.internal: List[Dict[str, Any]] = []
+        self.external: List[Dict[str, Any]] = []
+        self.policy_presence = empty_policy_presence()
+        self.starts["a"] = self.link
+
+    def link(self, node: Element) -> None:
+        record_link(node, self.base, self.internal, self.external, self.policy_presence)
+
+
+class HeadingCollector(Collector):
+    """Headings grouped by level, so the result lists every H1 before any H2 as the inventory always has."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.by_level: Dict[str, List[str]] = {tag: [] for tag in HEADING_TAGS}
+        for tag in HEADING_TAGS:
+            self.starts[tag] = self.heading
+
+    def heading(self, node: Element) -> None:
+        text = normalize_space(node.text_content())
+        if text:
+            self.by_level[node.tag].append(text)
+
+    def headings(self) -> List[Dict[str, str]]:
+        return [{"level": tag.upper(), "text": text} for tag in HEADING_TAGS for text in self.by_level[tag]]
+
+
+class ImageCollector(Collector):
+    def __init__(self, base: str) -> None:
+        super().__init__()
+        self.base = base
+        self.images: List[Dict[str, Any]] = []
+        self.cls_placeholders = True
+        self.starts["img"] = self.image
+
+    def image(self, node: Element) -> None:
+        self.images.append(image_entry(node, self.base))
+        if "width" not in node.attrs or "height" not in node.attrs:
+            self.cls_placeholders = False
+
+
+class TextBlockCollector(Collector):
+    """Readable text as (tag, text) blocks, emitted as each block element closes.
+
+    Headings and p/li/blockquote/figcaption become one block each with all the text
+    below them (a ``br`` reads as a line break); nav, script and style outside a block
+    are skipped; any other text is a block of its own. Text is gathered while the walk
+    streams past it and normalised once per block.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.blocks: List[Tuple[str, str]] = []
+        self.depth = 0
+        self.skipping = False
+        self.label = ""
+        self.pieces: List[str] = []
+        for tag in SKIPPED_TEXT_TAGS + HEADING_TAGS + TEXT_BLOCK_TAGS:
+            self.starts[tag] = self.enter
+            self.ends[tag] = self.leave
+        self.starts["br"] = self.line_break
+        self.on_text = self.text
+
+    def enter(self, node: Element) -> Optional[bool]:
+        self.depth += 1
+        if self.depth > 1:
+            return None
+        if node.tag in SKIPPED_TEXT_TAGS:
+            self.skipping = True
+            return True
+        self.label = node.tag.upper() if node.tag in HEADING_TAGS else "TEXT"
+        return None
+
+    def leave(self, node: Element) -> None:
+        self.depth -= 1
+        if self.depth:
+            return
+        if self.skipping:
+            self.skipping = False
+            return
+        text = normalize_space("".join(self.pieces))
+        self.pieces.clear()
+        if text:
+            self.blocks.append((self.label, text))
+
+    def line_break(self, node: Element) -> None:
+        if self.depth and not self.skipping:
+            self.pieces.append("\n")
+
+    def text(self, data: str) -> None:
+        if not self.depth:
+            if data.isspace():
+                return
+            text = normalize_space(data)
+            if text:
+                self.blocks.append(("TEXT", text))
+        elif not self.skipping:
+            self.pieces.append(data)
+
+
+def collect_page(html: str, html_path: Path, head: Element, body: Element, default_base: Optional[str]) -> Tuple[Dict[str, Any], List[Tuple[str, str]]]:
+    """Inventory and text blocks for a page from one walk over head and one over body."""
+    meta = MetaCollector()
+    styles = StylesheetCollector()
+    scripts = ScriptCollector()
+    walk_tree(head, [meta, styles, scripts])
+    base = resolve_base(meta.meta, html_path, default_base)
+    links = LinkCollector(base)
+    headings = HeadingCollector()
+    images = ImageCollector(base)
+    text = TextBlockCollector()
+    walk_tree(body, [links, headings, images, scripts, text])
+    inventory = build_inventory(
+        meta.meta,
+        scripts.structured_data(),
+        links.internal,
+        links.external,
+        links.policy_presence,
+        headings.headings(),
+        images.images,
+        scripts.scripts(base),
+        styles.stylesheets(base),
+        styles.fonts,
+        performance_hints(html, images.cls_placeholders),
+    )
+    return inventory, text.blocks
+
+
 def flatten_text(blocks: List[Tuple[str, str]]) -> Tuple[str, int, float]:
+    stats = readability_stats(blocks)
+    return blocks_text(blocks), stats["words"], stats["flesch"]
+
+
+def blocks_text(blocks: List[Tuple[str, str]]) -> str:
     lines: List[str] = []
-    words: List[str] = []
-    syllables = 0
-    sentences = 0
     for tag, text in blocks:
         if tag.startswith("H"):
             lines.append(f"{tag}: {text}")
         else:
             lines.append(text)
-        tokens = re.findall(r"[A-Za-z']+", text)
-        words.extend(tokens)
-        sentences += len(re.findall(r"[.!?]", text)) or 1
-        for token in tokens:
-            syllables += count_syllables(token)
-    word_count = len(words)
+    return "\n\n".join(lines)
+
+
+WORD_RE = re.compile(r"[A-Za-z']+")
+SENTENCE_END_RE = re.compile(r"[.!?]")
+
+
+def readability_stats(blocks: List[Tuple[str, str]]) -> Dict[str, Any]:
+    """Word, sentence and syllable counts plus Flesch reading ease for a page's text blocks.
+
+    Every block counts as at least one sentence. Syllables are counted once per distinct
+    word on the page (and memoised across pages by count_syllables).
+    """
+    words = 0
+    sentences = 0
+    vocabulary: Counter = Counter()
+    for _, text in blocks:
+        tokens = WORD_RE.findall(text)
+        vocabulary.update(tokens)
+        words += len(tokens)
+        sentences += len(SENTENCE_END_RE.findall(text)) or 1
+    syllables = sum(count_syllables(word) * count for word, count in vocabulary.items())
+    return {
+        "words": words,
+        "sentences": sentences,
+        "syllables": syllables,
+        "flesch": flesch_reading_ease(words, sentences, syllables),
+    }
+
+
+def flesch_reading_ease(words: int, sentences: int, syllables: int) -> float:
     if sentences == 0:
         sentences = 1
-    if word_count == 0:
-        flesch = 0.0
-    else:
-        flesch = 206.835 - 1.015 * (word_count / sentences) - 84.6 * (syllables / word_count)
-    return "\n\n".join(lines), word_count, round(flesch, 2)
+    if words == 0:
+        return 0.0
+    return round(206.835 - 1.015 * (words / sentences) - 84.6 * (syllables / words), 2)
 
 
 VOWELS = "aeiouy"
 
 
+@lru_cache(maxsize=1 << 16)
 def count_syllables(word: str) -> int:
     word = word.lower()
     word = re.sub(r"[^a-z]", "", word)
@@ -565,12 +886,18 @@ def build_inventory(meta: Dict[str, Any], structured_data: List[Dict[str, Any]],
     }
 
 
-def timestamp_header(slug: str, html_path: Path) -> str:
-    timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-    commit = (
+@lru_cache(maxsize=None)
+def resolve_commit() -> str:
+    return (
         subprocess.check_output(["git", "rev-parse", "HEAD"], text=True)
         .strip()
     )
+
+
+def timestamp_header(slug: str, html_path: Path, commit: Optional[str] = None) -> str:
+    timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    if commit is None:
+        commit = resolve_commit()
     return f"Generated {timestamp} UTC | commit {commit} | source {slug} ({html_path})"
 
 
@@ -601,31 +928,33 @@ def write_issues(output_path: Path, issues: List[Dict[str, Any]], header_info: s
     output_path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
 
 
-def audit_page(html_path: Path, slug: str, output_dir: Path, default_base: Optional[str]) -> Dict[str, Any]:
-    html = html_path.read_text(encoding="utf-8")
+def audit_page(html_path: Path, slug: str, output_dir: Path, default_base: Optional[str], commit: Optional[str] = None, documents: Optional[DocumentCache] = None) -> Dict[str, Any]:
     parser = TreeBuilder()
-    parser.feed(html)
+    if documents is not None:
+        document = documents.load(html_path)
+        html = document.source
+        document.replay(parser, flush=False)
+    else:
+        html = html_path.read_text(encoding="utf-8")
+        parser.feed(html)
+    parser.finish()
     document = parser.root
     head = document.find_first("head")
     body = document.find_first("body")
     if head is None or body is None:
         raise RuntimeError("HTML missing head or body")
-    meta = collect_meta(head)
-    structured_data = collect_structured_data(head, body)
-    base = resolve_base(meta, html_path, default_base)
-    internal, external, policy_presence = collect_links(body, base)
-    headings = collect_headings(body)
-    images = collect_images(body, base)
-    scripts = collect_scripts(head, body, base)
-    stylesheets = collect_stylesheets(head, base)
-    fonts = collect_fonts(head)
-    performance = detect_performance_hints(html, body)
-    inventory = build_inventory(meta, structured_data, internal, external, policy_presence, headings, images, scripts, stylesheets, fonts, performance)
+    inventory, blocks = collect_page(html, html_path, head, body, default_base)
+    meta = inventory["meta"]
+    headings = inventory["headings"]
+    internal = inventory["links"]["internal"]
+    external = inventory["links"]["external"]
     issues = collect_issues(meta, inventory)
-    blocks = text_blocks(body)
-    text, word_count, flesch = flatten_text(blocks)
+    readability = readability_stats(blocks)
+    text = blocks_text(blocks)
+    word_count = readability["words"]
+    flesch = readability["flesch"]
 
-    header_info = timestamp_header(slug, html_path)
+    header_info = timestamp_header(slug, html_path, commit)
 
     output_dir.mkdir(parents=True, exist_ok=True)
     write_head_file(output_dir / f"{slug}_HEAD.html", extract_head_html(html), header_info)
@@ -640,6 +969,7 @@ def audit_page(html_path: Path, slug: str, output_dir: Path, default_base: Optio
         "text": text,
         "word_count": word_count,
         "flesch": flesch,
+        "readability": readability,
         "head_html": extract_head_html(html),
         "meta": meta,
         "headings": headings,
@@ -774,11 +1104,203 @@ def build_audit_markdown(slug: str, report: Dict[str, Any], header_info: str, ou
     (output_dir / f"{slug}_AUDIT.md").write_text("\n".join(lines), encoding="utf-8")
 
 
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SLUG_UNSAFE_RE = re.compile(r"[^a-z0-9]+")
+
+
+def slug_for(html_path: Path) -> str:
+    """'blogs/purigen/index.html' -> 'blogs-purigen'; 'about.html' -> 'about'."""
+    parts = list(html_path.with_suffix("").parts)
+    if len(parts) > 1 and parts[-1] == "index":
+        parts.pop()
+    return SLUG_UNSAFE_RE.sub("-", "-".join(parts).lower()).strip("-") or "index"
+
+
+def batch_targets(source: str) -> List[Tuple[Path, Path]]:
+    """(path to read, path shown in reports) for a pages_inventory.json or a glob.
+
+    Relative sources and inventory entries are resolved against REPO_ROOT;
+    absolute ones are used as given.
+    """
+    candidate = Path(source)
+    if not candidate.is_absolute():
+        candidate = REPO_ROOT / candidate
+    if candidate.suffix == ".json" and candidate.is_file():
+        with candidate.open(encoding="utf-8") as handle:
+            inventory = json.load(handle)
+        targets = [(REPO_ROOT / entry["file"], Path(entry["file"])) for entry in inventory if entry["file"].endswith(".html")]
+    else:
+        anchor = Path(candidate.anchor)
+        targets = [(path, shown_path(path)) for path in sorted(anchor.glob(str(candidate.relative_to(anchor))))]
+    return [(path, shown) for path, shown in targets if path.is_file()]
+
+
+def shown_path(path: Path) -> Path:
+    try:
+        return path.relative_to(REPO_ROOT)
+    except ValueError:
+        return path
+
+
+def audit_one(job: Tuple[Path, Path, str, Path, Optional[str], str, bool]) -> Dict[str, Any]:
+    """Audit a single page for batch mode and return its roll-up row."""
+    html_path, shown_path, slug, output_dir, default_base, commit, use_documents = job
+    row: Dict[str, Any] = {"slug": slug, "file": str(shown_path)}
+    try:
+        report = audit_page(html_path, slug, output_dir, default_base, commit, DocumentCache() if use_documents else None)
+        build_audit_markdown(slug, report, report["header_info"], output_dir)
+    except (OSError, UnicodeDecodeError, RuntimeError) as exc:
+        row["error"] = str(exc)
+        return row
+    issues = report["issues"]
+    images = report["inventory"]["images"]
+    row.update({
+        "title": report["meta"].get("title") or "",
+        "blockers": [issue["id"] for issue in issues if issue["severity"] == "blocker"],
+        "warnings": [issue["id"] for issue in issues if issue["severity"] == "warn"],
+        "word_count": report["word_count"],
+        "sentences": report["readability"]["sentences"],
+        "syllables": report["readability"]["syllables"],
+        "flesch": report["flesch"],
+        "internal_links": len(report["links_internal"]),
+        "external_links": len(report["links_external"]),
+        "images_missing_alt": sum(1 for img in images if not img["alt"]),
+    })
+    return row
+
+
+def build_site_markdown(rows: List[Dict[str, Any]], source: str, commit: str, output_dir: Path) -> Path:
+    timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    audited = [row for row in rows if "error" not in row]
+    failed = [row for row in rows if "error" in row]
+    blocked = [row for row in audited if row["blockers"]]
+    lines: List[str] = []
+    lines.append(f"Generated {timestamp} UTC | commit {commit} | source {source}\n")
+    lines.append("# Site Audit Roll-up\n")
+    lines.append(f"- **Pages audited:** {len(audited)}")
+    lines.append(f"- **Ready:** {len(audited) - len(blocked)}")
+    lines.append(f"- **Blocked:** {len(blocked)}")
+    if failed:
+        lines.append(f"- **Failed to audit:** {len(failed)}")
+    lines.append(f"- **Total words:** {sum(row['word_count'] for row in audited)}")
+    lines.append(f"- **Site Flesch reading ease:** {site_flesch(audited)} (see SITE_READABILITY.csv)")
+    lines.append(f"- **Images missing alt:** {sum(row['images_missing_alt'] for row in audited)}\n")
+
+    counts: Dict[Tuple[str, str], int] = {}
+    for row in audited:
+        for severity in ("blockers", "warnings"):
+            for issue_id in row[severity]:
+                counts[(severity, issue_id)] = counts.get((severity, issue_id), 0) + 1
+    lines.append("## Recurring Issues\n")
+    if counts:
+        lines.append("| Issue | Severity | Pages |")
+        lines.append("| --- | --- | --- |")
+        for (severity, issue_id), count in sorted(counts.items(), key=lambda item: (-item[1], item[0])):
+            lines.append(f"| {issue_id} | {'blocker' if severity == 'blockers' else 'warn'} | {count} |")
+        lines.append("")
+    else:
+        lines.append("- None\n")
+
+    lines.append("## Pages\n")
+    lines.append("| Page | Verdict | Blockers | Risks | Words | Flesch | Links (int/ext) | Missing alt | Report |")
+    lines.append("| --- | --- | --- | --- | --- | --- | --- | --- | --- |")
+    for row in audited:
+        verdict = "Blocked" if row["blockers"] else "Ready"
+        lines.append(
+            f"| {row['file']} | {verdict} | {', '.join(row['blockers']) or '-'} | {', '.join(row['warnings']) or '-'} "
+            f"| {row['word_count']} | {row['flesch']} | {row['internal_links']}/{row['external_links']} "
+            f"| {row['images_missing_alt']} | [{row['slug']}_AUDIT.md]({row['slug']}_AUDIT.md) |"
+        )
+    lines.append("")
+    if failed:
+        lines.append("## Failed Pages\n")
+        for row in failed:
+            lines.append(f"- {row['file']}: {row['error']}")
+        lines.append("")
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    site_path = output_dir / "SITE_AUDIT.md"
+    site_path.write_text("\n".join(lines), encoding="utf-8")
+    return site_path
+
+
+def site_flesch(rows: List[Dict[str, Any]]) -> float:
+    """Flesch reading ease of all audited text taken together, not an average of page scores."""
+    return flesch_reading_ease(
+        sum(row["word_count"] for row in rows),
+        sum(row["sentences"] for row in rows),
+        sum(row["syllables"] for row in rows),
+    )
+
+
+READABILITY_FIELDS = ["Page", "Slug", "Words", "Sentences", "Syllables", "Words_Per_Sentence", "Syllables_Per_Word", "Flesch"]
+
+
+def write_readability_csv(rows: List[Dict[str, Any]], output_dir: Path) -> Path:
+    """Per-page readability, hardest to read first, with a site-wide row at the end."""
+    audited = sorted((row for row in rows if "error" not in row), key=lambda row: (row["flesch"], row["file"]))
+    site_row = {"file": "(site)", "slug": "", "word_count": 0, "sentences": 0, "syllables": 0}
+    for row in audited:
+        for key in ("word_count", "sentences", "syllables"):
+            site_row[key] += row[key]
+    site_row["flesch"] = site_flesch(audited)
+    csv_path = output_dir / "SITE_READABILITY.csv"
+    with csv_path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(READABILITY_FIELDS)
+        for row in audited + [site_row]:
+            words, sentences = row["word_count"], row["sentences"]
+            writer.writerow([
+                row["file"],
+                row["slug"],
+                words,
+                sentences,
+                row["syllables"],
+                round(words / sentences, 2) if sentences else 0,
+                round(row["syllables"] / words, 2) if words else 0,
+                row["flesch"],
+            ])
+    return csv_path
+
+
+def run_batch(source: str, output_dir: Path, default_base: Optional[str], jobs: int, use_documents: bool = True) -> None:
+    targets = batch_targets(source)
+    if not targets:
+        raise SystemExit(f"No HTML pages matched {source}")
+    commit = resolve_commit()
+    slugs: Dict[str, int] = {}
+    work = []
+    for html_path, shown_path in targets:
+        slug = slug_for(shown_path)
+        slugs[slug] = slugs.get(slug, 0) + 1
+        if slugs[slug] > 1:
+            slug = f"{slug}-{slugs[slug]}"
+        work.append((html_path, shown_path, slug, output_dir, default_base, commit, use_documents))
+    if jobs > 1 and len(work) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            rows = list(pool.map(audit_one, work))
+    else:
+        rows = [audit_one(job) for job in work]
+    site_path = build_site_markdown(rows, source, commit, output_dir)
+    write_readability_csv(rows, output_dir)
+    failed = sum(1 for row in rows if "error" in row)
+    print(f"[OK] Audited {len(rows) - failed}/{len(rows)} pages; roll-up at {site_path}")
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Generate homepage audit artifacts")
-    parser.add_argument("--input", required=True, help="Path to HTML file")
-    parser.add_argument("--slug", required=True, help="Slug prefix for output files")
+    parser.add_argument("--input", help="Path to HTML file")
+    parser.add_argument("--slug", help="Slug prefix for output files")
+    parser.add_argument(
+        "--batch",
+        metavar="GLOB_OR_INVENTORY",
+        help="Audit many pages: a glob such as 'blogs/**/*.html' or _codex_sync/site_audit/pages_inventory.json. "
+        "Slugs are derived from file paths; SITE_AUDIT.md summarises the run and "
+        "SITE_READABILITY.csv lists per-page readability, hardest to read first.",
+    )
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes for --batch (default: 1, serial)")
     parser.add_argument("--output", default="docs/audits", help="Output directory")
+    parser.add_argument("--no-cache", action="store_true", help="Parse pages directly instead of using the shared document cache")
     parser.add_argument(
         "--default-base",
         default="https://thetankguide.com/",
@@ -786,10 +1308,16 @@ def main() -> None:
     )
     args = parser.parse_args()
 
-    html_path = Path(args.input)
     output_dir = Path(args.output)
+    if args.batch:
+        run_batch(args.batch, output_dir, args.default_base, args.jobs, not args.no_cache)
+        return
+    if not args.input or not args.slug:
+        parser.error("--input and --slug are required unless --batch is given")
+
+    html_path = Path(args.input)
 
-    report = audit_page(html_path, args.slug, output_dir, args.default_base)
+    report = audit_page(html_path, args.slug, output_dir, args.default_base, documents=None if args.no_cache else DocumentCache())
     build_audit_markdown(args.slug, report, report["header_info"], output_dir)
 
 
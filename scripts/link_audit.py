@@ -5,13 +5,22 @@
 #   reports/link_audit.txt  (human-readable summary)
 
 import csv, os, sys, time, re, argparse, json
-from urllib.parse import urlparse
+import hashlib
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import namedtuple
+from urllib.parse import urljoin, urlparse
 from pathlib import Path
 from types import SimpleNamespace
 from html import unescape
 import urllib.request
 import urllib.error
 
+from link_audit_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_ENTRIES, DEFAULT_TTL_SECONDS, ResponseCache
+from shortlink_store import DEFAULT_STORE_PATH, ShortlinkStore, is_permanent, is_shortlink
+from title_matcher import MATCH_THRESHOLD, TitleMatcher
+
 # Optional deps: requests + bs4. Fall back to stdlib when unavailable.
 try:
     import requests  # type: ignore
@@ -41,29 +50,78 @@ AUDIT_DEFAULT_KEYS = [
 ]
 
 
+class HTTPStatusError(RuntimeError):
+    """Non-2xx response; the message keeps the historical HTTPError:<code> form."""
+
+    def __init__(self, status, retry_after=None):
+        super().__init__(f"HTTPError:{status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
 class _UrlLibResponse(SimpleNamespace):
     """Lightweight response object for urllib fallback."""
 
 
+class _UrlLibStreamResponse:
+    """Open urllib response exposing the requests streaming API (iter_content/close)."""
+
+    def __init__(self, resp):
+        self._resp = resp
+        self.url = resp.geturl()
+        self.status_code = resp.status
+        self.headers = resp.headers
+        self.encoding = resp.headers.get_content_charset()
+
+    def iter_content(self, chunk_size=1):
+        while True:
+            chunk = self._resp.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def close(self):
+        self._resp.close()
+
+
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+
+class _NoRedirectHandler(urllib.request.HTTPRedirectHandler):
+    """Surface 3xx responses as HTTPError so callers can follow each hop themselves."""
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+_NO_REDIRECT_OPENER = urllib.request.build_opener(_NoRedirectHandler)
+
+
 class _UrlLibSession:
     def __init__(self):
         self.headers = {}
 
-    def get(self, url, headers=None, allow_redirects=True, timeout=15):
+    def get(self, url, headers=None, allow_redirects=True, timeout=15, stream=False):
         req_headers = dict(self.headers)
         if headers:
             req_headers.update(headers)
         request = urllib.request.Request(url, headers=req_headers)
+        urlopen = urllib.request.urlopen if allow_redirects else _NO_REDIRECT_OPENER.open
         try:
-            with urllib.request.urlopen(request, timeout=timeout) as resp:
+            if stream:
+                return _UrlLibStreamResponse(urlopen(request, timeout=timeout))
+            with urlopen(request, timeout=timeout) as resp:
                 final_url = resp.geturl()
                 raw = resp.read()
                 encoding = resp.headers.get_content_charset() or "utf-8"
                 text = raw.decode(encoding, errors="replace")
-                return _UrlLibResponse(url=final_url, text=text)
+                return _UrlLibResponse(url=final_url, text=text, status_code=resp.status, headers=resp.headers)
         except urllib.error.HTTPError as e:
+            if not allow_redirects and e.code in REDIRECT_STATUSES and e.headers.get("Location"):
+                e.close()
+                return _UrlLibResponse(url=url, text="", status_code=e.code, headers=e.headers)
             # mimic requests raising for non-2xx
-            raise RuntimeError(f"HTTPError:{e.code}") from e
+            raise HTTPStatusError(e.code, retry_after=e.headers.get("Retry-After")) from e
         except urllib.error.URLError as e:
             raise RuntimeError(f"URLError:{e.reason}") from e
 
@@ -74,15 +132,234 @@ def _get_session():
     return _UrlLibSession()
 
 
+TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+TITLE_END_RE = re.compile(rb"</title\s*>", re.IGNORECASE)
+STREAM_CHUNK_SIZE = 16 * 1024
+DEFAULT_MAX_TITLE_BYTES = 256 * 1024
+
+
+def _regex_title(html):
+    match = TITLE_RE.search(html)
+    if not match:
+        return ""
+    return unescape(match.group(1)).strip()
+
+
 def _extract_title(html):
     if BeautifulSoup is not None:
         soup = BeautifulSoup(html, "html.parser")
         tag = soup.find("title")
         return tag.get_text(strip=True) if tag else ""
-    match = re.search(r"<title[^>]*>(.*?)</title>", html, re.IGNORECASE | re.DOTALL)
-    if not match:
-        return ""
-    return unescape(match.group(1)).strip()
+    return _regex_title(html)
+
+
+def _known_length(resp):
+    # Only trust Content-Length when it describes the bytes iter_content yields.
+    headers = getattr(resp, "headers", None) or {}
+    if headers.get("Content-Encoding"):
+        return None
+    try:
+        return int(headers.get("Content-Length"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _read_head(resp, max_bytes):
+    """Read the body until </title> (or max_bytes), then drop the connection."""
+    buf = bytearray()
+    found = False
+    try:
+        for chunk in resp.iter_content(STREAM_CHUNK_SIZE):
+            if not chunk:
+                continue
+            scan_from = max(0, len(buf) - 16)
+            buf.extend(chunk)
+            if TITLE_END_RE.search(buf, scan_from):
+                found = True
+                break
+            if len(buf) >= max_bytes:
+                break
+    finally:
+        resp.close()
+    return bytes(buf), found
+
+
+class StreamStats:
+    """Bandwidth accounting for streamed title fetches, reported in link_audit.txt."""
+
+    def __init__(self):
+        self.pages = 0
+        self.stopped_early = 0
+        self.bytes_read = 0
+        self.bytes_skipped = 0
+        self.unknown_size = 0
+        self.read_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, bytes_read, total, seconds, stopped_early):
+        with self._lock:
+            self.pages += 1
+            self.bytes_read += bytes_read
+            self.read_seconds += seconds
+            if stopped_early:
+                self.stopped_early += 1
+                if total is None:
+                    self.unknown_size += 1
+            if total is not None:
+                self.bytes_skipped += max(total - bytes_read, 0)
+
+    def record_skipped_body(self, total):
+        with self._lock:
+            if total is None:
+                self.unknown_size += 1
+            else:
+                self.bytes_skipped += total
+
+    def summary_line(self):
+        throughput = self.bytes_read / self.read_seconds if self.read_seconds else 0
+        seconds_saved = self.bytes_skipped / throughput if throughput else 0
+        line = (f"Streaming titles: {self.pages} pages, read {self.bytes_read / 1024:.1f} KB "
+                f"(stopped early on {self.stopped_early}); saved {self.bytes_skipped / 1024:.1f} KB "
+                f"and ~{seconds_saved:.1f}s vs full downloads")
+        if self.unknown_size:
+            line += f" (+{self.unknown_size} bodies of unknown size not counted)"
+        return line
+
+class HostRateLimiter:
+    """Token bucket per host, shared by every request path and worker thread.
+
+    Hosts without an override use the default rate. A 429/503 halves the
+    host's effective rate (and honours Retry-After); each success then
+    restores it gradually, so a throttled host recovers without flapping.
+    """
+
+    MIN_FACTOR = 1 / 32
+
+    def __init__(self, rate, burst=1, overrides=None):
+        self.default = (rate, max(burst, 1))
+        self.overrides = overrides or {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _limits(self, host):
+        for domain, limits in self.overrides.items():
+            if host == domain or host.endswith("." + domain):
+                return limits
+        return self.default
+
+    def _bucket(self, host):
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            rate, burst = self._limits(host)
+            bucket = self._buckets[host] = {
+                "rate": rate, "burst": max(burst, 1), "tokens": float(max(burst, 1)),
+                "updated": time.monotonic(), "factor": 1.0, "blocked_until": 0.0,
+            }
+        return bucket
+
+    def acquire(self, host):
+        while True:
+            with self._lock:
+                b = self._bucket(host)
+                if b["rate"] <= 0:
+                    return
+                now = time.monotonic()
+                rate = b["rate"] * b["factor"]
+                b["tokens"] = min(b["burst"], b["tokens"] + (now - b["updated"]) * rate)
+                b["updated"] = now
+                wait = b["blocked_until"] - now
+                if wait <= 0 and b["tokens"] >= 1:
+                    b["tokens"] -= 1
+                    return
+                wait = max(wait, (1 - b["tokens"]) / rate)
+            time.sleep(wait)
+
+    def backoff(self, host, retry_after=None):
+        with self._lock:
+            b = self._bucket(host)
+            now = time.monotonic()
+            # Responses already in flight when the host pushed back count as one event.
+            if now >= b["blocked_until"]:
+                b["factor"] = max(self.MIN_FACTOR, b["factor"] / 2)
+            b["tokens"] = 0.0
+            delay = _parse_retry_after(retry_after)
+            if delay is None and b["rate"] > 0:
+                delay = 1 / (b["rate"] * b["factor"])
+            b["blocked_until"] = max(b["blocked_until"], now + (delay or 1.0))
+
+    def succeeded(self, host):
+        with self._lock:
+            b = self._bucket(host)
+            if b["factor"] < 1.0:
+                b["factor"] = min(1.0, b["factor"] + 0.1)
+
+
+def _parse_retry_after(value):
+    try:
+        return max(float(value), 0.0) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_host_rates(specs):
+    # "amazon.com=0.5:2" -> {"amazon.com": (0.5, 2)}
+    overrides = {}
+    for spec in specs or []:
+        domain, _, limits = spec.partition("=")
+        rate, _, burst = limits.partition(":")
+        if not domain or not rate:
+            raise ValueError(f"Invalid --host-rate {spec!r}; expected DOMAIN=RATE[:BURST]")
+        overrides[domain.strip().lower()] = (float(rate), int(burst or 1))
+    return overrides
+
+
+RETRY_STATUSES = {429, 503}
+MAX_REDIRECTS = 10
+
+
+def _close(resp):
+    close = getattr(resp, "close", None)
+    if close is not None:
+        close()
+
+
+def limited_get(session, url, limiter=None, retries=2, allow_redirects=True, **kwargs):
+    """GET ``url``, following redirects one hop at a time so every hop waits on its own host's bucket."""
+    for _ in range(MAX_REDIRECTS + 1):
+        resp = _limited_hop(session, url, limiter, retries, allow_redirects=False, **kwargs)
+        location = (getattr(resp, "headers", None) or {}).get("Location")
+        if not allow_redirects or getattr(resp, "status_code", 200) not in REDIRECT_STATUSES or not location:
+            return resp
+        _close(resp)
+        url = urljoin(url, location)
+    raise RuntimeError(f"TooManyRedirects:{MAX_REDIRECTS}")
+
+
+def _limited_hop(session, url, limiter, retries, **kwargs):
+    host = urlparse(url).netloc.lower()
+    for attempt in range(retries + 1):
+        if limiter is not None:
+            limiter.acquire(host)
+        try:
+            resp = session.get(url, **kwargs)
+        except HTTPStatusError as e:
+            if e.status in RETRY_STATUSES and limiter is not None:
+                limiter.backoff(host, e.retry_after)
+                if attempt < retries:
+                    continue
+            raise
+        status = getattr(resp, "status_code", 200)
+        if status in RETRY_STATUSES:
+            retry_after = (getattr(resp, "headers", None) or {}).get("Retry-After")
+            _close(resp)
+            if limiter is not None:
+                limiter.backoff(host, retry_after)
+                if attempt < retries:
+                    continue
+            raise HTTPStatusError(status, retry_after=retry_after)
+        if limiter is not None:
+            limiter.succeeded(host)
+        return resp
 
 UA = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
 
@@ -215,30 +492,92 @@ def read_from_manifest(manifest_path, category_filter=None):
         return rows, f"manifest:{manifest_path} (category={category_filter})"
     return rows, f"manifest:{manifest_path}"
 
-def expand_url(url, session, timeout=2):
+def expand_url(url, session, timeout=2, limiter=None, cache=None, offline=False, shortlinks=None, stream_stats=None):
     if not url:
         return "", "", "NO_URL"
+    short = shortlinks is not None and is_shortlink(url)
+    known = shortlinks.get(url) if short else None
+    if known:
+        return known["final_url"], urlparse(known["final_url"]).netloc.lower(), "OK"
+    cached = cache.resolve(url) if cache is not None else None
+    if cached:
+        cache.mark_hit()
+        return cached, urlparse(cached).netloc.lower(), "OK"
+    if offline:
+        return "", "", "EXPAND_ERR:CACHE_MISS"
     try:
         # follow redirects (amzn.to -> amazon.com)
-        resp = session.get(url, headers={"User-Agent": UA}, allow_redirects=True, timeout=timeout)
+        if stream_stats is not None:
+            # Only the final URL matters here; close before the body is downloaded.
+            resp = limited_get(session, url, limiter, headers={"User-Agent": UA}, allow_redirects=True, timeout=timeout, stream=True)
+            resp.close()
+            stream_stats.record_skipped_body(_known_length(resp))
+        else:
+            resp = limited_get(session, url, limiter, headers={"User-Agent": UA}, allow_redirects=True, timeout=timeout)
         final_url = resp.url
         domain = urlparse(final_url).netloc.lower()
+        if short and is_permanent(final_url, getattr(resp, "status_code", 200)):
+            shortlinks.put(url, final_url)
+        elif cache is not None:
+            cache.record_redirect(url, final_url)
         return final_url, domain, "OK"
     except Exception as e:
         msg = str(e) or e.__class__.__name__
         return "", "", f"EXPAND_ERR:{msg}"
 
-def fetch_title(url, session, timeout=3):
+def _clean_title(title):
+    # Clean common suffix noise
+    title = re.sub(r"Amazon\\.com\\s*:\\s*", "", title, flags=re.I)
+    title = re.sub(r"\\s*:\\s*Amazon\\.com.*$", "", title, flags=re.I)
+    return title
+
+def fetch_title(url, session, timeout=3, limiter=None, cache=None, offline=False,
+                stream_stats=None, max_bytes=DEFAULT_MAX_TITLE_BYTES):
     if not url:
         return "", "NO_URL"
+    entry = cache.get(url) if cache is not None else None
+    if offline:
+        if entry is None:
+            return "", "TITLE_ERR:CACHE_MISS"
+        cache.mark_hit()
+        return entry["title"], "OK"
+    headers = {"User-Agent": UA}
+    if entry is not None:
+        headers.update(cache.validators(entry))
     try:
-        resp = session.get(url, headers={"User-Agent": UA}, allow_redirects=True, timeout=timeout)
-        html = resp.text
-        # Amazon sometimes includes very long titles; <title> is still present.
-        title = _extract_title(html)
-        # Clean common suffix noise
-        title = re.sub(r"Amazon\\.com\\s*:\\s*", "", title, flags=re.I)
-        title = re.sub(r"\\s*:\\s*Amazon\\.com.*$", "", title, flags=re.I)
+        streaming = stream_stats is not None
+        started = time.perf_counter()
+        try:
+            resp = limited_get(session, url, limiter, headers=headers, allow_redirects=True, timeout=timeout, stream=streaming)
+        except HTTPStatusError as e:
+            if e.status == 304 and entry is not None:
+                cache.mark_revalidated(url)
+                return entry["title"], "OK"
+            raise
+        if getattr(resp, "status_code", 200) == 304 and entry is not None:
+            if streaming:
+                resp.close()
+            cache.mark_revalidated(url)
+            return entry["title"], "OK"
+        if streaming:
+            head, found = _read_head(resp, max_bytes)
+            stream_stats.record(len(head), _known_length(resp), time.perf_counter() - started, found)
+            # The prefix is tiny, so a regex replaces full-document parsing.
+            title = _clean_title(_regex_title(head.decode(resp.encoding or "utf-8", errors="replace")))
+        else:
+            html = resp.text
+            # Amazon sometimes includes very long titles; <title> is still present.
+            title = _clean_title(_extract_title(html))
+        if cache is not None:
+            resp_headers = getattr(resp, "headers", None) or {}
+            cache.put(
+                url,
+                getattr(resp, "status_code", 200),
+                resp.url,
+                title,
+                etag=resp_headers.get("ETag", ""),
+                last_modified=resp_headers.get("Last-Modified", ""),
+            )
         return title, "OK"
     except Exception as e:
         msg = str(e) or e.__class__.__name__
@@ -266,90 +605,315 @@ def fuzzy_match(a, b):
     overlap = len(atoks & btoks)
     return overlap >= max(2, min(len(atoks), len(btoks)) // 2)
 
-def guess_status(product_name, page_title):
+def score_title(product_name, page_title, matcher=None):
+    # Returns (status, confidence); confidence is blank for the legacy fuzzy_match path.
     if not product_name and not page_title:
-        return "UNKNOWN"
+        return "UNKNOWN", ""
     if not page_title:
-        return "NO_TITLE"
-    return "MATCH" if fuzzy_match(product_name, page_title) else "MISMATCH"
+        return "NO_TITLE", ""
+    if matcher is None:
+        return ("MATCH" if fuzzy_match(product_name, page_title) else "MISMATCH"), ""
+    status, confidence = matcher.status(product_name, page_title)
+    return status, f"{confidence:.2f}"
+
+def guess_status(product_name, page_title, matcher=None):
+    return score_title(product_name, page_title, matcher)[0]
 
 def ensure_dir(p):
     Path(p).mkdir(parents=True, exist_ok=True)
 
-def main():
-    ap = argparse.ArgumentParser(description="Audit product links and titles vs Product_Name.")
-    ap.add_argument("--input", help="Path to CSV (optional if gear_master.csv or data/master_nav.json exists).")
-    ap.add_argument("--manifest", help="Path to manifest JSON describing category CSVs.")
-    ap.add_argument("--category", help="Filter rows by category (case-insensitive).")
-    ap.add_argument("--sleep", type=float, default=1.0, help="Delay between requests (seconds).")
-    ap.add_argument("--limit", type=int, default=0, help="Limit number of rows audited (0 = no limit).")
-    args = ap.parse_args()
+AUDIT_FIELDS = ["Category","Product_Name","Amazon_Link","Resolved_URL","Domain","Page_Title","Match_Status","Match_Confidence","Notes"]
+# Shard CSVs carry each row's position in the full input, and that input's row count,
+# so merge can restore the order and tell which rows no shard produced.
+SHARD_FIELDS = AUDIT_FIELDS + ["Row_Index", "Row_Total"]
 
-    if args.manifest:
-        rows, src = read_from_manifest(args.manifest, category_filter=args.category)
-    elif args.input:
-        rows = read_csv_rows(args.input)
-        src = f"file:{args.input}"
-    else:
-        rows, src = read_from_master_or_nav()
+def row_url(r):
+    return (r.get("Amazon_Link") or "").strip() or (r.get("Chewy_Link") or "").strip()
 
-    if args.category and not args.manifest:
-        target = args.category.strip().casefold()
-        rows = [r for r in rows if (r.get("Category", "").strip().casefold() == target)]
-        src = f"{src} [category={args.category}]"
+class AuditContext:
+    """Per-run state shared by every worker: rate limiter, response cache and mode flags."""
 
-    ensure_dir("reports")
-    out_csv = "reports/link_audit.csv"
-    out_txt = "reports/link_audit.txt"
+    def __init__(self, limiter=None, cache=None, offline=False, shortlinks=None,
+                 stream_stats=None, max_title_bytes=DEFAULT_MAX_TITLE_BYTES, matcher=None):
+        self.limiter = limiter
+        self.matcher = matcher
+        self.cache = cache
+        self.offline = offline
+        self.shortlinks = shortlinks
+        self.stream_stats = stream_stats
+        self.max_title_bytes = max_title_bytes
 
-    session = _get_session()
-    session.headers.update({"User-Agent": UA})
-    sleep_between = 0 if isinstance(session, _UrlLibSession) else max(args.sleep, 0)
+    def summary_lines(self):
+        lines = []
+        if self.cache is not None:
+            c = self.cache
+            lines.append(f"Cache: {c.hits} served from cache, {c.revalidated} revalidated (304), {c.misses} not cached"
+                         + (" [offline]" if self.offline else ""))
+        if self.stream_stats is not None:
+            lines.append(self.stream_stats.summary_line())
+        return lines
+
+def audit_row(r, session, ctx=None):
+    ctx = ctx or AuditContext()
+    url = row_url(r)
+    prod = r.get("Product_Name","")
+    cat  = r.get("Category","")
+    opts = {"limiter": ctx.limiter, "cache": ctx.cache, "offline": ctx.offline, "stream_stats": ctx.stream_stats}
+    final_url, domain, expand_status = expand_url(url, session, shortlinks=ctx.shortlinks, **opts)
+    title, title_status = ("","NO_URL") if not final_url else fetch_title(final_url, session, max_bytes=ctx.max_title_bytes, **opts)
+    status, confidence = score_title(prod, title, ctx.matcher)
+    note_bits = []
+    if expand_status != "OK": note_bits.append(expand_status)
+    if title_status != "OK":  note_bits.append(title_status)
+    return {
+        "Category": cat,
+        "Product_Name": prod,
+        "Amazon_Link": url,
+        "Resolved_URL": final_url,
+        "Domain": domain,
+        "Page_Title": title,
+        "Match_Status": status,
+        "Match_Confidence": confidence,
+        "Notes": ";".join(note_bits)
+    }
+
+def audit_rows(rows, session, ctx=None):
+    return [audit_row(r, session, ctx) for r in rows]
+
+async def aiter_audit(rows, concurrency, ctx=None):
+    """Yield (index, record) in input order with up to `concurrency` rows in flight.
 
-    audited = []
-    count = 0
-    missing_sponsored = 0
-    http_404 = 0
+    Each worker thread keeps its own session. Finished rows wait in a small
+    reorder buffer until every earlier row is done, so output order is
+    deterministic regardless of completion order.
+    """
+    loop = asyncio.get_running_loop()
+    local = threading.local()
+    window = concurrency * 4
+
+    def work(r):
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = _get_session()
+            session.headers.update({"User-Agent": UA})
+        return audit_row(r, session, ctx)
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="link-audit") as pool:
+        queued = iter(enumerate(rows))
+        in_flight = {}
+        finished = {}
+        next_index = 0
+        exhausted = False
+        while True:
+            while not exhausted and len(in_flight) < concurrency and len(finished) < window:
+                item = next(queued, None)
+                if item is None:
+                    exhausted = True
+                    break
+                in_flight[loop.run_in_executor(pool, work, item[1])] = item[0]
+            if not in_flight:
+                break
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                finished[in_flight.pop(future)] = future.result()
+            while next_index in finished:
+                yield next_index, finished.pop(next_index)
+                next_index += 1
+
+async def audit_rows_async(rows, concurrency, ctx=None):
+    return [record async for _, record in aiter_audit(rows, concurrency, ctx)]
+
+def iter_audit(rows, session, ctx=None, concurrency=1):
+    """Synchronous view of the audit: yields (index, record) in input order."""
+    if concurrency <= 1:
+        for index, r in enumerate(rows):
+            yield index, audit_row(r, session, ctx)
+        return
+    loop = asyncio.new_event_loop()
+    agen = aiter_audit(rows, concurrency, ctx)
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(agen.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        loop.run_until_complete(agen.aclose())
+        loop.close()
 
+def row_key(r):
+    # Works for input rows and audit records alike (records carry the chosen URL as Amazon_Link).
+    return (r.get("Category", ""), r.get("Product_Name", ""), row_url(r))
+
+def checkpoint_path_for(out_csv, cache_dir):
+    return Path(cache_dir) / f"{Path(out_csv).stem}.checkpoint.jsonl"
+
+def fingerprints_path_for(out_csv, cache_dir):
+    return Path(cache_dir) / f"{Path(out_csv).stem}.fingerprints.json"
+
+def row_fingerprint(r):
+    payload = json.dumps(r, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+def load_fingerprints(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_fingerprints(path, fingerprints):
+    ensure_dir(Path(path).parent)
+    tmp = Path(path).with_name(f".{Path(path).name}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(fingerprints, f, sort_keys=True, separators=(",", ":"))
+    os.replace(tmp, path)
+
+def plan_incremental(rows, previous_records, fingerprints, stale_sample=0):
+    """Pair each row with its previous record and whether it is due for a fresh audit.
+
+    Rows that are new, changed since their fingerprint was taken, or missing
+    from the previous report are due and have no previous record. The
+    `stale_sample` least recently audited unchanged rows are due too, so every
+    row is eventually re-checked even when the catalog never changes; they keep
+    their previous record in case the run stops before reaching them.
+    """
+    previous = {}
+    for record in previous_records:
+        previous.setdefault(row_key(record), record)
+    plan = []
+    reusable = []
+    changed = 0
     for r in rows:
-        if args.limit and count >= args.limit:
-            break
-        url = (r.get("Amazon_Link") or "").strip() or (r.get("Chewy_Link") or "").strip()
-        prod = r.get("Product_Name","")
-        cat  = r.get("Category","")
-        if not url.lower().startswith("http"):
-            missing_sponsored += 1
-        final_url, domain, expand_status = expand_url(url, session)
-        title, title_status = ("","NO_URL") if not final_url else fetch_title(final_url, session)
-        status = guess_status(prod, title)
-        if "HTTPError:404" in expand_status or "HTTPError:404" in title_status:
-            http_404 += 1
-        note_bits = []
-        if expand_status != "OK": note_bits.append(expand_status)
-        if title_status != "OK":  note_bits.append(title_status)
-        notes = ";".join(note_bits)
-        audited.append({
-            "Category": cat,
-            "Product_Name": prod,
-            "Amazon_Link": url,
-            "Resolved_URL": final_url,
-            "Domain": domain,
-            "Page_Title": title,
-            "Match_Status": status,
-            "Notes": notes
-        })
-        count += 1
-        if sleep_between:
-            time.sleep(sleep_between)
-
-    # write CSV
-    with open(out_csv, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=["Category","Product_Name","Amazon_Link","Resolved_URL","Domain","Page_Title","Match_Status","Notes"])
-        w.writeheader()
-        for a in audited:
-            w.writerow(a)
+        key = row_key(r)
+        seen = fingerprints.get(json.dumps(list(key)))
+        if key in previous and seen and seen.get("fingerprint") == row_fingerprint(r):
+            reusable.append((seen.get("audited_at", 0), len(plan)))
+            plan.append((r, previous[key], False))
+        else:
+            changed += 1
+            plan.append((r, None, True))
+    stale = sorted(reusable)[:max(stale_sample, 0)]
+    for _, index in stale:
+        plan[index] = plan[index][:2] + (True,)
+    counts = {"changed": changed, "stale": len(stale), "reused": len(reusable) - len(stale)}
+    return plan, counts
 
-    # write TXT summary
+def limit_plan(plan, limit):
+    """Leave only the first `limit` due rows due; later ones fall back to their previous record or drop out."""
+    limited = []
+    for r, previous, due in plan:
+        if due and limit > 0:
+            limit -= 1
+        elif due:
+            due = False
+        if due or previous is not None:
+            limited.append((r, previous, due))
+    return limited
+
+def read_checkpoint(path):
+    source, done = None, set()
+    if not Path(path).is_file():
+        return source, done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                item = json.loads(line)
+            except ValueError:
+                continue  # torn final line from a crash
+            if isinstance(item, dict):
+                source = item.get("source", source)
+            elif isinstance(item, list) and len(item) == 3:
+                done.add(tuple(item))
+    return source, done
+
+def read_audit_csv(path, fields=AUDIT_FIELDS):
+    if not Path(path).is_file():
+        return []
+    with open(path, newline="", encoding="utf-8") as f:
+        return [{k: (v or "") for k, v in row.items() if k in fields} for row in csv.DictReader(f)]
+
+def parse_shard(spec):
+    """'2/4' -> (2, 4); shards are numbered from 1."""
+    m = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", spec or "")
+    if not m:
+        raise ValueError(f"expected i/N, got {spec!r}")
+    index, count = int(m.group(1)), int(m.group(2))
+    if not 1 <= index <= count:
+        raise ValueError(f"shard index must be between 1 and {count}, got {index}")
+    return index, count
+
+def shard_rows(rows, index, count):
+    """Round-robin split by position in the full input, keeping each row's global index."""
+    return [(i, r) for i, r in enumerate(rows) if i % count == index - 1]
+
+def shard_stem(index, count, base="reports/link_audit"):
+    return f"{base}.shard-{index}-of-{count}"
+
+def find_shard_csvs(count=None, base="reports/link_audit"):
+    """Shard CSVs grouped by shard count: {N: {i: path}}."""
+    base_path = Path(base)
+    found = {}
+    for path in sorted(base_path.parent.glob(f"{base_path.name}.shard-*-of-*.csv")):
+        m = re.fullmatch(rf"{re.escape(base_path.name)}\.shard-(\d+)-of-(\d+)\.csv", path.name)
+        if m and (count is None or int(m.group(2)) == count):
+            found.setdefault(int(m.group(2)), {})[int(m.group(1))] = path
+    return found
+
+class AuditWriter:
+    """Streams finished records to the CSV and checkpoint as they complete.
+
+    Each CSV row is flushed before its checkpoint line, so a crash leaves at
+    worst a CSV row the checkpoint does not know about; resuming drops it.
+    """
+
+    def __init__(self, out_csv, checkpoint, source, resume=False, fields=AUDIT_FIELDS):
+        self.records = []
+        done = set()
+        if resume:
+            recorded_source, done = read_checkpoint(checkpoint)
+            if recorded_source is not None and recorded_source != source:
+                raise SystemExit(f"Checkpoint {checkpoint} belongs to {recorded_source!r}, not {source!r}; rerun without --resume.")
+            seen = set()
+            for record in read_audit_csv(out_csv, fields):
+                key = row_key(record)
+                if key in done and key not in seen:
+                    seen.add(key)
+                    self.records.append(record)
+            done = seen
+        self.done = done
+        ensure_dir(Path(checkpoint).parent)
+        self._csv_handle = open(out_csv, "w", newline="", encoding="utf-8")
+        self._csv = csv.DictWriter(self._csv_handle, fieldnames=fields, extrasaction="ignore")
+        self._csv.writeheader()
+        for record in self.records:
+            self._csv.writerow(record)
+        self._csv_handle.flush()
+        self._checkpoint = open(checkpoint, "w", encoding="utf-8")
+        self._checkpoint.write(json.dumps({"source": source}) + "\n")
+        for key in sorted(done):
+            self._checkpoint.write(json.dumps(list(key)) + "\n")
+        self._checkpoint.flush()
+
+    def write(self, record):
+        self._csv.writerow(record)
+        self._csv_handle.flush()
+        self._checkpoint.write(json.dumps(list(row_key(record))) + "\n")
+        self._checkpoint.flush()
+        self.done.add(row_key(record))
+        self.records.append(record)
+
+    def close(self):
+        self._csv_handle.close()
+        self._checkpoint.close()
+
+def summarize(audited):
+    missing_sponsored = sum(1 for a in audited if not a["Amazon_Link"].lower().startswith("http"))
+    http_404 = sum(1 for a in audited if "HTTPError:404" in a["Notes"])
+    return missing_sponsored, http_404
+
+def write_txt_report(out_txt, audited, src, extra_lines=()):
+    missing_sponsored, http_404 = summarize(audited)
     mismatches = [a for a in audited if a["Match_Status"] == "MISMATCH"]
     no_titles  = [a for a in audited if a["Match_Status"] == "NO_TITLE"]
     unknowns   = [a for a in audited if a["Match_Status"] == "UNKNOWN"]
@@ -374,9 +938,228 @@ def main():
             f.write(f"  ... and {len(mismatches)-25} more\\n")
         f.write("\nNO_TITLE rows: {}\n".format(len(no_titles)))
         f.write("\nUNKNOWN rows: {}\n".format(len(unknowns)))
+        if extra_lines:
+            f.write("\n")
+            for line in extra_lines:
+                f.write(f"{line}\n")
         f.write("\nNotes: EXPAND_ERR = redirect/resolve failed; TITLE_ERR = fetch or parse title failed.\n")
 
+def build_parser():
+    ap = argparse.ArgumentParser(description="Audit product links and titles vs Product_Name.")
+    ap.add_argument("--input", help="Path to CSV (optional if gear_master.csv or data/master_nav.json exists).")
+    ap.add_argument("--manifest", help="Path to manifest JSON describing category CSVs.")
+    ap.add_argument("--category", help="Filter rows by category (case-insensitive).")
+    ap.add_argument("--sleep", type=float, default=1.0, help="Minimum delay between requests to the same host (seconds); sets the default --rate.")
+    ap.add_argument("--rate", type=float, help="Requests/sec allowed per host (0 = unlimited). Defaults to 1/--sleep.")
+    ap.add_argument("--burst", type=int, default=1, help="Requests a host may burst before --rate applies.")
+    ap.add_argument("--host-rate", action="append", metavar="DOMAIN=RATE[:BURST]", help="Per-domain override, e.g. amazon.com=0.5:2 (repeatable).")
+    ap.add_argument("--limit", type=int, default=0, help="Limit number of rows audited (0 = no limit).")
+    ap.add_argument("--shard", metavar="I/N", help="Audit only every N-th row starting at row I (1-based) into reports/link_audit.shard-I-of-N.*; combine with `link_audit.py merge`. Shards can run at once and share --cache-dir.")
+    ap.add_argument("--resume", action="store_true", help="Skip rows recorded in the checkpoint and append to the existing CSV.")
+    ap.add_argument("--time-budget", type=float, default=0, help="Stop taking new rows after N minutes (0 = no limit); continue later with --resume.")
+    ap.add_argument("--changed-only", action="store_true", help="Re-audit only new or changed rows (plus --stale-sample) and reuse the rest of the previous report.")
+    ap.add_argument("--stale-sample", type=int, default=25, help="With --changed-only, also re-check this many of the least recently audited unchanged rows.")
+    ap.add_argument("--match-threshold", type=float, default=MATCH_THRESHOLD, help="Minimum Match_Confidence for MATCH.")
+    ap.add_argument("--legacy-match", action="store_true", help="Use the old token-overlap fuzzy_match (no confidence scores).")
+    ap.add_argument("--concurrency", type=int, default=1, help="Rows audited in parallel by the async engine (1 = sequential).")
+    ap.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR), help="Directory for the persistent response cache.")
+    ap.add_argument("--cache-ttl", type=float, default=DEFAULT_TTL_SECONDS / 3600, help="Hours before a cached response is dropped (0 = never).")
+    ap.add_argument("--cache-max-entries", type=int, default=DEFAULT_MAX_ENTRIES, help="Evict least recently used cache entries beyond this count.")
+    ap.add_argument("--no-cache", action="store_true", help="Disable the response cache.")
+    ap.add_argument("--offline", action="store_true", help="Audit entirely from the response cache without network access.")
+    ap.add_argument("--stream-titles", action="store_true", help="Stream pages and stop at </title> instead of downloading whole bodies.")
+    ap.add_argument("--max-title-bytes", type=int, default=DEFAULT_MAX_TITLE_BYTES, help="Byte cap per page when --stream-titles is set.")
+    ap.add_argument("--shortlink-store", default=str(DEFAULT_STORE_PATH), help="Shared amzn.to/a.co resolution store (see scripts/shortlink_store.py).")
+    return ap
+
+
+def parse_args(argv=None):
+    ap = build_parser()
+    args = ap.parse_args(argv)
+    if args.offline and args.no_cache:
+        ap.error("--offline needs the response cache; drop --no-cache.")
+    if args.changed_only and args.resume:
+        ap.error("--changed-only and --resume cannot be combined.")
+    if args.shard:
+        try:
+            args.shard = parse_shard(args.shard)
+        except ValueError as exc:
+            ap.error(f"--shard: {exc}")
+    return args
+
+
+AuditEvent = namedtuple("AuditEvent", "done total record")
+
+
+def run_audit(args):
+    """Run an audit for parsed ``args``, yielding an AuditEvent per row as it is written.
+
+    The CSV, checkpoint and caches are kept up to date while iterating; the TXT
+    summary is written once the stream is exhausted.
+    """
+    if args.manifest:
+        rows, src = read_from_manifest(args.manifest, category_filter=args.category)
+    elif args.input:
+        rows = read_csv_rows(args.input)
+        src = f"file:{args.input}"
+    else:
+        rows, src = read_from_master_or_nav()
+
+    if args.category and not args.manifest:
+        target = args.category.strip().casefold()
+        rows = [r for r in rows if (r.get("Category", "").strip().casefold() == target)]
+        src = f"{src} [category={args.category}]"
+
+    # Title IDF weights come from the whole input so every shard scores alike.
+    catalog = rows
+    out_stem = "reports/link_audit"
+    fields = AUDIT_FIELDS
+    row_index = {}
+    row_total = len(rows)
+    if args.shard:
+        index, count = args.shard
+        selected = shard_rows(rows, index, count)
+        row_index = {id(r): i for i, r in selected}
+        rows = [r for _, r in selected]
+        src = f"{src} [shard={index}/{count}]"
+        out_stem = shard_stem(index, count)
+        fields = SHARD_FIELDS
+
+    ensure_dir("reports")
+    out_csv = f"{out_stem}.csv"
+    out_txt = f"{out_stem}.txt"
+    fingerprint_path = fingerprints_path_for(out_csv, args.cache_dir)
+    fingerprints = load_fingerprints(fingerprint_path)
+    plan = [(r, None, True) for r in rows]
+    extra_lines = []
+    if args.changed_only:
+        plan, counts = plan_incremental(rows, read_audit_csv(out_csv), fingerprints, args.stale_sample)
+        extra_lines.append(f"Incremental: {counts['changed']} new/changed, {counts['stale']} stale re-checked, "
+                           f"{counts['reused']} reused from the previous audit")
+        print(f"[..] {extra_lines[-1]}")
+
+    writer = AuditWriter(out_csv, checkpoint_path_for(out_csv, args.cache_dir), src, resume=args.resume, fields=fields)
+    if writer.done:
+        plan = [item for item in plan if row_key(item[0]) not in writer.done]
+        print(f"[..] Resuming: {len(writer.records)} rows already audited, {len(plan)} remaining")
+
+    if args.limit:
+        plan = limit_plan(plan, args.limit)
+
+    session = _get_session()
+    session.headers.update({"User-Agent": UA})
+    rate = args.rate if args.rate is not None else (1 / args.sleep if args.sleep > 0 else 0)
+    limiter = HostRateLimiter(rate, args.burst, parse_host_rates(args.host_rate))
+    cache = None
+    if not args.no_cache:
+        cache = ResponseCache(args.cache_dir, ttl=args.cache_ttl * 3600, max_entries=args.cache_max_entries).load()
+    shortlinks = ShortlinkStore(Path(args.shortlink_store)).load()
+    ctx = AuditContext(limiter=limiter, cache=cache, offline=args.offline, shortlinks=shortlinks,
+                       stream_stats=StreamStats() if args.stream_titles else None,
+                       max_title_bytes=args.max_title_bytes,
+                       matcher=None if args.legacy_match else TitleMatcher((r.get("Product_Name", "") for r in catalog), args.match_threshold))
+
+    deadline = time.monotonic() + args.time_budget * 60 if args.time_budget else None
+    stopped_early = False
+    audited = iter_audit([r for r, _, due in plan if due], session, ctx, args.concurrency)
+    try:
+        # Fresh records arrive in input order, so merging with reused ones keeps the CSV ordered.
+        # Once the budget is spent no new rows are audited, but reused records are still written.
+        done = 0
+        for r, previous, due in plan:
+            if due and not stopped_early:
+                _, record = next(audited)
+                fingerprints[json.dumps(list(row_key(r)))] = {"fingerprint": row_fingerprint(r), "audited_at": time.time()}
+            elif previous is not None:
+                record = previous
+            else:
+                continue
+            if row_index:
+                record = dict(record, Row_Index=str(row_index[id(r)]), Row_Total=str(row_total))
+            writer.write(record)
+            done += 1
+            yield AuditEvent(done, len(plan), record)
+            if deadline is not None and not stopped_early and time.monotonic() >= deadline:
+                stopped_early = True
+    finally:
+        audited.close()
+        writer.close()
+        save_fingerprints(fingerprint_path, fingerprints)
+        if cache is not None and not args.offline:
+            cache.save()
+
+    write_txt_report(out_txt, writer.records, src, extra_lines + ctx.summary_lines())
+
     print(f"[OK] Wrote {out_csv} and {out_txt}")
+    if stopped_early:
+        rerun = "--changed-only" if args.changed_only else "--resume"
+        print(f"[..] Time budget reached; rerun with {rerun} to continue.")
+
+
+def merge_shards(count=None, cache_dir=DEFAULT_CACHE_DIR, base="reports/link_audit"):
+    """Combine shard CSVs into the canonical CSV/TXT in original input order."""
+    groups = find_shard_csvs(count, base)
+    if not groups:
+        raise SystemExit(f"No shard CSVs found for {base}.shard-*-of-*.csv")
+    if len(groups) > 1:
+        raise SystemExit(f"Found shards for several counts ({', '.join(map(str, sorted(groups)))}); pass --shards N.")
+    count, paths = next(iter(groups.items()))
+    missing = [str(i) for i in range(1, count + 1) if i not in paths]
+    if missing:
+        raise SystemExit(f"Missing shard CSVs {', '.join(missing)} of {count}; run them before merging.")
+
+    records, sources, per_shard, totals = [], set(), [], set()
+    for i in range(1, count + 1):
+        shard_records = read_audit_csv(paths[i], SHARD_FIELDS)
+        if any(not r.get("Row_Index", "").isdigit() or not r.get("Row_Total", "").isdigit() for r in shard_records):
+            raise SystemExit(f"{paths[i]} has rows without Row_Index/Row_Total; rerun that shard.")
+        totals.update(int(r["Row_Total"]) for r in shard_records)
+        records.extend(shard_records)
+        per_shard.append(f"{i}/{count}={len(shard_records)}")
+        source, _ = read_checkpoint(checkpoint_path_for(paths[i], cache_dir))
+        if source:
+            sources.add(re.sub(r" \[shard=\d+/\d+\]$", "", source))
+
+    if len(totals) > 1:
+        raise SystemExit(f"Shard CSVs disagree on the input size ({', '.join(map(str, sorted(totals)))} rows); were they produced from the same input?")
+    total = totals.pop() if totals else 0
+    records.sort(key=lambda r: int(r["Row_Index"]))
+    indexes = [int(r["Row_Index"]) for r in records]
+    if len(set(indexes)) != len(indexes) or (indexes and indexes[-1] >= total):
+        raise SystemExit("Shard CSVs overlap or run past Row_Total; were they produced from the same input?")
+    missing = sorted(set(range(total)) - set(indexes))
+
+    src = sources.pop() if len(sources) == 1 else f"{base}.shard-*-of-{count}.csv"
+    out_csv, out_txt = f"{base}.csv", f"{base}.txt"
+    with open(out_csv, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=AUDIT_FIELDS, extrasaction="ignore")
+        w.writeheader()
+        w.writerows(records)
+    extra_lines = [f"Merged {count} shards (rows per shard: {', '.join(per_shard)})"]
+    if missing:
+        behind = sorted({i % count + 1 for i in missing})
+        extra_lines.append(f"Incomplete: {len(missing)} of {total} rows missing (shards {', '.join(f'{i}/{count}' for i in behind)}); "
+                           "rerun them with --resume and merge again.")
+    write_txt_report(out_txt, records, src, extra_lines)
+    print(f"[OK] Merged {len(records)} rows from {count} shards into {out_csv} and {out_txt}")
+    for line in extra_lines[1:]:
+        print(f"[..] {line}")
+
+def merge_main(argv):
+    ap = argparse.ArgumentParser(prog="link_audit.py merge", description="Merge --shard outputs into reports/link_audit.csv/.txt.")
+    ap.add_argument("--shards", type=int, help="Shard count to merge when several are present.")
+    ap.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR), help="Where the shard checkpoints live (used for the source line).")
+    args = ap.parse_args(argv)
+    merge_shards(args.shards, args.cache_dir)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["merge"]:
+        return merge_main(argv[1:])
+    for _ in run_audit(parse_args(argv)):
+        pass
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""On-disk HTTP response cache for scripts/link_audit.py."""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves still merge, they just are not serialised
+    fcntl = None  # type: ignore[assignment]
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+# Anchored like shortlink_store.DEFAULT_STORE_PATH so every script shares one reports/.cache.
+DEFAULT_CACHE_DIR = REPO_ROOT / "reports" / ".cache"
+CACHE_FILE_NAME = "link_audit_responses.json"
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 5000
+CACHE_VERSION = 1
+
+
+@contextmanager
+def exclusive_lock(path: Path) -> Iterator[None]:
+    """Hold an flock on ``path`` so read-merge-write cycles from other processes wait their turn."""
+    if fcntl is None:
+        yield
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+class ResponseCache:
+    """Title responses keyed by resolved URL, plus the redirects that led there.
+
+    Entries keep status, final URL, title and the ETag/Last-Modified
+    validators so stale pages can be revalidated with a conditional GET.
+    Entries older than ``ttl`` are dropped on load; beyond ``max_entries``
+    the least recently used ones are evicted on save.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path = DEFAULT_CACHE_DIR,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        self.path = Path(cache_dir) / CACHE_FILE_NAME
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.responses: Dict[str, Dict[str, object]] = {}
+        self.redirects: Dict[str, Dict[str, object]] = {}
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def load(self) -> "ResponseCache":
+        data = self._read()
+        if data is None:
+            return self
+        self.responses = data.get("responses", {})
+        self.redirects = data.get("redirects", {})
+        self._expire(time.time())
+        return self
+
+    def save(self) -> None:
+        """Write the cache, first merging entries other runs saved since ``load``.
+
+        Shards and parallel runs sharing a cache dir each save their own
+        view; re-reading the file keeps their entries instead of letting the
+        last writer win. For a URL both sides know, the fresher fetch wins.
+        """
+        with self._lock, exclusive_lock(self.path.with_name(f"{self.path.name}.lock")):
+            data = self._read()
+            if data is not None:
+                self._merge(self.responses, data.get("responses", {}))
+                self._merge(self.redirects, data.get("redirects", {}))
+            self._expire(time.time())
+            self._evict_lru()
+            payload = {"version": CACHE_VERSION, "responses": self.responses, "redirects": self.redirects}
+            tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            with tmp_path.open("w", encoding="utf-8") as handle:
+                json.dump(payload, handle, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+
+    def _read(self) -> Optional[Dict[str, object]]:
+        if not self.path.is_file():
+            return None
+        try:
+            with self.path.open(encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return None
+        return data
+
+    @staticmethod
+    def _merge(table: Dict[str, Dict[str, object]], theirs: Dict[str, Dict[str, object]]) -> None:
+        for key, entry in theirs.items():
+            mine = table.get(key)
+            if mine is None:
+                table[key] = entry
+                continue
+            used_at = max(float(mine.get("used_at", 0)), float(entry.get("used_at", 0)))
+            if float(entry.get("fetched_at", 0)) > float(mine.get("fetched_at", 0)):
+                mine = table[key] = dict(entry)
+            mine["used_at"] = used_at
+
+    def get(self, url: str) -> Optional[Dict[str, object]]:
+        with self._lock:
+            entry = self.responses.get(url)
+            if entry is None:
+                self.misses += 1
+                return None
+            entry["used_at"] = time.time()
+            return dict(entry)
+
+    def put(self, url: str, status: int, final_url: str, title: str, etag: str = "", last_modified: str = "") -> None:
+        now = time.time()
+        with self._lock:
+            self.responses[url] = {
+                "status": status,
+                "final_url": final_url,
+                "title": title,
+                "etag": etag or "",
+                "last_modified": last_modified or "",
+                "fetched_at": now,
+                "used_at": now,
+            }
+
+    def mark_revalidated(self, url: str) -> None:
+        with self._lock:
+            entry = self.responses.get(url)
+            if entry is not None:
+                entry["fetched_at"] = entry["used_at"] = time.time()
+                self.revalidated += 1
+
+    def mark_hit(self) -> None:
+        with self._lock:
+            self.hits += 1
+
+    def resolve(self, url: str) -> Optional[str]:
+        with self._lock:
+            entry = self.redirects.get(url)
+            if entry is None:
+                return None
+            entry["used_at"] = time.time()
+            return str(entry["final_url"])
+
+    def record_redirect(self, url: str, final_url: str) -> None:
+        now = time.time()
+        with self._lock:
+            self.redirects[url] = {"final_url": final_url, "fetched_at": now, "used_at": now}
+
+    @staticmethod
+    def validators(entry: Dict[str, object]) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = str(entry["etag"])
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = str(entry["last_modified"])
+        return headers
+
+    def _expire(self, now: float) -> None:
+        if self.ttl <= 0:
+            return
+        for table in (self.responses, self.redirects):
+            for key in [k for k, v in table.items() if now - float(v.get("fetched_at", 0)) > self.ttl]:
+                del table[key]
+
+    def _evict_lru(self) -> None:
+        if self.max_entries <= 0:
+            return
+        for table in (self.responses, self.redirects):
+            overflow = len(table) - self.max_entries
+            if overflow <= 0:
+                continue
+            oldest = sorted(table, key=lambda k: float(table[k].get("used_at", 0)))[:overflow]
+            for key in oldest:
+                del table[key]
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Single-pass index of which source files mention which terms.
+
+The tree is walked once with excluded directories pruned, each HTML/CSS/JS
+file is read once, and every term is searched for at the same time with a
+compiled TermPattern. The result maps each file to the terms it contains and
+can be inverted to term -> files:
+
+    index = ReferenceIndex(REPO_ROOT, ["assets/icons/favicon.png"], cache_path=path)
+    index.references()["assets/icons/favicon.png"]
+
+With ``cache_path`` the per-file matches are persisted as JSON keyed by
+(size, mtime_ns), so later runs with the same terms only re-read files that
+changed. The cache is rewritten atomically and ignored when the terms, file
+suffixes or exclusions differ from the run that wrote it. As in
+checksum_cache, files modified within RACY_WINDOW_NS of the scan are matched
+but not cached.
+"""
+from __future__ import annotations
+
+import json
+import os
+import stat
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from checksum_cache import RACY_WINDOW_NS
+from term_matcher import TermPattern
+
+DEFAULT_SUFFIXES = frozenset({".html", ".htm", ".css", ".js", ".mjs", ".ts", ".tsx", ".jsx"})
+DEFAULT_EXCLUDED = frozenset({"_codex_sync", "node_modules", ".git", "dist", "logs"})
+INDEX_VERSION = 1
+
+CacheEntry = List  # [size, mtime_ns, [term ids]]
+
+
+def iter_source_files(
+    root: Path,
+    suffixes: Iterable[str] = DEFAULT_SUFFIXES,
+    excluded: Iterable[str] = DEFAULT_EXCLUDED,
+) -> Iterator[Tuple[str, str, os.stat_result]]:
+    """Yield ``(relative path, path, stat)`` for regular files under ``root``, in walk order.
+
+    A path is skipped when any of its parts is in ``excluded``; excluded
+    directories are pruned instead of being walked and filtered.
+    """
+    suffixes = frozenset(suffixes)
+    excluded = frozenset(excluded)
+    if excluded.intersection(root.parts):
+        return
+    top = str(root)
+    for dirpath, dirnames, filenames in os.walk(top):
+        dirnames[:] = [name for name in dirnames if name not in excluded]
+        rel_dir = os.path.relpath(dirpath, top)
+        for name in filenames:
+            if name in excluded or os.path.splitext(name)[1].lower() not in suffixes:
+                continue
+            path = os.path.join(dirpath, name)
+            try:
+                info = os.stat(path)
+            except OSError:
+                continue
+            if not stat.S_ISREG(info.st_mode):
+                continue
+            yield (name if rel_dir == "." else os.path.join(rel_dir, name)), path, info
+
+
+class ReferenceIndex:
+    """Files under ``root`` that mention any of ``terms``, built in one walk."""
+
+    def __init__(
+        self,
+        root: Path,
+        terms: Iterable[str],
+        cache_path: Optional[Path] = None,
+        suffixes: Iterable[str] = DEFAULT_SUFFIXES,
+        excluded: Iterable[str] = DEFAULT_EXCLUDED,
+    ) -> None:
+        self.root = root
+        self.matcher = TermPattern(terms)
+        self.terms = self.matcher.terms
+        self.cache_path = cache_path
+        self.suffixes = sorted(suffixes)
+        self.excluded = sorted(excluded)
+        self.files_read = 0
+        self.files_reused = 0
+
+    def signature(self) -> Dict[str, object]:
+        return {
+            "version": INDEX_VERSION,
+            "terms": self.terms,
+            "suffixes": self.suffixes,
+            "excluded": self.excluded,
+        }
+
+    def scan(self) -> Dict[str, List[str]]:
+        """Relative path -> terms it contains (in term order), for files with at least one match."""
+        cached = self._load()
+        racy_after = time.time_ns() - RACY_WINDOW_NS
+        entries: Dict[str, CacheEntry] = {}
+        matches: Dict[str, List[str]] = {}
+        for rel, path, info in iter_source_files(self.root, self.suffixes, self.excluded):
+            key = [info.st_size, info.st_mtime_ns]
+            entry = cached.get(rel)
+            if entry is not None and entry[:2] == key:
+                ids = entry[2]
+                self.files_reused += 1
+            else:
+                try:
+                    with open(path, "r", encoding="utf-8") as handle:
+                        text = handle.read()
+                except UnicodeDecodeError:
+                    text = ""  # undecodable files never match; cache that too
+                except OSError:
+                    continue
+                ids = sorted(self.matcher.find_ids(text))
+                self.files_read += 1
+            if info.st_mtime_ns < racy_after:
+                entries[rel] = key + [ids]
+            if ids:
+                matches[rel] = [self.terms[term_id] for term_id in ids]
+        if self.cache_path is not None and entries != cached:
+            self._save(entries)
+        return matches
+
+    def references(self) -> Dict[str, List[str]]:
+        """Term -> files containing it, in walk order; terms with no hits map to ``[]``."""
+        found: Dict[str, List[str]] = {term: [] for term in self.terms}
+        for rel, terms in self.scan().items():
+            for term in terms:
+                found[term].append(rel)
+        return found
+
+    def _load(self) -> Dict[str, CacheEntry]:
+        if self.cache_path is None or not self.cache_path.is_file():
+            return {}
+        try:
+            with self.cache_path.open("r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(payload, dict) or payload.get("signature") != self.signature():
+            return {}
+        files = payload.get("files")
+        return files if isinstance(files, dict) else {}
+
+    def _save(self, entries: Dict[str, CacheEntry]) -> None:
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_name(f".{self.cache_path.name}.{os.getpid()}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            json.dump({"signature": self.signature(), "files": entries}, handle, separators=(",", ":"))
+        os.replace(tmp_path, self.cache_path)
@@ -2,19 +2,36 @@
 """Info icon placement audit utility."""
 from __future__ import annotations
 
+import argparse
 import csv
 import datetime as dt
 import json
+import os
 import re
 import sys
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass
 from hashlib import sha256
 from html.parser import HTMLParser
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from functools import lru_cache
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Pattern, Sequence, Set, Tuple, Union
+
+from checksum_cache import ChecksumCache
+from doc_cache import DocumentCache
+from snapshot_store import SnapshotStore
+from term_matcher import TermAutomaton
 
 SKIP_TAGS = {"script", "style", "noscript", "template"}
 WINDOW_WORDS = 10
+PAGE_CACHE_PATH = Path("_codex_sync") / "cache" / "infoicon_pages.json"
+CHECKSUM_CACHE_PATH = Path("_codex_sync") / "cache" / "checksums.json"
+SNAPSHOT_STORE_PATH = Path("_codex_sync") / "snapshots" / "snapshots.jsonl"
+# Whitespace between two words that is anything other than a single space.
+IRREGULAR_SPACE_RE = re.compile(r"(?<=\S)(?:\s{2,}|[^\S ])(?=\S)")
+# Bump when scan_page output changes so stale cached hits are discarded.
+PAGE_CACHE_VERSION = 1
 
 
 @dataclass
@@ -25,32 +42,77 @@ class TermInfo:
     tooltip: str
 
 
+class PathFrame:
+    """One open element; frames link to their parent so paths are built only on demand."""
+
+    __slots__ = ("tag", "attrs", "parent", "_path")
+
+    def __init__(self, tag: str, attrs: Dict[str, str], parent: Optional["PathFrame"]) -> None:
+        self.tag = tag
+        self.attrs = attrs
+        self.parent = parent
+        self._path: Optional[str] = None
+
+    @property
+    def path(self) -> str:
+        if self._path is None:
+            pending: List[PathFrame] = []
+            frame: Optional[PathFrame] = self
+            while frame is not None and frame._path is None:
+                pending.append(frame)
+                frame = frame.parent
+            prefix = frame._path if frame is not None else ""
+            for item in reversed(pending):
+                label = TextExtractor._format_tag(item.tag, item.attrs)
+                prefix = f"{prefix} > {label}" if prefix else label
+                item._path = prefix
+        return self._path  # type: ignore[return-value]
+
+
 @dataclass
 class TextNode:
     text: str
     tag: str
     attrs: Dict[str, str]
-    path: str
+    frame: Optional[PathFrame]
     source: str  # 'text' or 'alt'
 
+    @property
+    def path(self) -> str:
+        return self.frame.path if self.frame is not None else ""
+
+
+@dataclass
+class TermHit:
+    key: str
+    node_index: int
+    context: str
+    location: str
+    source: str
+
 
 class TextExtractor(HTMLParser):
     """Collects visible text and image alternative text."""
 
     def __init__(self) -> None:
         super().__init__()
-        self.stack: List[Tuple[str, Dict[str, str]]] = []
+        self.stack: List[PathFrame] = []
         self.nodes: List[TextNode] = []
+        self.skip_depth = 0  # open SKIP_TAGS elements on the stack
 
     def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
         attr_dict = self._normalize_attrs(attrs)
-        self.stack.append((tag, attr_dict))
+        self.stack.append(PathFrame(tag, attr_dict, self.stack[-1] if self.stack else None))
+        if tag in SKIP_TAGS:
+            self.skip_depth += 1
         if tag == "img":
             self._capture_alt(tag, attr_dict)
 
     def handle_endtag(self, tag: str) -> None:
         for index in range(len(self.stack) - 1, -1, -1):
-            if self.stack[index][0] == tag:
+            if self.stack[index].tag == tag:
+                if self.skip_depth:
+                    self.skip_depth -= sum(1 for frame in self.stack[index:] if frame.tag in SKIP_TAGS)
                 del self.stack[index:]
                 break
 
@@ -62,29 +124,20 @@ class TextExtractor(HTMLParser):
     def handle_data(self, data: str) -> None:
         if not data or not data.strip():
             return
-        if any(tag in SKIP_TAGS for tag, _ in self.stack):
+        if self.skip_depth:
             return
-        current_tag, current_attrs = self.stack[-1] if self.stack else ("document", {})
-        node = TextNode(
-            text=data,
-            tag=current_tag,
-            attrs=current_attrs,
-            path=self._build_path(),
-            source="text",
-        )
-        self.nodes.append(node)
+        if self.stack:
+            frame: Optional[PathFrame] = self.stack[-1]
+            current_tag, current_attrs = frame.tag, frame.attrs  # type: ignore[union-attr]
+        else:
+            frame, current_tag, current_attrs = None, "document", {}
+        self.nodes.append(TextNode(text=data, tag=current_tag, attrs=current_attrs, frame=frame, source="text"))
 
     def _capture_alt(self, tag: str, attrs: Dict[str, str]) -> None:
         alt = attrs.get("alt")
         if alt and alt.strip():
-            node = TextNode(
-                text=alt,
-                tag=tag,
-                attrs=attrs,
-                path=self._build_path(include_current=(tag, attrs)),
-                source="alt",
-            )
-            self.nodes.append(node)
+            frame = PathFrame(tag, attrs, self.stack[-1] if self.stack else None)
+            self.nodes.append(TextNode(text=alt, tag=tag, attrs=attrs, frame=frame, source="alt"))
 
     def _normalize_attrs(self, attrs: Iterable[Tuple[str, Optional[str]]]) -> Dict[str, str]:
         normalized: Dict[str, str] = {}
@@ -97,13 +150,8 @@ class TextExtractor(HTMLParser):
                 normalized[key] = value
         return normalized
 
-    def _build_path(self, include_current: Optional[Tuple[str, Dict[str, str]]] = None) -> str:
-        parts = [self._format_tag(tag, attrs) for tag, attrs in self.stack]
-        if include_current:
-            parts.append(self._format_tag(include_current[0], include_current[1]))
-        return " > ".join(parts)
-
-    def _format_tag(self, tag: str, attrs: Dict[str, str]) -> str:
+    @staticmethod
+    def _format_tag(tag: str, attrs: Dict[str, str]) -> str:
         ident = tag
         if not attrs:
             return ident
@@ -134,27 +182,28 @@ def load_terms(csv_path: Path) -> Dict[str, TermInfo]:
     return lookup
 
 
-def compute_checksums(files: Iterable[Path]) -> Dict[str, str]:
-    checksums: Dict[str, str] = {}
-    for file_path in files:
-        if not file_path.is_file():
-            continue
-        digest = sha256(file_path.read_bytes()).hexdigest()
-        checksums[str(file_path)] = digest
-    return checksums
+def compute_checksums(files: Iterable[Path], cache_path: Optional[Path] = None) -> Dict[str, str]:
+    """sha256 per file; with ``cache_path`` only files whose stat changed are re-hashed."""
+    cache = ChecksumCache(cache_path).load()
+    digests = cache.hash_files(files)
+    cache.save()
+    return {str(file_path): digest for file_path, digest in digests.items()}
 
 
-def update_preflight_snapshot(repo_root: Path, target_files: Iterable[Path]) -> str:
-    snapshot = compute_checksums(target_files)
+def update_preflight_snapshot(
+    repo_root: Path, target_files: Iterable[Path], snapshot: Optional[Dict[str, str]] = None
+) -> str:
+    if snapshot is None:
+        snapshot = compute_checksums(target_files)
     timestamp = dt.datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
-    preflight_path = repo_root / "_codex_sync" / "preflight_checksums.json"
-    if not preflight_path.is_file():
-        raise FileNotFoundError("Expected preflight_checksums.json")
-    with preflight_path.open(encoding="utf-8") as handle:
-        data = json.load(handle)
-    data[f"infoicon_audit_preflight_{timestamp}"] = snapshot
-    with preflight_path.open("w", encoding="utf-8") as handle:
-        json.dump(data, handle, indent=2, sort_keys=True)
+    store = SnapshotStore(repo_root / SNAPSHOT_STORE_PATH).load()
+    relative = {}
+    for path, digest in snapshot.items():
+        try:
+            relative[Path(path).relative_to(repo_root).as_posix()] = digest
+        except ValueError:
+            relative[path] = digest
+    store.record(f"infoicon_audit_preflight_{timestamp}", relative, created_at=timestamp)
     return timestamp
 
 
@@ -189,19 +238,273 @@ def extract_context(text: str, term: str, window: int = WINDOW_WORDS) -> str:
     return snippet
 
 
+@lru_cache(maxsize=1024)
+def _word_sequence_re(words: Tuple[str, ...]) -> Pattern[str]:
+    return re.compile(r"(?<!\S)" + r"\s+".join(re.escape(word) for word in words) + r"(?!\S)")
+
+
+def _word_start_before(text: str, index: int, words: int) -> int:
+    """Offset of the word ``words`` words before ``index`` (or of the first word)."""
+    start = index
+    for _ in range(words):
+        cursor = start
+        while cursor > 0 and text[cursor - 1].isspace():
+            cursor -= 1
+        if cursor == 0:
+            break
+        while cursor > 0 and not text[cursor - 1].isspace():
+            cursor -= 1
+        start = cursor
+    return start
+
+
+def _word_end_after(text: str, index: int, words: int) -> int:
+    """Offset just past the word ``words`` words after ``index`` (or past the last word)."""
+    end = index
+    size = len(text)
+    for _ in range(words):
+        cursor = end
+        while cursor < size and text[cursor].isspace():
+            cursor += 1
+        if cursor == size:
+            break
+        while cursor < size and not text[cursor].isspace():
+            cursor += 1
+        end = cursor
+    return end
+
+
+def extract_context_at(
+    text: str, text_lower: str, term: str, starts: Sequence[int], window: int = WINDOW_WORDS
+) -> str:
+    """extract_context() driven by the term scan's hit offsets.
+
+    ``starts`` are the offsets of every occurrence of ``term.lower()`` in
+    ``text_lower``. Word spans are only walked around the chosen hit, so the
+    cost no longer grows with the number of words in the node.
+    """
+    key = term.lower()
+    target = key.split()
+    if not starts or not target or len(text_lower) != len(text):
+        # Offsets only map onto text when lower-casing kept every character's width.
+        return extract_context(text, term, window)
+    match: Optional[Tuple[int, int]] = None
+    if key == " ".join(target) and (len(target) == 1 or not IRREGULAR_SPACE_RE.search(text)):
+        size = len(text_lower)
+        for start in starts:
+            end = start + len(key)
+            if (start == 0 or text_lower[start - 1].isspace()) and (end == size or text_lower[end].isspace()):
+                match = (start, end)
+                break
+    else:
+        # Words separated by newlines or runs of spaces never show up as a substring hit.
+        found = _word_sequence_re(tuple(target)).search(text_lower)
+        if found:
+            match = found.span()
+    if match is not None:
+        start = _word_start_before(text, match[0], window)
+        end = _word_end_after(text, match[1], window)
+        return " ".join(text[start:end].split())
+    pos = starts[0]
+    start_char = max(0, pos - 120)
+    end_char = min(len(text), pos + len(term) + 120)
+    return text[start_char:end_char].strip()
+
+
+class AtomicTextWriter:
+    """Text file written under a temporary name and moved into place only on success."""
+
+    def __init__(self, path: Path, newline: Optional[str] = None) -> None:
+        self.path = path
+        self.tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        self.handle: IO[str] = self.tmp_path.open("w", encoding="utf-8", newline=newline)
+
+    def __enter__(self) -> "AtomicTextWriter":
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        self.handle.close()
+        if exc_type is None:
+            os.replace(self.tmp_path, self.path)
+        else:
+            self.tmp_path.unlink(missing_ok=True)
+
+
+class JsonArrayWriter(AtomicTextWriter):
+    """Streams a JSON array item by item.
+
+    With the default indent the file is byte-identical to
+    ``json.dumps(items, indent=2) + "\\n"``; ``indent=None`` writes a compact array.
+    """
+
+    def __init__(self, path: Path, indent: Optional[int] = 2) -> None:
+        super().__init__(path)
+        self.indent = indent
+        self.count = 0
+        self.handle.write("[")
+
+    def write(self, item: object) -> None:
+        if self.indent is None:
+            self.handle.write(("," if self.count else "") + json.dumps(item, separators=(",", ":")))
+        else:
+            pad = " " * self.indent
+            body = json.dumps(item, indent=self.indent).replace("\n", "\n" + pad)
+            self.handle.write(("," if self.count else "") + "\n" + pad + body)
+        self.count += 1
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        if exc_type is None:
+            self.handle.write("\n]\n" if self.count and self.indent is not None else "]\n")
+        super().__exit__(exc_type, exc, tb)
+
+
+class JsonLinesWriter(AtomicTextWriter):
+    """Streams one compact JSON document per line."""
+
+    def __init__(self, path: Path) -> None:
+        super().__init__(path)
+        self.count = 0
+
+    def write(self, item: object) -> None:
+        self.handle.write(json.dumps(item, separators=(",", ":")) + "\n")
+        self.count += 1
+
+
+def open_record_writer(path: Path, fmt: str, compact: bool = False) -> Union[JsonArrayWriter, JsonLinesWriter]:
+    if fmt == "jsonl":
+        return JsonLinesWriter(path)
+    return JsonArrayWriter(path, indent=None if compact else 2)
+
+
+RECORD_FORMATS = {"json": ".json", "jsonl": ".jsonl"}
+
+
+def record_paths(audit_dir: Path, fmt: str) -> Tuple[Path, Path]:
+    """The matches and missing files a run with ``--format fmt`` writes."""
+    suffix = RECORD_FORMATS[fmt]
+    return audit_dir / f"infoicon_matches{suffix}", audit_dir / f"infoicon_missing{suffix}"
+
+
+def remove_other_formats(audit_dir: Path, fmt: str) -> None:
+    """Delete matches/missing files an earlier run wrote in another format, so none of them go stale."""
+    for other in RECORD_FORMATS:
+        if other != fmt:
+            for path in record_paths(audit_dir, other):
+                path.unlink(missing_ok=True)
+
+
 def load_inventory(repo_root: Path) -> List[Dict[str, str]]:
     inventory_path = repo_root / "_codex_sync" / "site_audit" / "pages_inventory.json"
     with inventory_path.open(encoding="utf-8") as handle:
         return json.load(handle)
 
 
-def parse_html_text(file_path: Path) -> List[TextNode]:
+def parse_html_text(file_path: Path, documents: Optional[DocumentCache] = None) -> List[TextNode]:
     parser = TextExtractor()
-    parser.feed(file_path.read_text(encoding="utf-8"))
+    if documents is not None:
+        documents.load(file_path).replay(parser)
+    else:
+        parser.feed(file_path.read_text(encoding="utf-8"))
     parser.close()
     return parser.nodes
 
 
+def scan_page(
+    file_path: Path,
+    term_lookup: Dict[str, TermInfo],
+    automaton: TermAutomaton,
+    documents: Optional[DocumentCache] = None,
+) -> List[TermHit]:
+    """First hit of each term on a page, in node order then term_lookup order."""
+    matched: Dict[str, TermHit] = {}
+    for node_index, node in enumerate(parse_html_text(file_path, documents)):
+        text_lower = node.text.lower()
+        occurrences = automaton.occurrences(text_lower)
+        for term_id in sorted(occurrences):
+            key = automaton.terms[term_id]
+            if key in matched:
+                continue
+            starts = occurrences[term_id]
+            if automaton.word_boundaries and not any(
+                automaton.is_bounded(text_lower, start, start + len(key)) for start in starts
+            ):
+                continue
+            matched[key] = TermHit(
+                key=key,
+                node_index=node_index,
+                context=extract_context_at(node.text, text_lower, term_lookup[key].term, starts),
+                location=describe_location(node.path),
+                source=node.source,
+            )
+    return list(matched.values())
+
+
+class PageCache:
+    """Per-page term hits keyed by page sha256.
+
+    The whole cache is tied to one signature (term CSV hash, matching options
+    and cache version); a different signature starts from empty, so only
+    pages whose content changed are parsed again.
+    """
+
+    def __init__(self, path: Path, signature: str) -> None:
+        self.path = path
+        self.signature = signature
+        self.pages: Dict[str, Dict[str, object]] = {}
+
+    @staticmethod
+    def signature_for(csv_path: Path, word_boundaries: bool) -> str:
+        terms_hash = sha256(csv_path.read_bytes()).hexdigest()
+        return f"v{PAGE_CACHE_VERSION}:{terms_hash}:word_boundaries={int(word_boundaries)}"
+
+    def load(self) -> "PageCache":
+        try:
+            with self.path.open(encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return self
+        if data.get("signature") == self.signature:
+            self.pages = data.get("pages", {})
+        return self
+
+    def get(self, file_name: str, digest: str) -> Optional[List[TermHit]]:
+        cached = self.pages.get(file_name)
+        if not cached or cached.get("sha256") != digest:
+            return None
+        return [TermHit(**hit) for hit in cached["hits"]]  # type: ignore[union-attr]
+
+    def put(self, file_name: str, digest: str, hits: List[TermHit]) -> None:
+        self.pages[file_name] = {"sha256": digest, "hits": [asdict(hit) for hit in hits]}
+
+    def save(self, keep: Iterable[str]) -> None:
+        wanted = set(keep)
+        pages = {name: value for name, value in self.pages.items() if name in wanted}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            json.dump({"signature": self.signature, "pages": pages}, handle, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+
+_WORKER_STATE: Dict[str, object] = {}
+
+
+def _init_worker(csv_path: str, word_boundaries: bool, use_documents: bool) -> None:
+    term_lookup = load_terms(Path(csv_path))
+    _WORKER_STATE["term_lookup"] = term_lookup
+    _WORKER_STATE["automaton"] = TermAutomaton(term_lookup, word_boundaries=word_boundaries)
+    _WORKER_STATE["documents"] = DocumentCache() if use_documents else None
+
+
+def _scan_page_worker(file_path: str) -> List[TermHit]:
+    return scan_page(
+        Path(file_path),
+        _WORKER_STATE["term_lookup"],  # type: ignore[arg-type]
+        _WORKER_STATE["automaton"],  # type: ignore[arg-type]
+        _WORKER_STATE["documents"],  # type: ignore[arg-type]
+    )
+
+
 def ensure_orphan_file(repo_root: Path) -> None:
     orphan_path = repo_root / "_codex_sync" / "site_audit" / "pages_orphans.json"
     if not orphan_path.exists():
@@ -229,108 +532,178 @@ def append_activity_log(repo_root: Path, pages_scanned: int, matches: int) -> No
         handle.write(line)
 
 
-def main() -> int:
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Audit info icon placement against the priority term list.")
+    parser.add_argument(
+        "--word-boundaries",
+        action="store_true",
+        help="Only count whole-word term hits (default: any substring, e.g. 'ph' inside 'graph').",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Parse and match pages in N worker processes (default: 1, serial). Output is identical either way.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Re-parse and re-hash every page instead of reusing unchanged results from {PAGE_CACHE_PATH}, "
+        "parsed documents from the shared document cache and digests from the checksum cache.",
+    )
+    parser.add_argument(
+        "--format",
+        choices=sorted(RECORD_FORMATS),
+        default="json",
+        help="Write matches/missing as JSON arrays (default) or as JSON Lines (*.jsonl). "
+        "The other format's files are removed, so only this run's results remain.",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write JSON arrays without indentation.",
+    )
+    args = parser.parse_args(argv)
+
     repo_root = Path(__file__).resolve().parent.parent
     csv_path = repo_root / "aquarium_search_terms_infoicon_priority.csv"
     inventory = load_inventory(repo_root)
     term_lookup = load_terms(csv_path)
+    # Term ids follow term_lookup order, so hits are reported in the same order as before.
+    automaton = TermAutomaton(term_lookup, word_boundaries=args.word_boundaries)
     audit_dir = repo_root / "_codex_sync" / "infoicons_audit"
     audit_dir.mkdir(parents=True, exist_ok=True)
 
     target_files = [repo_root / entry["file"] for entry in inventory if entry["file"].endswith(".html")]
-    preflight_timestamp = update_preflight_snapshot(repo_root, target_files)
+    checksums = compute_checksums(target_files, None if args.no_cache else repo_root / CHECKSUM_CACHE_PATH)
+    preflight_timestamp = update_preflight_snapshot(repo_root, target_files, checksums)
 
-    results: List[Dict[str, object]] = []
-    missing: List[Dict[str, object]] = []
-    csv_rows: List[Dict[str, str]] = []
-    pages_scanned = 0
+    pages = [
+        (entry, repo_root / entry["file"])
+        for entry in inventory
+        if entry["file"].endswith(".html") and (repo_root / entry["file"]).is_file()
+    ]
+    pages_scanned = len(pages)
     total_matches = 0
+    total_missing_terms = 0
+    # Only what the summary needs is kept; full records are streamed straight to disk.
+    summary_matches: List[Tuple[str, int, str, str]] = []
+    summary_missing: List[Tuple[str, List[str]]] = []
+
+    cache: Optional[PageCache] = None
+    documents: Optional[DocumentCache] = None
+    if not args.no_cache:
+        cache = PageCache(repo_root / PAGE_CACHE_PATH, PageCache.signature_for(csv_path, args.word_boundaries)).load()
+        documents = DocumentCache()
+    cached_hits: List[Optional[List[TermHit]]] = [
+        cache.get(entry["file"], checksums[str(path)]) if cache is not None else None for entry, path in pages
+    ]
+    pending = [index for index, hits in enumerate(cached_hits) if hits is None]
 
-    for entry in inventory:
-        file_name = entry["file"]
-        if not file_name.endswith(".html"):
-            continue
-        file_path = repo_root / file_name
-        if not file_path.is_file():
-            continue
-        pages_scanned += 1
-        nodes = parse_html_text(file_path)
-        matched_terms: Dict[str, Dict[str, object]] = {}
+    matches_path, missing_path = record_paths(audit_dir, args.format)
+    summary_path = audit_dir / "infoicon_summary.md"
+    csv_path_out = audit_dir / "infoicon_recommendations.csv"
+    fieldnames = [
+        "page_path",
+        "file",
+        "term",
+        "status",
+        "context_excerpt",
+        "recommended_icon_location",
+        "tooltip",
+        "intent",
+    ]
 
-        for node_index, node in enumerate(nodes):
-            text_lower = node.text.lower()
+    with ExitStack() as stack:
+        if args.jobs > 1 and len(pending) > 1:
+            pool = stack.enter_context(ProcessPoolExecutor(
+                max_workers=args.jobs,
+                initializer=_init_worker,
+                initargs=(str(csv_path), args.word_boundaries, documents is not None),
+            ))
+            # map() yields in submission order, so results merge in inventory order.
+            scanned: Iterator[List[TermHit]] = pool.map(_scan_page_worker, [str(pages[index][1]) for index in pending])
+        else:
+            scanned = (scan_page(pages[index][1], term_lookup, automaton, documents) for index in pending)
+        matches_out = stack.enter_context(open_record_writer(matches_path, args.format, args.compact))
+        missing_out = stack.enter_context(open_record_writer(missing_path, args.format, args.compact))
+        csv_out = stack.enter_context(AtomicTextWriter(csv_path_out, newline=""))
+        writer = csv.DictWriter(csv_out.handle, fieldnames=fieldnames)
+        writer.writeheader()
+
+        for (entry, path), hits in zip(pages, cached_hits):
+            file_name = entry["file"]
+            if hits is None:
+                hits = next(scanned)
+                if cache is not None:
+                    cache.put(file_name, checksums[str(path)], hits)
+            matched_terms: Set[str] = set()
+
+            for hit in hits:
+                info = term_lookup[hit.key]
+                matches_out.write({
+                    "page_path": entry["url_path"],
+                    "file": file_name,
+                    "term": info.term,
+                    "intent": info.intent,
+                    "context_excerpt": hit.context,
+                    "recommended_icon_location": hit.location,
+                    "tooltip": info.tooltip,
+                    "source": hit.source,
+                    "node_index": hit.node_index,
+                    "preflight_timestamp": preflight_timestamp,
+                })
+                matched_terms.add(hit.key)
+                summary_matches.append((file_name, hit.node_index, info.term, hit.location))
+                writer.writerow({
+                    "page_path": entry["url_path"],
+                    "file": file_name,
+                    "term": info.term,
+                    "status": "present",
+                    "context_excerpt": hit.context,
+                    "recommended_icon_location": hit.location,
+                    "tooltip": info.tooltip,
+                    "intent": info.intent,
+                })
+            total_matches += len(matched_terms)
+
+            page_missing: List[Dict[str, str]] = []
             for key, info in term_lookup.items():
+                if info.recommended_page and info.recommended_page != file_name:
+                    continue
                 if key in matched_terms:
                     continue
-                if key in text_lower:
-                    context = extract_context(node.text, info.term)
-                    location = describe_location(node.path)
-                    match_entry = {
-                        "page_path": entry["url_path"],
-                        "file": file_name,
-                        "term": info.term,
-                        "intent": info.intent,
-                        "context_excerpt": context,
-                        "recommended_icon_location": location,
-                        "tooltip": info.tooltip,
-                        "source": node.source,
-                        "node_index": node_index,
-                        "preflight_timestamp": preflight_timestamp,
-                    }
-                    matched_terms[key] = match_entry
-                    results.append(match_entry)
-                    csv_rows.append({
-                        "page_path": entry["url_path"],
-                        "file": file_name,
-                        "term": info.term,
-                        "status": "present",
-                        "context_excerpt": context,
-                        "recommended_icon_location": location,
-                        "tooltip": info.tooltip,
-                        "intent": info.intent,
-                    })
-        total_matches += len(matched_terms)
-
-        page_missing: List[Dict[str, str]] = []
-        for key, info in term_lookup.items():
-            if info.recommended_page and info.recommended_page != file_name:
-                continue
-            if key in matched_terms:
-                continue
-            suggestion = f"Add tooltip near first mention or summary of '{info.term}' on {file_name}."
-            entry_missing = {
-                "term": info.term,
-                "intent": info.intent,
-                "tooltip": info.tooltip,
-                "recommended_icon_location": suggestion,
-            }
-            page_missing.append(entry_missing)
-            csv_rows.append({
-                "page_path": entry["url_path"],
-                "file": file_name,
-                "term": info.term,
-                "status": "missing",
-                "context_excerpt": "",
-                "recommended_icon_location": suggestion,
-                "tooltip": info.tooltip,
-                "intent": info.intent,
-            })
-        if page_missing:
-            missing.append({
-                "page_path": entry["url_path"],
-                "file": file_name,
-                "missing_terms": page_missing,
-            })
-
-    matches_path = audit_dir / "infoicon_matches.json"
-    missing_path = audit_dir / "infoicon_missing.json"
-    summary_path = audit_dir / "infoicon_summary.md"
-    csv_path_out = audit_dir / "infoicon_recommendations.csv"
-
-    matches_path.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
-    missing_path.write_text(json.dumps(missing, indent=2) + "\n", encoding="utf-8")
+                suggestion = f"Add tooltip near first mention or summary of '{info.term}' on {file_name}."
+                entry_missing = {
+                    "term": info.term,
+                    "intent": info.intent,
+                    "tooltip": info.tooltip,
+                    "recommended_icon_location": suggestion,
+                }
+                page_missing.append(entry_missing)
+                writer.writerow({
+                    "page_path": entry["url_path"],
+                    "file": file_name,
+                    "term": info.term,
+                    "status": "missing",
+                    "context_excerpt": "",
+                    "recommended_icon_location": suggestion,
+                    "tooltip": info.tooltip,
+                    "intent": info.intent,
+                })
+            if page_missing:
+                missing_out.write({
+                    "page_path": entry["url_path"],
+                    "file": file_name,
+                    "missing_terms": page_missing,
+                })
+                total_missing_terms += len(page_missing)
+                summary_missing.append((file_name, [item["term"] for item in page_missing]))
+
+    remove_other_formats(audit_dir, args.format)
+    if cache is not None:
+        cache.save(entry["file"] for entry, _ in pages)
 
-    total_missing_terms = sum(len(entry["missing_terms"]) for entry in missing)
     summary_lines = [
         "# Info Icon Audit Summary",
         "",
@@ -344,44 +717,25 @@ def main() -> int:
     ]
 
     # Sort matches by significance (present first by order of detection)
-    prioritized = sorted(results, key=lambda item: (item["file"], item["node_index"]))
+    prioritized = sorted(summary_matches, key=lambda item: (item[0], item[1]))
     seen_pairs = set()
-    for entry in prioritized:
-        pair_key = (entry["file"], entry["term"])
+    for file_name, _, term, location in prioritized:
+        pair_key = (file_name, term)
         if pair_key in seen_pairs:
             continue
         seen_pairs.add(pair_key)
-        summary_lines.append(
-            f"- **{entry['term']}** on `{entry['file']}` → tooltip near `{entry['recommended_icon_location']}`."
-        )
+        summary_lines.append(f"- **{term}** on `{file_name}` → tooltip near `{location}`.")
     if not prioritized:
         summary_lines.append("- No existing matches located; focus on missing placements.")
 
-    if missing:
+    if summary_missing:
         summary_lines.append("")
         summary_lines.append("## Missing but Relevant")
-        for entry in missing:
-            terms = ", ".join(term["term"] for term in entry["missing_terms"])
-            summary_lines.append(f"- `{entry['file']}` missing: {terms}")
+        for file_name, missing_terms in summary_missing:
+            summary_lines.append(f"- `{file_name}` missing: {', '.join(missing_terms)}")
 
     summary_path.write_text("\n".join(summary_lines) + "\n", encoding="utf-8")
 
-    with csv_path_out.open("w", newline="", encoding="utf-8") as handle:
-        fieldnames = [
-            "page_path",
-            "file",
-            "term",
-            "status",
-            "context_excerpt",
-            "recommended_icon_location",
-            "tooltip",
-            "intent",
-        ]
-        writer = csv.DictWriter(handle, fieldnames=fieldnames)
-        writer.writeheader()
-        for row in csv_rows:
-            writer.writerow(row)
-
     ensure_orphan_file(repo_root)
     update_codex_status(repo_root)
     append_activity_log(repo_root, pages_scanned, total_matches)
@@ -1,74 +1,74 @@
-import sys, subprocess, os, csv, argparse, shutil, pathlib
+import sys, time, argparse, pathlib
 
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 SCRIPTS = ROOT / "scripts"
 REPORTS = ROOT / "reports"
-AUDITOR = SCRIPTS / "link_audit.py"
-
-PACKAGE_TO_MODULE = {
-    "beautifulsoup4": "bs4",
-}
-
-
-def pip_install_if_missing(pkgs):
-    for pkg in pkgs:
-        module_name = PACKAGE_TO_MODULE.get(pkg, pkg)
-        try:
-            __import__(module_name)
-        except Exception:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", pkg])
-
-
-def run_auditor(input_csv=None, sleep=0.7, limit=0):
-    if not AUDITOR.exists():
-        raise SystemExit(f"Missing auditor at {AUDITOR}. Make sure scripts/link_audit.py is in the repo.")
-    cmd = [sys.executable, str(AUDITOR)]
-    if input_csv:
-        cmd += ["--input", input_csv]
-    if sleep is not None:
-        cmd += ["--sleep", str(sleep)]
-    if limit:
-        cmd += ["--limit", str(limit)]
-    subprocess.check_call(cmd)
-
-
-def print_mismatches():
-    path = REPORTS / "link_audit.csv"
-    if not path.exists():
-        raise SystemExit(f"No audit CSV found at {path}. Did the auditor run?")
-    mismatches = []
-    with open(path, newline="", encoding="utf-8") as f:
-        r = csv.DictReader(f)
-        for row in r:
-            if (row.get("Match_Status") or "").upper() == "MISMATCH":
-                mismatches.append(row)
-    print(f"\n=== MISMATCH SUMMARY ({len(mismatches)} rows) ===")
-    for i, m in enumerate(mismatches, 1):
-        pn = (m.get("Product_Name") or "").strip()
-        ttl = (m.get("Page_Title") or "").strip().replace("\n", " ")
-        url = (m.get("Resolved_URL") or m.get("Amazon_Link") or "").strip()
-        cat = (m.get("Category") or "").strip()
-        print(f"\n#{i} [{cat}] {pn}\nTitle: {ttl[:200]}\nURL:   {url}")
+
+sys.path.insert(0, str(SCRIPTS))
+import link_audit  # noqa: E402
+
+
+def format_eta(seconds):
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    return f"{seconds // 60}m{seconds % 60:02d}s"
+
+
+def progress_line(done, total, started):
+    elapsed = time.monotonic() - started
+    rate = done / elapsed if elapsed > 0 else 0
+    eta = (total - done) / rate if rate else 0
+    return f"[{done}/{total}] {rate:.1f} rows/s, elapsed {format_eta(elapsed)}, ETA {format_eta(eta)}"
+
+
+def print_mismatch(i, m):
+    pn = (m.get("Product_Name") or "").strip()
+    ttl = (m.get("Page_Title") or "").strip().replace("\n", " ")
+    url = (m.get("Resolved_URL") or m.get("Amazon_Link") or "").strip()
+    cat = (m.get("Category") or "").strip()
+    print(f"\n#{i} [{cat}] {pn}\nTitle: {ttl[:200]}\nURL:   {url}")
+
+
+def run_and_report(audit_args):
+    live = sys.stderr.isatty()
+    started = time.monotonic()
+    mismatches = 0
+    done = total = 0
+    print("\n=== MISMATCHES (as found) ===")
+    for done, total, record in link_audit.run_audit(audit_args):
+        if (record.get("Match_Status") or "").upper() == "MISMATCH":
+            mismatches += 1
+            if live:
+                sys.stderr.write("\r\033[K")
+            print_mismatch(mismatches, record)
+        line = progress_line(done, total, started)
+        if live:
+            sys.stderr.write("\r\033[K" + line)
+            sys.stderr.flush()
+        elif done % 25 == 0 or done == total:
+            print(line, file=sys.stderr)
+    if live and total:
+        sys.stderr.write("\n")
+    print(f"\n=== MISMATCH SUMMARY ({mismatches} of {done} rows) ===")
     if not mismatches:
         print("\n(no mismatches found 🎉)")
 
 
 def main():
-    ap = argparse.ArgumentParser(description="Run link audit and print only mismatches.")
+    ap = argparse.ArgumentParser(description="Run link audit and print only mismatches.",
+                                 epilog="Any other link_audit.py flag (e.g. --concurrency, --resume) is passed through.")
     ap.add_argument("--input", help="Audit a specific CSV (e.g., gear_lighting.csv). If omitted, auto-detect gear_master.csv or master_nav.json.")
     ap.add_argument("--sleep", type=float, default=0.7, help="Delay between requests (seconds).")
     ap.add_argument("--limit", type=int, default=0, help="Limit number of rows (0 = all).")
-    args = ap.parse_args()
+    args, passthrough = ap.parse_known_args()
 
-    # Ensure deps for link_audit.py
-    pip_install_if_missing(["requests", "beautifulsoup4"])
+    audit_argv = ["--sleep", str(args.sleep), "--limit", str(args.limit)]
+    if args.input:
+        audit_argv += ["--input", args.input]
 
-    # Ensure reports dir exists
     REPORTS.mkdir(parents=True, exist_ok=True)
-
-    # Run auditor, then show only mismatches
-    run_auditor(input_csv=args.input, sleep=args.sleep, limit=args.limit)
-    print_mismatches()
+    run_and_report(link_audit.parse_args(audit_argv + passthrough))
 
 
 if __name__ == "__main__":
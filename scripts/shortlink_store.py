@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""Persistent shortlink -> final URL/ASIN index shared by the gear scripts.
+
+Amazon shortlinks (amzn.to, a.co) never change target, so once resolved they
+are recorded in an append-only JSON Lines file and reused by link_audit.py and
+convert_lighting_list.py instead of following the redirect again. Only
+resolutions that land on a product page with a 2xx are kept; sign-in walls,
+captchas and error pages may resolve differently next time.
+
+    python scripts/shortlink_store.py warm              # resolve every shortlink in the gear CSVs
+    python scripts/shortlink_store.py warm data/gear_lighting.csv --workers 16
+    python scripts/shortlink_store.py compact           # drop superseded lines
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_STORE_PATH = REPO_ROOT / "reports/.cache/shortlinks.jsonl"
+DEFAULT_WARM_SOURCES = ["gear_master.csv", "data/gear_*.csv"]
+
+SHORTLINK_DOMAINS = {"a.co", "amzn.to"}
+SHORTLINK_RE = re.compile(r"https?://(?:www\.)?(?:amzn\.to|a\.co)/[^\s\"',]+", re.I)
+AMAZON_ASIN_RE = re.compile(r"/(?:dp|gp/product|gp/aw/d|gp/slredirect)/([A-Z0-9]{10})", re.I)
+UA = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+
+Record = Dict[str, str]
+
+
+def is_shortlink(url: str) -> bool:
+    host = urlparse((url or "").strip()).netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return host in SHORTLINK_DOMAINS
+
+
+def shortlink_key(url: str) -> str:
+    parsed = urlparse(url.strip())
+    host = parsed.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return f"{host}{parsed.path.rstrip('/')}"
+
+
+def extract_asin(url: str) -> str:
+    match = AMAZON_ASIN_RE.search(url or "")
+    return match.group(1).upper() if match else ""
+
+
+def is_permanent(final_url: str, status: int = 200) -> bool:
+    """Whether a resolution may be stored for good: a 2xx landing on an Amazon product URL."""
+    return 200 <= status < 300 and bool(extract_asin(final_url))
+
+
+def follow_redirects(url: str, timeout: float = 5) -> Optional[str]:
+    request = urllib.request.Request(url, headers={"User-Agent": UA})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:  # type: ignore[arg-type]
+            return response.geturl()
+    except (urllib.error.URLError, urllib.error.HTTPError, ValueError, TimeoutError, OSError):
+        return None
+
+
+class ShortlinkStore:
+    """Append-only JSONL index; the last line for a shortlink wins."""
+
+    def __init__(self, path: Path = DEFAULT_STORE_PATH) -> None:
+        self.path = Path(path)
+        self.records: Dict[str, Record] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> "ShortlinkStore":
+        if not self.path.is_file():
+            return self
+        with self.path.open(encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # tolerate a torn final line from an interrupted run
+                if isinstance(record, dict) and record.get("url") and record.get("final_url"):
+                    self.records[shortlink_key(record["url"])] = record
+        return self
+
+    def get(self, url: str) -> Optional[Record]:
+        return self.records.get(shortlink_key(url))
+
+    @staticmethod
+    def make_record(url: str, final_url: str) -> Record:
+        return {
+            "url": url.strip(),
+            "final_url": final_url,
+            "asin": extract_asin(final_url),
+            "resolved_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        }
+
+    def put(self, url: str, final_url: str) -> Record:
+        record = self.make_record(url, final_url)
+        with self._lock:
+            self.records[shortlink_key(url)] = record
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(record, sort_keys=True) + "\n")
+        return record
+
+    def resolve(self, url: str, resolver: Callable[[str], Optional[str]] = follow_redirects) -> Optional[Record]:
+        record = self.get(url)
+        if record is not None:
+            return record
+        final_url = resolver(url)
+        if not final_url:
+            return None
+        if not is_permanent(final_url):
+            return self.make_record(url, final_url)  # usable now, resolved again next run
+        return self.put(url, final_url)
+
+    def warm(self, urls: Iterable[str], workers: int = 8,
+             resolver: Callable[[str], Optional[str]] = follow_redirects) -> Dict[str, int]:
+        shortlinks = {shortlink_key(url): url for url in urls if is_shortlink(url)}
+        pending = sorted(url for key, url in shortlinks.items() if key not in self.records)
+        stats = {"known": len(shortlinks) - len(pending), "resolved": 0, "not_product": 0, "failed": 0}
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+            for url, record in zip(pending, pool.map(lambda url: self.resolve(url, resolver), pending)):
+                if record is None:
+                    stats["failed"] += 1
+                else:
+                    stats["resolved" if self.get(url) is not None else "not_product"] += 1
+        return stats
+
+    def compact(self) -> int:
+        with self._lock:
+            self.load()  # pick up lines other runs appended since this store was loaded
+            tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            with tmp_path.open("w", encoding="utf-8") as handle:
+                for key in sorted(self.records):
+                    handle.write(json.dumps(self.records[key], sort_keys=True) + "\n")
+            tmp_path.replace(self.path)
+        return len(self.records)
+
+
+_DEFAULT_STORE: Optional[ShortlinkStore] = None
+
+
+def default_store() -> ShortlinkStore:
+    global _DEFAULT_STORE
+    if _DEFAULT_STORE is None:
+        _DEFAULT_STORE = ShortlinkStore().load()
+    return _DEFAULT_STORE
+
+
+def collect_shortlinks(paths: Iterable[Path]) -> List[str]:
+    urls: List[str] = []
+    for path in paths:
+        with path.open(newline="", encoding="utf-8-sig") as handle:
+            for row in csv.reader(handle):
+                for cell in row:
+                    urls.extend(match.group(0) for match in SHORTLINK_RE.finditer(cell))
+    return urls
+
+
+def expand_sources(patterns: Iterable[str]) -> List[Path]:
+    paths: List[Path] = []
+    for pattern in patterns:
+        candidate = Path(pattern)
+        if candidate.is_file():
+            paths.append(candidate)
+            continue
+        paths.extend(sorted(REPO_ROOT.glob(pattern)))
+    return paths
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Manage the shared shortlink resolution store.")
+    parser.add_argument("--store", default=str(DEFAULT_STORE_PATH), help="Path to the shortlink JSONL store.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    warm = sub.add_parser("warm", help="Resolve every shortlink found in the given CSVs.")
+    warm.add_argument("sources", nargs="*", default=DEFAULT_WARM_SOURCES, help="CSV files or repo-relative globs.")
+    warm.add_argument("--workers", type=int, default=8, help="Parallel redirect lookups.")
+    sub.add_parser("compact", help="Rewrite the store with one line per shortlink.")
+    args = parser.parse_args(argv)
+
+    store = ShortlinkStore(Path(args.store)).load()
+    if args.command == "compact":
+        print(f"[OK] Compacted {store.path} to {store.compact()} records")
+        return 0
+
+    sources = expand_sources(args.sources)
+    urls = collect_shortlinks(sources)
+    stats = store.warm(urls, workers=args.workers)
+    print(
+        f"[OK] {len({shortlink_key(url) for url in urls})} shortlinks in {len(sources)} files: "
+        f"{stats['known']} already known, {stats['resolved']} resolved, "
+        f"{stats['not_product']} not stored (no product page), {stats['failed']} failed"
+    )
+    return 0 if stats["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
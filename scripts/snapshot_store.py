@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""Bounded, content-addressed store for checksum snapshots.
+
+Replaces appending whole checksum maps to _codex_sync/preflight_checksums.json.
+Snapshots live in one append-only JSON Lines file:
+
+    {"h": 0, "sha256": "..."}                       each distinct hash, once
+    {"snapshot": "name", "series": "...", "created_at": "...",
+     "keyframe": false, "set": {"path": 0}, "del": ["path"]}
+
+A keyframe lists every path; other snapshots only record what changed since
+the previous snapshot of the same series, so recording a run costs a few lines
+instead of a full rewrite. Retention (keep the newest N per series, drop
+snapshots older than a cutoff) rewrites the file with re-based deltas.
+
+Recording and pruning hold an flock on <store>.lock and re-read the file
+first, so runs sharing the store never reuse a hash id or rewrite away a
+snapshot another run just appended.
+
+    python scripts/snapshot_store.py list
+    python scripts/snapshot_store.py diff NAME_A NAME_B
+    python scripts/snapshot_store.py prune --keep-last 10 --max-age-days 90
+    python scripts/snapshot_store.py import _codex_sync/preflight_checksums.json
+"""
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from link_audit_cache import exclusive_lock
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_STORE_PATH = REPO_ROOT / "_codex_sync" / "snapshots" / "snapshots.jsonl"
+DEFAULT_KEYFRAME_EVERY = 16
+DEFAULT_KEEP_LAST = 20
+# Retention runs once a series holds this many snapshots beyond keep_last, so
+# the file is rewritten occasionally rather than on every record.
+PRUNE_SLACK = 10
+TIMESTAMP_SUFFIX_RE = re.compile(r"_\d{4}-\d{2}-\d{2}T[\d:]+Z?$")
+
+
+@dataclass
+class SnapshotEntry:
+    name: str
+    series: str
+    created_at: str
+    keyframe: bool
+    changes: Dict[str, int] = field(default_factory=dict)
+    removed: List[str] = field(default_factory=list)
+    prev: Optional[int] = None  # index of the previous entry in the same series
+
+
+@dataclass
+class SnapshotDiff:
+    added: Dict[str, str]
+    removed: Dict[str, str]
+    changed: Dict[str, Tuple[str, str]]
+
+    def counts(self) -> Dict[str, int]:
+        return {"added": len(self.added), "removed": len(self.removed), "changed": len(self.changed)}
+
+
+def series_for(name: str) -> str:
+    """'infoicon_audit_preflight_2025-10-19T02:48:08Z' -> 'infoicon_audit_preflight'."""
+    return TIMESTAMP_SUFFIX_RE.sub("", name) or name
+
+
+def utc_now() -> str:
+    return dt.datetime.now(dt.timezone.utc).replace(microsecond=0).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class SnapshotStore:
+    """Named checksum snapshots grouped into series; the last snapshot with a name wins."""
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_STORE_PATH,
+        keyframe_every: int = DEFAULT_KEYFRAME_EVERY,
+        keep_last: int = DEFAULT_KEEP_LAST,
+    ) -> None:
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(f"{self.path.name}.lock")
+        self.keyframe_every = max(keyframe_every, 1)
+        self.keep_last = keep_last
+        self._reset()
+
+    def _reset(self) -> None:
+        self.hashes: List[str] = []
+        self._hash_ids: Dict[str, int] = {}
+        self.entries: List[SnapshotEntry] = []
+        self._by_name: Dict[str, int] = {}
+        self._last_in_series: Dict[str, int] = {}
+        self._memo: Dict[int, Dict[str, str]] = {}
+
+    def load(self) -> "SnapshotStore":
+        self._reset()
+        if not self.path.is_file():
+            return self
+        with self.path.open(encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    item = json.loads(line)
+                except ValueError:
+                    continue  # torn final line from an interrupted write
+                if "h" in item:
+                    self._add_hash(item["sha256"], item["h"])
+                elif "snapshot" in item:
+                    self._add_entry(SnapshotEntry(
+                        name=item["snapshot"],
+                        series=item.get("series") or series_for(item["snapshot"]),
+                        created_at=item.get("created_at", ""),
+                        keyframe=bool(item.get("keyframe")),
+                        changes=item.get("set", {}),
+                        removed=item.get("del", []),
+                    ))
+        return self
+
+    def _add_hash(self, digest: str, hash_id: int) -> None:
+        while len(self.hashes) <= hash_id:
+            self.hashes.append("")
+        self.hashes[hash_id] = digest
+        self._hash_ids[digest] = hash_id
+
+    def _add_entry(self, entry: SnapshotEntry) -> int:
+        index = len(self.entries)
+        entry.prev = self._last_in_series.get(entry.series)
+        self.entries.append(entry)
+        self._by_name[entry.name] = index
+        self._last_in_series[entry.series] = index
+        return index
+
+    # -- reading -----------------------------------------------------------
+
+    def names(self, series: Optional[str] = None) -> List[str]:
+        """Snapshot names in the order they were recorded."""
+        live = sorted(self._by_name.values())
+        return [self.entries[i].name for i in live if series is None or self.entries[i].series == series]
+
+    def series(self) -> List[str]:
+        return sorted(self._last_in_series)
+
+    def latest(self, series: str) -> Optional[str]:
+        index = self._last_in_series.get(series)
+        return None if index is None else self.entries[index].name
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._by_name
+
+    def get(self, name: str) -> Dict[str, str]:
+        """The full path -> sha256 map of a snapshot."""
+        if name not in self._by_name:
+            raise KeyError(name)
+        return dict(self._materialize(self._by_name[name]))
+
+    def _materialize(self, index: int) -> Dict[str, str]:
+        cached = self._memo.get(index)
+        if cached is not None:
+            return cached
+        chain = []
+        cursor: Optional[int] = index
+        base: Dict[str, str] = {}
+        while cursor is not None:
+            if cursor in self._memo:
+                base = self._memo[cursor]
+                break
+            chain.append(cursor)
+            if self.entries[cursor].keyframe:
+                break
+            cursor = self.entries[cursor].prev
+        state = dict(base)
+        for position in reversed(chain):
+            entry = self.entries[position]
+            if entry.keyframe:
+                state = {}
+            for path in entry.removed:
+                state.pop(path, None)
+            for path, hash_id in entry.changes.items():
+                state[path] = self.hashes[hash_id]
+        self._remember(index, state)
+        return state
+
+    def _remember(self, index: int, state: Dict[str, str]) -> None:
+        # Keep only the newest materialisation per series; the next record builds on it.
+        series = self.entries[index].series
+        self._memo = {k: v for k, v in self._memo.items() if self.entries[k].series != series}
+        self._memo[index] = state
+
+    def diff(self, old: str, new: str) -> SnapshotDiff:
+        """What changed from snapshot ``old`` to snapshot ``new``.
+
+        Within a series only the paths touched by the deltas in between are
+        compared; otherwise both maps are compared in full.
+        """
+        a, b = self._by_name[old], self._by_name[new]
+        old_map, new_map = self._materialize(a), self._materialize(b)
+        touched = self._touched_between(a, b)
+        candidates: Iterable[str] = touched if touched is not None else set(old_map) | set(new_map)
+        added: Dict[str, str] = {}
+        removed: Dict[str, str] = {}
+        changed: Dict[str, Tuple[str, str]] = {}
+        for path in sorted(candidates):
+            before, after = old_map.get(path), new_map.get(path)
+            if before == after:
+                continue
+            if before is None:
+                added[path] = after  # type: ignore[assignment]
+            elif after is None:
+                removed[path] = before
+            else:
+                changed[path] = (before, after)
+        return SnapshotDiff(added, removed, changed)
+
+    def _touched_between(self, a: int, b: int) -> Optional[set]:
+        if self.entries[a].series != self.entries[b].series or a > b:
+            return None
+        touched: set = set()
+        cursor: Optional[int] = b
+        while cursor is not None and cursor != a:
+            entry = self.entries[cursor]
+            if entry.keyframe:
+                return None
+            touched.update(entry.changes)
+            touched.update(entry.removed)
+            cursor = entry.prev
+        return touched if cursor == a else None
+
+    # -- writing -----------------------------------------------------------
+
+    def record(
+        self,
+        name: str,
+        checksums: Dict[str, str],
+        series: Optional[str] = None,
+        created_at: Optional[str] = None,
+    ) -> str:
+        """Append a snapshot, as a delta against the series' previous one when possible."""
+        series = series or series_for(name)
+        with exclusive_lock(self.lock_path):
+            self.load()
+            self._record(name, series, created_at, checksums)
+            if self.keep_last > 0 and len(self.names(series)) > self.keep_last + PRUNE_SLACK:
+                self._prune(keep_last=self.keep_last, series=series)
+        return name
+
+    def _record(self, name: str, series: str, created_at: Optional[str], checksums: Dict[str, str]) -> None:
+        entry = self._encode(name, series, created_at or utc_now(), checksums, self._last_in_series.get(series))
+        lines: List[str] = []
+        for path, digest in checksums.items():
+            if path in entry.changes and digest not in self._hash_ids:
+                self._add_hash(digest, len(self.hashes))
+                lines.append(json.dumps({"h": self._hash_ids[digest], "sha256": digest}))
+            if path in entry.changes:
+                entry.changes[path] = self._hash_ids[digest]
+        lines.append(self._entry_line(entry))
+        self._append(lines)
+        self._remember(self._add_entry(entry), dict(checksums))
+
+    def _encode(
+        self, name: str, series: str, created_at: str, checksums: Dict[str, str], prev: Optional[int]
+    ) -> SnapshotEntry:
+        # Changes hold placeholder ids until the caller interns the hashes.
+        depth = 0
+        cursor = prev
+        while cursor is not None and not self.entries[cursor].keyframe:
+            depth += 1
+            cursor = self.entries[cursor].prev
+        if prev is None or depth + 1 >= self.keyframe_every:
+            return SnapshotEntry(name, series, created_at, True, {path: -1 for path in checksums})
+        previous = self._materialize(prev)
+        changes = {path: -1 for path, digest in checksums.items() if previous.get(path) != digest}
+        removed = sorted(path for path in previous if path not in checksums)
+        return SnapshotEntry(name, series, created_at, False, changes, removed)
+
+    @staticmethod
+    def _entry_line(entry: SnapshotEntry) -> str:
+        payload: Dict[str, object] = {
+            "snapshot": entry.name,
+            "series": entry.series,
+            "created_at": entry.created_at,
+            "keyframe": entry.keyframe,
+            "set": dict(sorted(entry.changes.items())),
+        }
+        if entry.removed:
+            payload["del"] = entry.removed
+        return json.dumps(payload, separators=(",", ":"))
+
+    def _append(self, lines: List[str]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        prefix = ""
+        if self.path.is_file() and self.path.stat().st_size:
+            with self.path.open("rb") as handle:
+                handle.seek(-1, os.SEEK_END)
+                if handle.read(1) != b"\n":
+                    prefix = "\n"  # seal a torn line so the next record parses
+        with self.path.open("a", encoding="utf-8") as handle:
+            handle.write(prefix + "".join(line + "\n" for line in lines))
+
+    def prune(
+        self,
+        keep_last: Optional[int] = None,
+        max_age_days: Optional[float] = None,
+        series: Optional[str] = None,
+    ) -> int:
+        """Evict snapshots beyond ``keep_last`` per series or older than ``max_age_days``.
+
+        Superseded names and unreferenced hashes are dropped as well; the
+        survivors are rewritten with fresh keyframes and deltas. Returns the
+        number of snapshots evicted.
+        """
+        with exclusive_lock(self.lock_path):
+            self.load()
+            return self._prune(keep_last, max_age_days, series)
+
+    def _prune(
+        self,
+        keep_last: Optional[int] = None,
+        max_age_days: Optional[float] = None,
+        series: Optional[str] = None,
+    ) -> int:
+        survivors = [self.entries[i] for i in sorted(self._by_name.values())]
+        kept: List[SnapshotEntry] = []
+        evicted = 0
+        cutoff = None
+        if max_age_days is not None:
+            cutoff = (dt.datetime.now(dt.timezone.utc) - dt.timedelta(days=max_age_days)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        per_series: Dict[str, List[SnapshotEntry]] = {}
+        for entry in survivors:
+            per_series.setdefault(entry.series, []).append(entry)
+        doomed = set()
+        for name, group in per_series.items():
+            if series is not None and name != series:
+                continue
+            if keep_last is not None and keep_last >= 0 and len(group) > keep_last:
+                doomed.update(id(entry) for entry in group[:len(group) - keep_last])
+            if cutoff is not None:
+                doomed.update(id(entry) for entry in group if entry.created_at and entry.created_at < cutoff)
+        for entry in survivors:
+            if id(entry) in doomed:
+                evicted += 1
+            else:
+                kept.append(entry)
+        self._rewrite(kept)
+        return evicted
+
+    def _rewrite(self, kept: List[SnapshotEntry]) -> None:
+        maps = [(entry, self._materialize(self._by_name[entry.name])) for entry in kept]
+        fresh = SnapshotStore(self.path, self.keyframe_every, self.keep_last)
+        lines: List[str] = []
+        for entry, checksums in maps:
+            encoded = fresh._encode(entry.name, entry.series, entry.created_at, checksums,
+                                    fresh._last_in_series.get(entry.series))
+            for path in encoded.changes:
+                digest = checksums[path]
+                if digest not in fresh._hash_ids:
+                    fresh._add_hash(digest, len(fresh.hashes))
+                    lines.append(json.dumps({"h": fresh._hash_ids[digest], "sha256": digest}))
+                encoded.changes[path] = fresh._hash_ids[digest]
+            lines.append(fresh._entry_line(encoded))
+            fresh._remember(fresh._add_entry(encoded), checksums)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            handle.write("".join(line + "\n" for line in lines))
+        os.replace(tmp_path, self.path)
+        self.hashes, self._hash_ids = fresh.hashes, fresh._hash_ids
+        self.entries, self._by_name = fresh.entries, fresh._by_name
+        self._last_in_series, self._memo = fresh._last_in_series, {}
+
+    def import_json(self, path: Path) -> int:
+        """Record every map of a legacy preflight_checksums.json style file."""
+        with Path(path).open(encoding="utf-8") as handle:
+            data = json.load(handle)
+        imported = 0
+        for name, checksums in data.items():
+            if isinstance(checksums, dict) and name not in self:
+                match = re.search(r"(\d{4}-\d{2}-\d{2}T[\d:]+Z?)$", name)
+                self.record(name, checksums, created_at=match.group(1) if match else None)
+                imported += 1
+        return imported
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect and maintain the checksum snapshot store.")
+    parser.add_argument("--store", default=str(DEFAULT_STORE_PATH), help="Path to the snapshot JSONL file.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="List snapshots with their size and delta.")
+    diff = sub.add_parser("diff", help="Show paths added, removed or changed between two snapshots.")
+    diff.add_argument("old")
+    diff.add_argument("new")
+    prune = sub.add_parser("prune", help="Apply retention and compact the store.")
+    prune.add_argument("--keep-last", type=int, default=DEFAULT_KEEP_LAST, help="Snapshots kept per series.")
+    prune.add_argument("--max-age-days", type=float, help="Also drop snapshots older than this.")
+    prune.add_argument("--series", help="Only prune this series.")
+    importer = sub.add_parser("import", help="Import a legacy checksum JSON (name -> {path: sha256}).")
+    importer.add_argument("json_path")
+    args = parser.parse_args(argv)
+
+    store = SnapshotStore(Path(args.store)).load()
+    if args.command == "list":
+        for name in store.names():
+            entry = store.entries[store._by_name[name]]
+            kind = "keyframe" if entry.keyframe else f"+{len(entry.changes)} -{len(entry.removed)}"
+            print(f"{name}\t{entry.series}\t{entry.created_at}\t{len(store.get(name))} files\t{kind}")
+    elif args.command == "diff":
+        result = store.diff(args.old, args.new)
+        for path in result.added:
+            print(f"A {path}")
+        for path in result.removed:
+            print(f"D {path}")
+        for path in result.changed:
+            print(f"M {path}")
+        counts = result.counts()
+        print(f"[OK] added={counts['added']} removed={counts['removed']} changed={counts['changed']}")
+    elif args.command == "prune":
+        evicted = store.prune(keep_last=args.keep_last, max_age_days=args.max_age_days, series=args.series)
+        print(f"[OK] Evicted {evicted} snapshots; {len(store.names())} remain in {store.path}")
+    elif args.command == "import":
+        imported = store.import_json(Path(args.json_path))
+        print(f"[OK] Imported {imported} snapshots into {store.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
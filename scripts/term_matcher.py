@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Aho–Corasick multi-term matcher shared by the site audit scripts.
+
+The automaton is compiled once from a term list and then reports every term
+occurring in a text in a single left-to-right pass, instead of one substring
+scan per term. Matching is exact on the characters given; callers lower-case
+both the terms and the text when they want case-insensitive hits.
+
+TermPattern answers the narrower question "which terms occur at all" with the
+scan running inside the re engine, which is much faster on large texts when
+offsets are not needed.
+"""
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class TermAutomaton:
+    """Compiled matcher for a fixed list of terms.
+
+    Term ids are positions in ``terms`` (duplicates and empty strings are
+    dropped, keeping the first occurrence), so callers can map hits back to
+    their own ordering. With ``word_boundaries`` a hit only counts when the
+    characters around it are not word characters, like ``\\b`` in a regex;
+    otherwise any substring occurrence counts, matching ``term in text``.
+    """
+
+    def __init__(self, terms: Iterable[str], word_boundaries: bool = False) -> None:
+        self.word_boundaries = word_boundaries
+        self.terms: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        seen: Set[str] = set()
+        for term in terms:
+            if not term or term in seen:
+                continue
+            seen.add(term)
+            self._insert(term, len(self.terms))
+            self.terms.append(term)
+        self._link()
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def _insert(self, term: str, term_id: int) -> None:
+        state = 0
+        for ch in term:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] = self._out[state] + (term_id,)
+
+    def _link(self) -> None:
+        # Breadth-first so each failure target is finalised before its children use it.
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                if self._out[self._fail[nxt]]:
+                    self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str, word_boundaries: Optional[bool] = None) -> Iterator[Tuple[int, int, int]]:
+        """Yield ``(start, end, term_id)`` for every occurrence, ordered by end offset.
+
+        ``word_boundaries`` overrides the automaton's setting for this call.
+        """
+        goto, fail, out, terms = self._goto, self._fail, self._out, self.terms
+        root = goto[0]
+        check = self.word_boundaries if word_boundaries is None else word_boundaries
+        size = len(text)
+        state = 0
+        for index, ch in enumerate(text):
+            if state == 0 and ch not in root:
+                continue
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            end = index + 1
+            for term_id in out[state]:
+                start = end - len(terms[term_id])
+                if check and not self.is_bounded(text, start, end, size):
+                    continue
+                yield start, end, term_id
+
+    @staticmethod
+    def is_bounded(text: str, start: int, end: int, size: Optional[int] = None) -> bool:
+        """Whether ``text[start:end]`` is not glued to word characters on either side."""
+        size = len(text) if size is None else size
+        if start > 0 and _is_word_char(text[start]) and _is_word_char(text[start - 1]):
+            return False
+        if end < size and _is_word_char(text[end - 1]) and _is_word_char(text[end]):
+            return False
+        return True
+
+    def find_ids(self, text: str) -> Set[int]:
+        """Ids of the distinct terms occurring in ``text``."""
+        return {term_id for _, _, term_id in self.iter_matches(text)}
+
+    def occurrences(self, text: str) -> Dict[int, List[int]]:
+        """Start offsets of every substring occurrence of each term, ignoring word boundaries."""
+        found: Dict[int, List[int]] = {}
+        for start, _, term_id in self.iter_matches(text, word_boundaries=False):
+            found.setdefault(term_id, []).append(start)
+        return found
+
+    def first_offsets(self, text: str) -> Dict[int, int]:
+        """Start offset of the first occurrence of each matching term."""
+        first: Dict[int, int] = {}
+        for start, _, term_id in self.iter_matches(text):
+            # Hits arrive by end offset, so a term's first hit is also its leftmost.
+            first.setdefault(term_id, start)
+        return first
+
+
+class TermPattern:
+    """Regex-compiled presence matcher using the same term ids as TermAutomaton.
+
+    The alternation sits in a zero-width lookahead, so it is tried at every
+    offset and a long hit never hides a term starting inside it. Terms sharing
+    a start offset with the reported (longest) hit are its prefixes, which are
+    precomputed, so ``find_ids`` is exact for plain substring matching.
+    """
+
+    def __init__(self, terms: Iterable[str]) -> None:
+        self.terms: List[str] = []
+        seen: Set[str] = set()
+        for term in terms:
+            if not term or term in seen:
+                continue
+            seen.add(term)
+            self.terms.append(term)
+        self._ids = {term: term_id for term_id, term in enumerate(self.terms)}
+        self._prefixes: List[Tuple[int, ...]] = [
+            tuple(other for other, shorter in enumerate(self.terms) if other != term_id and term.startswith(shorter))
+            for term_id, term in enumerate(self.terms)
+        ]
+        self._pattern: Optional[re.Pattern[str]] = None
+        if self.terms:
+            longest_first = sorted(self.terms, key=len, reverse=True)
+            self._pattern = re.compile("(?=(%s))" % "|".join(re.escape(term) for term in longest_first))
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def find_ids(self, text: str) -> Set[int]:
+        """Ids of the distinct terms occurring in ``text``."""
+        found: Set[int] = set()
+        if self._pattern is None:
+            return found
+        total = len(self.terms)
+        for match in self._pattern.finditer(text):
+            term_id = self._ids[match.group(1)]
+            found.add(term_id)
+            found.update(self._prefixes[term_id])
+            if len(found) == total:
+                break
+        return found
@@ -0,0 +1,79 @@
+"""ChecksumCache invalidation: every stat change re-hashes, nothing else does.
+
+    python -m pytest scripts/test_checksum_cache.py
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+from pathlib import Path
+
+from checksum_cache import RACY_WINDOW_NS, ChecksumCache
+
+OLD_NS = time.time_ns() - 10 * RACY_WINDOW_NS
+
+
+def write(path: Path, data: bytes, mtime_ns: int = OLD_NS) -> Path:
+    path.write_bytes(data)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path
+
+
+def run(cache_path: Path, paths):
+    cache = ChecksumCache(cache_path).load()
+    digests = cache.hash_files(paths)
+    cache.save()
+    return cache, digests
+
+
+def test_unchanged_files_are_not_rehashed(tmp_path):
+    paths = [write(tmp_path / f"f{i}.bin", bytes([i]) * (i + 1)) for i in range(5)]
+    cache_path = tmp_path / "checksums.json"
+    cold, digests = run(cache_path, paths + [tmp_path / "missing.bin", tmp_path])
+    assert (cold.hits, cold.misses) == (0, 5)
+    assert list(digests) == paths
+    assert digests == {path: hashlib.sha256(path.read_bytes()).hexdigest() for path in paths}
+    warm, again = run(cache_path, paths)
+    assert (warm.hits, warm.misses) == (5, 0)
+    assert again == digests
+
+
+def test_any_stat_change_invalidates(tmp_path):
+    cache_path = tmp_path / "checksums.json"
+    sized = write(tmp_path / "sized.txt", b"one")
+    touched = write(tmp_path / "touched.txt", b"two")
+    replaced = write(tmp_path / "replaced.txt", b"six")
+    run(cache_path, [sized, touched, replaced])
+
+    write(sized, b"three")  # size changes
+    write(touched, b"TWO", OLD_NS + 1_000_000)  # same size, new mtime
+    inode = replaced.stat().st_ino
+    write(tmp_path / "swap.txt", b"SIX")  # same size and mtime, new inode
+    os.replace(tmp_path / "swap.txt", replaced)
+    assert replaced.stat().st_ino != inode
+
+    cache, digests = run(cache_path, [sized, touched, replaced])
+    assert (cache.hits, cache.misses) == (0, 3)
+    assert digests == {path: hashlib.sha256(path.read_bytes()).hexdigest() for path in (sized, touched, replaced)}
+
+
+def test_racy_and_deleted_files_are_not_kept(tmp_path):
+    cache_path = tmp_path / "checksums.json"
+    fresh = write(tmp_path / "fresh.txt", b"just written", time.time_ns())
+    doomed = write(tmp_path / "doomed.txt", b"gone soon")
+    cache, _ = run(cache_path, [fresh, doomed])
+    assert set(ChecksumCache(cache_path).load().entries) == {os.fspath(doomed)}
+
+    doomed.unlink()
+    cache, digests = run(cache_path, [fresh, doomed])
+    assert cache.misses == 1 and list(digests) == [fresh]
+    assert ChecksumCache(cache_path).load().entries == {}
+
+
+def test_without_a_path_nothing_is_written(tmp_path):
+    paths = [write(tmp_path / f"f{i}.bin", b"x" * i) for i in range(3)]
+    cache = ChecksumCache(None).load()
+    assert len(cache.hash_files(paths)) == 3
+    cache.save()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["f0.bin", "f1.bin", "f2.bin"]
@@ -0,0 +1,93 @@
+"""generate_homepage_audit against the frozen original in homepage_audit_baseline.py.
+
+    python -m pytest scripts/test_generate_homepage_audit.py
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+import generate_homepage_audit as homepage_audit
+import homepage_audit_baseline as baseline
+from doc_cache import DocumentCache
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_BASE = "https://thetankguide.com/"
+PAGES = sorted(REPO_ROOT.glob("*.html")) + sorted((REPO_ROOT / "journal").glob("*.html"))[:5]
+
+
+def page_id(path: Path) -> str:
+    return str(path.relative_to(REPO_ROOT))
+
+
+def parse(html: str) -> homepage_audit.Element:
+    builder = homepage_audit.TreeBuilder()
+    builder.feed(html)
+    builder.finish()
+    return builder.root
+
+
+@pytest.mark.parametrize("path", PAGES, ids=page_id)
+def test_collect_page_matches_the_per_collector_walks(path):
+    html = path.read_text(encoding="utf-8")
+    root = parse(html)
+    head, body = root.find_first("head"), root.find_first("body")
+    if head is None or body is None:
+        pytest.skip("page has no head or body")
+    assert homepage_audit.collect_page(html, path, head, body, DEFAULT_BASE) == baseline.page_inventory(html, path, DEFAULT_BASE)
+
+
+UNTERMINATED = {
+    "entity": "<html><head><title>Tap water</title></head><body><p>Dechlorinate tap water &amp",
+    "script": "<html><head><title>Tap water</title></head><body><p>Dechlorinate.</p><script>var ppm = 4 < 5",
+    "style": "<html><head><title>Tap water</title></head><body><p>Dechlorinate.</p><style>p { color: red",
+}
+
+
+@pytest.mark.parametrize("html", UNTERMINATED.values(), ids=UNTERMINATED.keys())
+def test_trailing_data_at_eof_stays_unparsed_like_the_original(html, tmp_path):
+    path = tmp_path / "page.html"
+    path.write_text(html, encoding="utf-8")
+    expected = baseline.page_inventory(html, path, DEFAULT_BASE)
+    cached = DocumentCache(tmp_path / "documents")
+    for _ in range(2):  # miss, then hit
+        builder = cached.load(path).replay(homepage_audit.TreeBuilder(), flush=False)
+        builder.finish()
+        for root in (parse(html), builder.root):
+            head, body = root.find_first("head"), root.find_first("body")
+            assert homepage_audit.collect_page(html, path, head, body, DEFAULT_BASE) == expected
+    assert cached.hits == 1
+
+
+@pytest.mark.parametrize("path", PAGES, ids=page_id)
+def test_tag_index_lookups_match_tree_walks(path):
+    root = parse(path.read_text(encoding="utf-8"))
+    elements = list(root.iter())
+    for element in elements[::25] + [root]:
+        descendants = [node for node in element.iter() if node is not element]
+        for tag in ("a", "img", "script", "link", "meta", "h2", "p", "title", "body"):
+            expected = [node for node in descendants if node.tag == tag]
+            assert element.find_all(tag) == expected
+            assert element.find_first(tag) is (expected[0] if expected else None)
+
+
+@pytest.mark.parametrize("path", PAGES, ids=page_id)
+def test_streaming_text_blocks_match_recursive(path):
+    html = path.read_text(encoding="utf-8")
+    body = parse(html).find_first("body")
+    if body is None:
+        pytest.skip("page has no body")
+    parser = baseline.TreeBuilder()
+    parser.feed(html)
+    assert homepage_audit.text_blocks(body) == baseline.text_blocks(parser.root.find_first("body"))
+
+
+def test_deeply_nested_page_does_not_recurse():
+    depth = 20000
+    opening = "".join(f'<div class="level l{level}"><p>Level {level} text about nitrate.</p>' for level in range(depth))
+    body = parse(f"<html><body>{opening}{'</div>' * depth}</body></html>").find_first("body")
+    blocks = homepage_audit.text_blocks(body)
+    assert len(blocks) == depth
+    assert blocks[-1] == ("TEXT", f"Level {depth - 1} text about nitrate.")
+    assert body.text_content()
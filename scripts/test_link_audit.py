@@ -0,0 +1,259 @@
+"""link_audit.py against a local stub HTTP server.
+
+    python -m pytest scripts/test_link_audit.py
+"""
+from __future__ import annotations
+
+import asyncio
+import csv
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pytest
+
+import link_audit
+from link_audit_cache import ResponseCache
+from shortlink_store import ShortlinkStore
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, url: str = "https://a.example/", headers: Optional[Dict[str, str]] = None) -> None:
+        self.status_code = status_code
+        self.url = url
+        self.headers = headers or {}
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeSession:
+    """Hands out ``responses`` in order, one per get()."""
+
+    def __init__(self, responses: List[FakeResponse]) -> None:
+        self.responses = responses
+        self.calls = 0
+
+    def get(self, url: str, **kwargs: object) -> FakeResponse:
+        self.calls += 1
+        return self.responses[self.calls - 1]
+
+
+class RecordingLimiter(link_audit.HostRateLimiter):
+    def __init__(self) -> None:
+        super().__init__(0)
+        self.hosts: List[str] = []
+
+    def acquire(self, host: str) -> None:
+        self.hosts.append(host)
+        super().acquire(host)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves /s/<n> as a shortlink redirect and /dp/<n> as a product page.
+
+    /x/<n> redirects to the same product on http://localhost:<port>, a second host.
+    """
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server API
+        if self.path.startswith(("/s/", "/x/")):
+            host = f"http://localhost:{self.server.server_address[1]}" if self.path.startswith("/x/") else ""
+            self.send_response(302)
+            self.send_header("Location", f"{host}/dp/{self.path[3:]}")
+            self.end_headers()
+            return
+        body = (
+            "<html><head><title>Amazon.com : Stub Product {0}</title></head>"
+            "<body>{1}</body></html>"
+        ).format(self.path.rsplit("/", 1)[-1], "x" * 4096).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        return
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    # Reports are written relative to the working directory.
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def build_rows(base_url: str, count: int) -> List[Dict[str, str]]:
+    rows = []
+    for index in range(count):
+        row = link_audit.ensure_default_keys({})
+        row["Category"] = "test"
+        row["Product_Name"] = f"Stub Product {index}"
+        row["Amazon_Link"] = f"{base_url}/s/{index}"
+        rows.append(row)
+    return rows
+
+
+def write_input(rows: List[Dict[str, str]]) -> None:
+    with open("in.csv", "w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def read_report() -> List[Dict[str, str]]:
+    with open("reports/link_audit.csv", newline="", encoding="utf-8") as handle:
+        return list(csv.DictReader(handle))
+
+
+AUDIT_ARGS = ["--input", "in.csv", "--sleep", "0", "--cache-dir", "cache", "--shortlink-store", "cache/shortlinks.jsonl"]
+
+
+def audit(*extra: str) -> List[Dict[str, str]]:
+    link_audit.main([*AUDIT_ARGS, *extra])
+    return read_report()
+
+
+def test_concurrent_engine_keeps_input_order(base_url):
+    rows = build_rows(base_url, 30)
+    sequential = link_audit.audit_rows(rows, link_audit._get_session())
+    concurrent = asyncio.run(link_audit.audit_rows_async(rows, 8))
+    assert concurrent == sequential
+    assert [r["Product_Name"] for r in concurrent] == [r["Product_Name"] for r in rows]
+
+
+def test_every_redirect_hop_takes_a_token_from_its_own_host(base_url):
+    port = base_url.rsplit(":", 1)[1]
+    limiter = RecordingLimiter()
+    resp = link_audit.limited_get(link_audit._get_session(), f"{base_url}/x/5", limiter, timeout=5)
+    assert resp.url == f"http://localhost:{port}/dp/5"
+    assert "Stub Product 5" in resp.text
+    assert limiter.hosts == [f"127.0.0.1:{port}", f"localhost:{port}"]
+
+
+def test_throttled_responses_are_closed_before_the_retry():
+    session = FakeSession([FakeResponse(503, headers={"Retry-After": "0"}), FakeResponse(200)])
+    resp = link_audit.limited_get(session, "https://a.example/", link_audit.HostRateLimiter(0), stream=True)
+    throttled, ok = session.responses
+    assert resp is ok and not ok.closed
+    assert throttled.closed and session.calls == 2
+
+
+@pytest.mark.parametrize("status, final_url, stored", [
+    (200, "https://www.amazon.com/dp/B000TEST01?th=1", True),
+    (200, "https://www.amazon.com/ap/signin?openid.return_to=x", False),
+    (404, "https://www.amazon.com/dp/B000TEST01", False),
+])
+def test_only_product_resolutions_are_stored_for_good(tmp_path, status, final_url, stored):
+    shortlinks = ShortlinkStore(tmp_path / "shortlinks.jsonl").load()
+    cache = ResponseCache(tmp_path).load()
+    session = FakeSession([FakeResponse(status, final_url)])
+    expanded = link_audit.expand_url("https://amzn.to/abc123", session, cache=cache, shortlinks=shortlinks)
+    assert expanded == (final_url, "www.amazon.com", "OK")
+    assert (ShortlinkStore(tmp_path / "shortlinks.jsonl").load().get("https://amzn.to/abc123") is not None) == stored
+    assert (cache.resolve("https://amzn.to/abc123") is None) == stored
+
+
+def test_concurrent_csv_matches_sequential(base_url, workdir):
+    write_input(build_rows(base_url, 30))
+    sequential = audit("--no-cache")
+    assert len(sequential) == 30
+    assert audit("--no-cache", "--concurrency", "8") == sequential
+
+
+def test_offline_run_matches_the_cached_one(base_url, workdir):
+    write_input(build_rows(base_url, 10))
+    online = audit()
+    assert audit("--offline") == online
+
+
+def test_resume_after_time_budget_finishes_the_audit(base_url, workdir):
+    write_input(build_rows(base_url, 12))
+    full = audit("--no-cache")
+    partial = audit("--no-cache", "--time-budget", "1e-9")
+    assert 0 < len(partial) < len(full)
+    assert audit("--no-cache", "--resume") == full
+
+
+def test_changed_only_reaudits_changed_rows(base_url, workdir):
+    rows = build_rows(base_url, 21)
+    write_input(rows)
+    full = audit()
+    assert audit("--changed-only", "--limit", "3", "--stale-sample", "0") == full
+    assert audit("--changed-only", "--time-budget", "1e-9", "--stale-sample", "5") == full
+    assert audit("--changed-only", "--stale-sample", "0") == full
+
+    rows[4]["Product_Name"] = "Stub Product renamed"
+    write_input(rows)
+    updated = audit("--changed-only", "--stale-sample", "0")
+    assert [r["Product_Name"] for r in updated] == [r["Product_Name"] for r in rows]
+    assert updated[:4] == full[:4] and updated[5:] == full[5:]
+
+
+def test_merged_shards_match_a_single_run(base_url, workdir):
+    write_input(build_rows(base_url, 20))
+    full = audit("--no-cache")
+    for index in (1, 2, 3):
+        audit("--no-cache", "--shard", f"{index}/3")
+    link_audit.main(["merge", "--cache-dir", "cache"])
+    assert read_report() == full
+    summary = Path("reports/link_audit.txt").read_text(encoding="utf-8")
+    assert "Total audited: 20" in summary
+    assert "rows per shard: 1/3=7, 2/3=7, 3/3=6" in summary
+    assert "Incomplete" not in summary
+
+
+def test_merge_reports_rows_no_shard_produced(base_url, workdir):
+    write_input(build_rows(base_url, 20))
+    for extra in (["1/3"], ["2/3"], ["3/3", "--limit", "3"]):  # rows 11, 14 and 17 are left for later
+        link_audit.main([*AUDIT_ARGS, "--no-cache", "--shard", *extra])
+    link_audit.main(["merge", "--cache-dir", "cache"])
+    summary = Path("reports/link_audit.txt").read_text(encoding="utf-8")
+    assert "Total audited: 17" in summary
+    assert "Incomplete: 3 of 20 rows missing (shards 3/3)" in summary
+
+    link_audit.main([*AUDIT_ARGS, "--no-cache", "--shard", "3/3", "--resume"])
+    link_audit.main(["merge", "--cache-dir", "cache"])
+    assert "Incomplete" not in Path("reports/link_audit.txt").read_text(encoding="utf-8")
+
+
+def test_concurrent_shards_share_one_cache(base_url, workdir):
+    write_input(build_rows(base_url, 30))
+    full = audit("--no-cache")
+    shards = [
+        subprocess.Popen([sys.executable, link_audit.__file__, *AUDIT_ARGS, "--shard", f"{index}/3"], stdout=subprocess.DEVNULL)
+        for index in (1, 2, 3)
+    ]
+    assert [shard.wait() for shard in shards] == [0, 0, 0]
+    link_audit.main(["merge", "--cache-dir", "cache"])
+    assert read_report() == full
+    # Every shard's responses survived the concurrent saves.
+    assert audit("--offline") == full
+
+
+def test_response_cache_saves_merge(tmp_path):
+    first = ResponseCache(tmp_path).load()
+    second = ResponseCache(tmp_path).load()
+    first.put("https://a.example/", 200, "https://a.example/", "A")
+    second.put("https://b.example/", 200, "https://b.example/", "B")
+    second.put("https://a.example/", 200, "https://a.example/", "A, refetched")
+    first.save()
+    second.save()
+    first.save()  # an older view saved again must not undo the newer fetch
+    merged = ResponseCache(tmp_path).load()
+    assert sorted(merged.responses) == ["https://a.example/", "https://b.example/"]
+    assert merged.responses["https://a.example/"]["title"] == "A, refetched"
+    assert not list(tmp_path.glob("*.tmp"))
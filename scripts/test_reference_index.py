@@ -0,0 +1,96 @@
+"""ReferenceIndex against one rglob scan per term, and its persisted cache.
+
+    python -m pytest scripts/test_reference_index.py
+"""
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+from typing import List
+
+import trim_recheck_static
+from reference_index import DEFAULT_EXCLUDED, DEFAULT_SUFFIXES, ReferenceIndex
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+OLD_NS = time.time_ns() - 3600 * 1_000_000_000
+
+
+def rglob_references(root: Path, term: str) -> List[str]:
+    """The original find_references: a full rglob and a read of every source file per term."""
+    matches: List[str] = []
+    for file_path in root.rglob("*"):
+        if not file_path.is_file():
+            continue
+        if any(part in DEFAULT_EXCLUDED for part in file_path.parts):
+            continue
+        if file_path.suffix.lower() not in DEFAULT_SUFFIXES:
+            continue
+        try:
+            text = file_path.read_text(encoding="utf-8")
+        except (UnicodeDecodeError, OSError):
+            continue
+        if term in text:
+            matches.append(str(file_path.relative_to(root)))
+    return matches
+
+
+def write(path: Path, text: str, mtime_ns: int = OLD_NS) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def build_tree(root: Path) -> None:
+    write(root / "index.html", '<img src="assets/a.png"><link href="styles/site.css">')
+    write(root / "styles" / "site.css", "body { background: url(assets/b.webp); }")
+    write(root / "js" / "app.js", "load('assets/a.png'); load('assets/c.svg');")
+    write(root / "js" / "deep" / "more.mjs", "export const icon = 'assets/c.svg';")
+    write(root / "notes.txt", "assets/a.png is not a source file")
+    write(root / "node_modules" / "pkg" / "index.js", "assets/a.png")
+    write(root / "_codex_sync" / "report.html", "assets/b.webp")
+    (root / "broken.js").write_bytes(b"\xff\xfe assets/a.png")
+    os.utime(root / "broken.js", ns=(OLD_NS, OLD_NS))
+
+
+def test_references_match_one_rglob_scan_per_term_on_the_site():
+    assets = sorted(str(path.relative_to(REPO_ROOT)) for path in (REPO_ROOT / "assets").rglob("*") if path.is_file())
+    terms = list(dict.fromkeys(trim_recheck_static.REMOVED_ASSETS + assets[:8]))
+    index = ReferenceIndex(REPO_ROOT, terms)
+    assert index.references() == {term: rglob_references(REPO_ROOT, term) for term in index.terms}
+
+
+def test_persisted_index_rereads_only_changed_files(tmp_path):
+    root = tmp_path / "site"
+    build_tree(root)
+    terms = ["assets/a.png", "assets/b.webp", "assets/c.svg", "assets/unused.gif"]
+    cache_path = tmp_path / "cache" / "reference_index.json"
+
+    cold = ReferenceIndex(root, terms, cache_path=cache_path)
+    expected = {term: rglob_references(root, term) for term in terms}
+    assert cold.references() == expected
+    assert cold.files_read == 5
+
+    warm = ReferenceIndex(root, terms, cache_path=cache_path)
+    assert warm.references() == expected
+    assert (warm.files_read, warm.files_reused) == (0, 5)
+
+    write(root / "js" / "app.js", "load('assets/unused.gif');", OLD_NS + 1_000_000)
+    changed = ReferenceIndex(root, terms, cache_path=cache_path)
+    assert changed.references() == {term: rglob_references(root, term) for term in terms}
+    assert (changed.files_read, changed.files_reused) == (1, 4)
+
+    retermed = ReferenceIndex(root, terms[:2], cache_path=cache_path)
+    retermed.references()
+    assert retermed.files_read == 5
+    assert not list(cache_path.parent.glob("*.tmp"))
+
+
+def test_racily_modified_files_are_not_cached(tmp_path):
+    build_tree(tmp_path)
+    write(tmp_path / "fresh.html", '<img src="assets/a.png">', time.time_ns())
+    cache_path = tmp_path / "reference_index.json"
+    ReferenceIndex(tmp_path, ["assets/a.png"], cache_path=cache_path).scan()
+    again = ReferenceIndex(tmp_path, ["assets/a.png"], cache_path=cache_path)
+    assert "fresh.html" in again.scan()
+    assert (again.files_read, again.files_reused) == (1, 5)
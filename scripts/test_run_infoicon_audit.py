@@ -0,0 +1,57 @@
+"""run_infoicon_audit's page cache and output writers.
+
+    python -m pytest scripts/test_run_infoicon_audit.py
+"""
+from __future__ import annotations
+
+import json
+import os
+
+import pytest
+
+from run_infoicon_audit import JsonArrayWriter, PageCache, TermHit, open_record_writer, record_paths, remove_other_formats
+
+HIT = TermHit(key="nitrate", node_index=3, context="...nitrate...", location="paragraph", source="text")
+
+
+def test_page_cache_round_trips_and_keeps_only_listed_pages(tmp_path):
+    path = tmp_path / "cache" / "infoicon_pages.json"
+    cache = PageCache(path, "sig-a").load()
+    cache.put("index.html", "d1", [HIT])
+    cache.put("gone.html", "d2", [])
+    cache.save(["index.html"])
+
+    reloaded = PageCache(path, "sig-a").load()
+    assert reloaded.get("index.html", "d1") == [HIT]
+    assert reloaded.get("index.html", "changed") is None
+    assert reloaded.get("gone.html", "d2") is None
+    assert PageCache(path, "sig-b").load().pages == {}
+    assert [p.name for p in path.parent.iterdir()] == ["infoicon_pages.json"]
+
+
+def test_writers_publish_only_on_success(tmp_path):
+    path = tmp_path / "out.json"
+    path.write_text("previous\n", encoding="utf-8")
+    with pytest.raises(RuntimeError):
+        with JsonArrayWriter(path) as writer:
+            assert writer.tmp_path.name == f".out.json.{os.getpid()}.tmp"
+            writer.write({"n": 1})
+            raise RuntimeError("interrupted")
+    assert path.read_text(encoding="utf-8") == "previous\n"
+
+    items = [{"n": 1}, {"n": [2, 3]}]
+    with JsonArrayWriter(path) as writer:
+        for item in items:
+            writer.write(item)
+    assert path.read_text(encoding="utf-8") == json.dumps(items, indent=2) + "\n"
+    assert [p.name for p in tmp_path.iterdir()] == ["out.json"]
+
+
+@pytest.mark.parametrize("fmt", ["json", "jsonl"])
+def test_only_the_current_format_remains(tmp_path, fmt):
+    for other in ("json", "jsonl"):
+        for path in record_paths(tmp_path, other):
+            with open_record_writer(path, other) as writer:
+                writer.write({"format": other})
+    remove_other_formats(tmp_path, fmt)
+    assert sorted(tmp_path.iterdir()) == sorted(record_paths(tmp_path, fmt))
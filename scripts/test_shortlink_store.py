@@ -0,0 +1,25 @@
+"""ShortlinkStore persistence: only product-page resolutions are kept.
+
+    python -m pytest scripts/test_shortlink_store.py
+"""
+from __future__ import annotations
+
+from shortlink_store import ShortlinkStore
+
+TARGETS = {
+    "https://amzn.to/product": "https://www.amazon.com/dp/B000TEST01",
+    "https://a.co/d/signin": "https://www.amazon.com/ap/signin",
+    "https://amzn.to/dead": None,
+}
+
+
+def test_warm_keeps_only_product_pages(tmp_path):
+    path = tmp_path / "shortlinks.jsonl"
+    store = ShortlinkStore(path).load()
+    stats = store.warm(TARGETS, workers=2, resolver=TARGETS.get)
+    assert stats == {"known": 0, "resolved": 1, "not_product": 1, "failed": 1}
+    assert store.resolve("https://a.co/d/signin", TARGETS.get)["final_url"] == "https://www.amazon.com/ap/signin"
+
+    reloaded = ShortlinkStore(path).load()
+    assert list(reloaded.records) == ["amzn.to/product"]
+    assert reloaded.get("https://amzn.to/product")["asin"] == "B000TEST01"
@@ -0,0 +1,112 @@
+"""SnapshotStore round trips, diffs and retention.
+
+    python -m pytest scripts/test_snapshot_store.py
+"""
+from __future__ import annotations
+
+import random
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+from snapshot_store import PRUNE_SLACK, SnapshotStore
+
+
+def evolve(rng: random.Random, count: int) -> List[Dict[str, str]]:
+    """A sequence of checksum maps where each step adds, drops and edits a few paths."""
+    current = {f"page-{i}.html": f"{i:064x}" for i in range(40)}
+    maps = []
+    for step in range(count):
+        current = dict(current)
+        for path in rng.sample(sorted(current), 3):
+            current[path] = f"{rng.getrandbits(256):064x}"
+        del current[rng.choice(sorted(current))]
+        current[f"new-{step}.html"] = f"{rng.getrandbits(256):064x}"
+        maps.append(current)
+    return maps
+
+
+def name(step: int) -> str:
+    return f"preflight_2025-01-{step + 1:02d}T00:00:00Z"
+
+
+def expected_diff(old: Dict[str, str], new: Dict[str, str]):
+    added = {p: d for p, d in new.items() if p not in old}
+    removed = {p: d for p, d in old.items() if p not in new}
+    changed = {p: (old[p], new[p]) for p in old.keys() & new.keys() if old[p] != new[p]}
+    return added, removed, changed
+
+
+def test_snapshots_round_trip_and_diff(tmp_path):
+    maps = evolve(random.Random(3), 20)
+    store = SnapshotStore(tmp_path / "s.jsonl", keyframe_every=4, keep_last=0).load()
+    for step, checksums in enumerate(maps):
+        store.record(name(step), checksums, created_at=f"2025-01-{step + 1:02d}T00:00:00Z")
+
+    reloaded = SnapshotStore(tmp_path / "s.jsonl").load()
+    assert reloaded.names() == [name(step) for step in range(len(maps))]
+    for step, checksums in enumerate(maps):
+        assert reloaded.get(name(step)) == checksums
+    for old, new in [(0, 1), (2, 7), (5, 19), (19, 3)]:
+        diff = reloaded.diff(name(old), name(new))
+        assert (diff.added, diff.removed, diff.changed) == expected_diff(maps[old], maps[new])
+
+
+def test_prune_keeps_the_latest_snapshots_intact(tmp_path):
+    maps = evolve(random.Random(4), 12)
+    store = SnapshotStore(tmp_path / "s.jsonl", keyframe_every=5, keep_last=0).load()
+    for step, checksums in enumerate(maps):
+        store.record(name(step), checksums, created_at=f"2025-01-{step + 1:02d}T00:00:00Z")
+    store.record("other_2025-02-01T00:00:00Z", maps[0], created_at="2025-02-01T00:00:00Z")
+
+    assert store.prune(keep_last=4, series="preflight") == 8
+    reloaded = SnapshotStore(tmp_path / "s.jsonl").load()
+    assert reloaded.names() == [name(step) for step in range(8, 12)] + ["other_2025-02-01T00:00:00Z"]
+    for step in range(8, 12):
+        assert reloaded.get(name(step)) == maps[step]
+    assert reloaded.get("other_2025-02-01T00:00:00Z") == maps[0]
+    diff = reloaded.diff(name(8), name(11))
+    assert (diff.added, diff.removed, diff.changed) == expected_diff(maps[8], maps[11])
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_record_prunes_automatically_past_the_slack(tmp_path):
+    maps = evolve(random.Random(5), 40)
+    store = SnapshotStore(tmp_path / "s.jsonl", keep_last=5).load()
+    for step, checksums in enumerate(maps):
+        store.record(f"preflight_2025-03-{step // 24 + 1:02d}T{step % 24:02d}:00:00Z", checksums)
+    reloaded = SnapshotStore(tmp_path / "s.jsonl").load()
+    names = reloaded.names("preflight")
+    assert len(names) <= 5 + PRUNE_SLACK
+    assert reloaded.get(names[-1]) == maps[-1]
+
+
+def test_stale_views_do_not_clobber_each_other(tmp_path):
+    maps = evolve(random.Random(6), 3)
+    first = SnapshotStore(tmp_path / "s.jsonl", keep_last=0).load()
+    second = SnapshotStore(tmp_path / "s.jsonl", keep_last=0).load()
+    first.record(name(0), maps[0])
+    second.record("other_2025-02-01T00:00:00Z", maps[1])  # loaded before name(0) existed
+    first.record(name(1), maps[2])
+    second.prune(keep_last=5)
+    reloaded = SnapshotStore(tmp_path / "s.jsonl").load()
+    assert reloaded.names() == [name(0), "other_2025-02-01T00:00:00Z", name(1)]
+    assert [reloaded.get(n) for n in reloaded.names()] == maps
+
+
+def record_series(path: Path, worker: int) -> List[Dict[str, str]]:
+    maps = evolve(random.Random(worker), 15)
+    store = SnapshotStore(path, keyframe_every=4, keep_last=0)
+    for step, checksums in enumerate(maps):
+        store.record(f"worker{worker}_2025-01-{step + 1:02d}T00:00:00Z", checksums)
+    return maps
+
+
+def test_concurrent_writers_share_one_store(tmp_path):
+    path = tmp_path / "s.jsonl"
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        recorded = list(pool.map(record_series, [path] * 4, range(4)))
+    reloaded = SnapshotStore(path).load()
+    for worker, maps in enumerate(recorded):
+        names = reloaded.names(f"worker{worker}")
+        assert [reloaded.get(n) for n in names] == maps
@@ -0,0 +1,109 @@
+"""term_matcher against brute-force substring scans.
+
+    python -m pytest scripts/test_term_matcher.py
+"""
+from __future__ import annotations
+
+import random
+import string
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import pytest
+
+import run_infoicon_audit
+from term_matcher import TermAutomaton, TermPattern
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def brute_force(terms: List[str], text: str, word_boundaries: bool) -> List[Tuple[int, int, int]]:
+    """Every (start, end, term_id), ordered like TermAutomaton.iter_matches."""
+    hits = []
+    for term_id, term in enumerate(terms):
+        start = text.find(term)
+        while start != -1:
+            end = start + len(term)
+            glued = (start > 0 and is_word_char(text[start - 1]) and is_word_char(text[start])) or (
+                end < len(text) and is_word_char(text[end - 1]) and is_word_char(text[end])
+            )
+            if not (word_boundaries and glued):
+                hits.append((end, -len(term), start, term_id))
+            start = text.find(term, start + 1)
+    # At one end offset the automaton reports the longest term first.
+    return [(start, end, term_id) for end, _, start, term_id in sorted(hits)]
+
+
+def random_case(rng: random.Random) -> Tuple[List[str], str]:
+    alphabet = "ab_ ."
+    terms = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 6))]
+    text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+    return list(dict.fromkeys(terms)), text
+
+
+def site_texts() -> List[str]:
+    inventory = run_infoicon_audit.load_inventory(REPO_ROOT)
+    pages = [REPO_ROOT / entry["file"] for entry in inventory if entry["file"].endswith(".html")]
+    return [node.text.lower() for page in pages if page.is_file() for node in run_infoicon_audit.parse_html_text(page)]
+
+
+def site_terms(texts: List[str], count: int, seed: int = 11) -> List[str]:
+    """Real priority terms, then site n-grams (mostly hits) and random strings (misses)."""
+    rng = random.Random(seed)
+    terms = list(run_infoicon_audit.load_terms(REPO_ROOT / "aquarium_search_terms_infoicon_priority.csv"))
+    seen = set(terms)
+    words = [chunk for chunk in (text.split() for text in texts) if chunk]
+    while len(terms) < count:
+        if rng.random() < 0.5:
+            chunk = rng.choice(words)
+            start = rng.randrange(len(chunk))
+            term = " ".join(chunk[start:start + rng.randint(1, 3)])
+        else:
+            term = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 12)))
+        if term and term not in seen:
+            seen.add(term)
+            terms.append(term)
+    return terms
+
+
+@pytest.mark.parametrize("word_boundaries", [False, True])
+def test_automaton_matches_brute_force(word_boundaries):
+    rng = random.Random(11)
+    for _ in range(2000):
+        terms, text = random_case(rng)
+        automaton = TermAutomaton(terms, word_boundaries=word_boundaries)
+        assert list(automaton.iter_matches(text)) == brute_force(terms, text, word_boundaries), (terms, text)
+
+
+def test_first_offsets_are_leftmost_hits():
+    rng = random.Random(12)
+    for _ in range(1000):
+        terms, text = random_case(rng)
+        automaton = TermAutomaton(terms)
+        expected: Dict[int, List[int]] = {}
+        for start, _, term_id in brute_force(terms, text, False):
+            expected.setdefault(term_id, []).append(start)
+        assert {k: sorted(v) for k, v in automaton.occurrences(text).items()} == {k: sorted(v) for k, v in expected.items()}
+        assert automaton.first_offsets(text) == {term_id: min(starts) for term_id, starts in expected.items()}
+
+
+def test_pattern_matches_substring_presence():
+    rng = random.Random(13)
+    for _ in range(3000):
+        terms, text = random_case(rng)
+        terms.append("")  # dropped like TermAutomaton does
+        pattern = TermPattern(terms)
+        assert pattern.terms == TermAutomaton(terms).terms
+        assert pattern.find_ids(text) == {i for i, term in enumerate(pattern.terms) if term in text}, (terms, text)
+
+
+def test_site_text_hits_match_per_term_scans():
+    texts = site_texts()
+    terms = site_terms(texts, 300)
+    automaton = TermAutomaton(terms)
+    for text in texts:
+        assert automaton.find_ids(text) == {term_id for term_id, term in enumerate(terms) if term in text}
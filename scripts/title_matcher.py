@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""IDF-weighted title matcher used by link_audit.guess_status.
+
+Token sets and inverse document frequencies are computed once over the whole
+catalog of Product_Name values. A page title is then scored by how much of
+the product's distinctive vocabulary it contains, so shared filler words
+("aquarium", "tank", "gallon") count for little and a listing whose brand
+differs from the catalog entry is penalised instead of passing as MATCH.
+"""
+from __future__ import annotations
+
+import math
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:[.+][a-z0-9]+)*")
+STOPWORDS = frozenset({
+    "a", "an", "and", "amazon", "com", "for", "in", "of", "on", "or", "the", "to", "with", "by", "x",
+})
+MATCH_THRESHOLD = 0.5
+BRAND_PENALTY = 0.5
+# A leading token counts as a brand when at most this share of catalog names contain it.
+BRAND_MAX_DF_RATIO = 0.05
+
+
+@lru_cache(maxsize=65536)
+def tokenize(text: str) -> Tuple[str, ...]:
+    """Ordered, de-duplicated tokens with stopwords removed."""
+    seen: Dict[str, None] = {}
+    for token in TOKEN_RE.findall((text or "").casefold()):
+        if token not in STOPWORDS:
+            seen.setdefault(token, None)
+    return tuple(seen)
+
+
+class TitleMatcher:
+    """Scores (product name, page title) pairs with catalog-wide IDF weights."""
+
+    def __init__(self, catalog: Iterable[str], threshold: float = MATCH_THRESHOLD) -> None:
+        self.threshold = threshold
+        doc_freq: Dict[str, int] = {}
+        documents = 0
+        for name in catalog:
+            tokens = tokenize(name)
+            if not tokens:
+                continue
+            documents += 1
+            for token in tokens:
+                doc_freq[token] = doc_freq.get(token, 0) + 1
+        self.documents = documents
+        self.doc_freq = doc_freq
+        self.idf: Dict[str, float] = {
+            token: math.log((documents + 1) / (freq + 1)) + 1.0 for token, freq in doc_freq.items()
+        }
+        # Tokens never seen in the catalog are as distinctive as the rarest ones.
+        self.unseen_idf = math.log(documents + 1) + 1.0
+        self._products: Dict[str, Tuple[FrozenSet[str], float, Optional[str]]] = {}
+
+    def weight(self, token: str) -> float:
+        return self.idf.get(token, self.unseen_idf)
+
+    def _brand(self, tokens: Sequence[str]) -> Optional[str]:
+        if not tokens:
+            return None
+        lead = tokens[0]
+        if lead.isdigit():
+            return None
+        if self.doc_freq.get(lead, 0) > max(1, self.documents * BRAND_MAX_DF_RATIO):
+            return None
+        return lead
+
+    def _product(self, name: str) -> Tuple[FrozenSet[str], float, Optional[str]]:
+        cached = self._products.get(name)
+        if cached is None:
+            tokens = tokenize(name)
+            cached = (frozenset(tokens), sum(self.weight(t) for t in tokens), self._brand(tokens))
+            self._products[name] = cached
+        return cached
+
+    def score(self, product_name: str, page_title: str) -> float:
+        product_tokens, product_weight, brand = self._product(product_name)
+        title_tokens = tokenize(page_title)
+        if not product_tokens or not title_tokens:
+            return 0.0
+        title_set = frozenset(title_tokens)
+        shared = sum(self.weight(t) for t in product_tokens & title_set)
+        title_weight = sum(self.weight(t) for t in title_set)
+        recall = shared / product_weight
+        precision = shared / title_weight
+        if recall == 0 or precision == 0:
+            return 0.0
+        # Recall-leaning F-score: Amazon titles append marketing text the catalog omits.
+        beta_sq = 4.0
+        score = (1 + beta_sq) * precision * recall / (beta_sq * precision + recall)
+        if brand is not None and brand not in title_set:
+            score *= BRAND_PENALTY
+        return round(score, 4)
+
+    def score_many(self, pairs: Iterable[Tuple[str, str]]) -> List[float]:
+        return [self.score(product, title) for product, title in pairs]
+
+    def status(self, product_name: str, page_title: str) -> Tuple[str, float]:
+        confidence = self.score(product_name, page_title)
+        return ("MATCH" if confidence >= self.threshold else "MISMATCH"), confidence
@@ -2,20 +2,27 @@
 """Static verification for trim recheck."""
 from __future__ import annotations
 
-import hashlib
+import argparse
 import json
 import subprocess
 import xml.etree.ElementTree as ET
 from collections import Counter
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from checksum_cache import ChecksumCache
+from reference_index import ReferenceIndex
+from snapshot_store import SnapshotStore
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 OUTPUT_DIR = REPO_ROOT / "_codex_sync" / "trim"
 CHECKSUM_PATH = REPO_ROOT / "_codex_sync" / "recheck_checksums.json"
 PRECHECK_PATH = REPO_ROOT / "_codex_sync" / "preflight_checksums.json"
+SNAPSHOT_STORE_PATH = REPO_ROOT / "_codex_sync" / "snapshots" / "snapshots.jsonl"
 STATIC_REPORT_PATH = OUTPUT_DIR / "recheck_static.json"
+CHECKSUM_CACHE_PATH = REPO_ROOT / "_codex_sync" / "cache" / "checksums.json"
+REFERENCE_INDEX_PATH = REPO_ROOT / "_codex_sync" / "cache" / "reference_index.json"
 
 REMOVED_ASSETS = [
     "assets/media/library/books/blogs.png",
@@ -36,22 +43,13 @@ PAGES_TO_CHECK = {
 BOX_SIZING_LIMIT = 1
 
 
-def sha256_file(path: Path) -> str:
-    digest = hashlib.sha256()
-    with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
-            digest.update(chunk)
-    return digest.hexdigest()
-
-
-def compute_checksums(files: Iterable[str]) -> Dict[str, str]:
-    output: Dict[str, str] = {}
-    for rel in files:
-        path = REPO_ROOT / rel
-        if not path.is_file():
-            continue
-        output[rel] = sha256_file(path)
-    return output
+def compute_checksums(files: Iterable[str], use_cache: bool = True) -> Dict[str, str]:
+    """sha256 of each tracked file, re-hashing only files whose stat changed since the last run."""
+    paths = [(rel, REPO_ROOT / rel) for rel in files]
+    cache = ChecksumCache(CHECKSUM_CACHE_PATH if use_cache else None).load()
+    digests = cache.hash_files(path for _, path in paths)
+    cache.save()
+    return {rel: digests[path] for rel, path in paths if path in digests}
 
 
 def build_scope_map(all_checksums: Dict[str, str], scopes: Iterable[str]) -> Dict[str, Dict[str, str]]:
@@ -69,8 +67,16 @@ def build_scope_map(all_checksums: Dict[str, str], scopes: Iterable[str]) -> Dic
 
 
 def load_preflight_scopes() -> Tuple[Dict[str, Dict[str, str]], List[str]]:
-    with PRECHECK_PATH.open("r", encoding="utf-8") as handle:
-        preflight = json.load(handle)
+    """Legacy preflight_checksums.json entries plus every snapshot in the snapshot store."""
+    preflight: Dict[str, Dict[str, str]] = {}
+    if PRECHECK_PATH.is_file():
+        with PRECHECK_PATH.open("r", encoding="utf-8") as handle:
+            preflight = json.load(handle)
+    store = SnapshotStore(SNAPSHOT_STORE_PATH).load()
+    for name in store.names():
+        preflight[name] = store.get(name)
+    if not preflight:
+        raise FileNotFoundError(f"No preflight checksums in {PRECHECK_PATH} or {SNAPSHOT_STORE_PATH}")
     scopes = list(preflight.keys())
     return preflight, scopes
 
@@ -105,23 +111,13 @@ def asset_absent(path: str) -> bool:
 
 
 def find_references(term: str) -> List[str]:
-    matches: List[str] = []
-    allowed_suffixes = {".html", ".htm", ".css", ".js", ".mjs", ".ts", ".tsx", ".jsx"}
-    excluded_parts = {"_codex_sync", "node_modules", ".git", "dist", "logs"}
-    for file_path in REPO_ROOT.rglob("*"):
-        if not file_path.is_file():
-            continue
-        if any(part in excluded_parts for part in file_path.parts):
-            continue
-        if file_path.suffix.lower() not in allowed_suffixes:
-            continue
-        try:
-            text = file_path.read_text(encoding="utf-8")
-        except (UnicodeDecodeError, OSError):
-            continue
-        if term in text:
-            matches.append(str(file_path.relative_to(REPO_ROOT)))
-    return matches
+    return ReferenceIndex(REPO_ROOT, [term]).references().get(term, [])
+
+
+def find_all_references(terms: Iterable[str], use_cache: bool = True) -> Dict[str, List[str]]:
+    """Files referencing each term, from a single walk of the repo."""
+    index = ReferenceIndex(REPO_ROOT, terms, REFERENCE_INDEX_PATH if use_cache else None)
+    return index.references()
 
 
 def check_utilities_imports() -> Dict[str, Dict[str, object]]:
@@ -221,11 +217,15 @@ def check_sitemap() -> Dict[str, object]:
     }
 
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Static verification for trim recheck.")
+    parser.add_argument("--no-cache", action="store_true", help="Re-hash every file and rebuild the reference index instead of reusing unchanged files")
+    args = parser.parse_args(argv)
+
     ensure_output_dir()
     preflight, scopes = load_preflight_scopes()
     tracked_files = git_ls_files()
-    checksums = compute_checksums(tracked_files)
+    checksums = compute_checksums(tracked_files, use_cache=not args.no_cache)
     scoped_checksums = build_scope_map(checksums, scopes)
     with CHECKSUM_PATH.open("w", encoding="utf-8") as handle:
         json.dump(scoped_checksums, handle, indent=2, sort_keys=True)
@@ -236,9 +236,10 @@ def main() -> None:
 
     removed_results = {}
     assets_absent = True
+    references = find_all_references(REMOVED_ASSETS, use_cache=not args.no_cache)
     for asset in REMOVED_ASSETS:
         exists = not asset_absent(asset)
-        refs = find_references(asset)
+        refs = references.get(asset, [])
         removed_results[asset] = {
             "exists": exists,
             "references": refs,